@@ -0,0 +1,211 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import sys
+import os
+import io
+import json
+import hashlib
+import tempfile
+
+from KicadModTree.FileHandler import recordWrittenFiles
+
+
+# root directory of the repository, generator sources inside of it are part of the cache key
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# digests of source files, keyed by path and validated by modification time and size
+_file_digests = {}
+
+
+def _getFileDigest(filename):
+    try:
+        stat = os.stat(filename)
+    except (IOError, OSError):
+        return None
+
+    entry = _file_digests.get(filename)
+    if entry is None or entry[0] != (stat.st_mtime, stat.st_size):
+        with io.open(filename, 'rb') as f:
+            entry = (stat.st_mtime, stat.st_size), hashlib.sha1(f.read()).hexdigest()
+        _file_digests[filename] = entry
+    return entry[1]
+
+
+def getSourceDigests():
+    r"""Get the hashes of the source of all modules of this repository which are currently loaded
+
+    This covers the generator script itself, KicadModTree as well as shared tools like the ipc calculators. It is
+    called after a footprint was generated, so modules imported while generating it are included as well.
+
+    :return: dict of hex digests, keyed by the path of the source relative to the repository root
+    """
+
+    sources = {}
+    for module in list(sys.modules.values()):
+        filename = getattr(module, '__file__', None)
+        if not filename:
+            continue
+        filename = os.path.realpath(filename)
+        if filename.endswith('.pyc'):
+            filename = filename[:-1]
+        if filename.startswith(_REPOSITORY_ROOT + os.sep):
+            digest = _getFileDigest(filename)
+            if digest is not None:
+                sources[os.path.relpath(filename, _REPOSITORY_ROOT).replace(os.sep, '/')] = digest
+    return sources
+
+
+def _sourcesUnchanged(sources):
+    r"""Check if the sources recorded by getSourceDigests still have the same content"""
+    for name, digest in sources.items():
+        if _getFileDigest(os.path.join(_REPOSITORY_ROOT, *name.split('/'))) != digest:
+            return False
+    return True
+
+
+class BuildCache(object):
+    r"""Persistent cache which allows generators to skip footprints whose inputs did not change
+
+    Every footprint is identified by the generator script, the working directory and its name. For each of them the
+    cache stores a hash over the parameters of the footprint, the hashes of all modules of this repository which
+    were loaded after generating it, as well as the files which were written. As long as the parameters and those
+    modules are the same and the files still exist, the footprint does not need to be generated again.
+
+    :param filename:
+        path of the cache file (default: ``.kicad_mod_cache.json`` in the working directory)
+    :type filename: ``str``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> cache = BuildCache()
+    >>> cache.execute('SOIC-8', [configuration, parameters], generate_footprint, parameters)
+    >>> cache.save()
+    """
+
+    DEFAULT_FILENAME = '.kicad_mod_cache.json'
+    VERSION = 2
+
+    def __init__(self, filename=DEFAULT_FILENAME):
+        self.filename = filename
+        self._entries = self._load()
+        self._changes = {}
+
+    def _load(self):
+        try:
+            with io.open(self.filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            return {}
+        return data.get('entries', {})
+
+    def save(self):
+        r"""Write all changes to the cache file
+
+        Entries written by other processes in the meantime are kept, only the changed entries are replaced.
+        """
+
+        if not self._changes:
+            return
+
+        entries = self._load()
+        entries.update(self._changes)
+
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, tmp_filename = tempfile.mkstemp(prefix='.kicad_mod_cache', dir=directory)
+        try:
+            with io.open(fd, 'wb') as f:
+                f.write(json.dumps({'version': self.VERSION, 'entries': entries}, sort_keys=True, indent=1)
+                        .encode('utf-8'))
+            # atomic replacement, so concurrent readers never see a partially written cache
+            getattr(os, 'replace', os.rename)(tmp_filename, self.filename)
+        except Exception:
+            os.remove(tmp_filename)
+            raise
+
+        self._entries = entries
+        self._changes = {}
+
+    @staticmethod
+    def getKey(name):
+        r"""Get the key of a footprint generated by the running script in the current working directory"""
+        return json.dumps([os.path.realpath(sys.argv[0]), os.getcwd(), name])
+
+    @staticmethod
+    def getDigest(parameters):
+        r"""Get the hash over all parameters
+
+        :param parameters:
+            everything the output depends on, like the footprint parameters and the merged configuration. It has to
+            be serializable as json, other objects are hashed by their ``repr``
+        """
+
+        return hashlib.sha1(json.dumps(parameters, sort_keys=True, default=repr).encode('utf-8')).hexdigest()
+
+    def isUpToDate(self, name, digest):
+        r"""Check if the footprint was already generated with the same inputs and sources, and its files still exist"""
+
+        entry = self._changes.get(self.getKey(name)) or self._entries.get(self.getKey(name))
+        if entry is None or entry.get('digest') != digest:
+            return False
+        if not all(os.path.exists(filename) for filename in entry.get('files', [])):
+            return False
+        return _sourcesUnchanged(entry.get('sources', {}))
+
+    def update(self, name, digest, files, sources=None):
+        r"""Store the hash, the written files and the source hashes (see getSourceDigests) of a footprint"""
+        self._changes[self.getKey(name)] = {'digest': digest, 'files': sorted(set(files)),
+                                            'sources': sources if sources is not None else getSourceDigests()}
+
+    def execute(self, name, parameters, function, *args, **kwargs):
+        r"""Call a footprint generating function, unless its output is up to date
+
+        :param name:
+            name of the footprint, has to be unique for the generator script
+        :param parameters:
+            everything the output depends on (see BuildCache.getDigest)
+        :param function:
+            function which generates the footprint, called with the remaining arguments
+
+        :return: ``True`` if the function was called, ``False`` if the footprint was skipped
+        """
+
+        digest = self.getDigest(parameters)
+        if self.isUpToDate(name, digest):
+            return False
+
+        files = []
+        recordWrittenFiles(files)
+        try:
+            function(*args, **kwargs)
+        finally:
+            recordWrittenFiles(None)
+
+        # the sources are collected afterwards, to include modules which were only imported by the function
+        self.update(name, digest, files, getSourceDigests())
+        return True
+
+    def popChanges(self):
+        r"""Get and forget all changes which are not saved yet, used to move them between processes"""
+        changes, self._changes = self._changes, {}
+        return changes
+
+    def addChanges(self, changes):
+        r"""Add changes returned by BuildCache.popChanges"""
+        self._changes.update(changes)
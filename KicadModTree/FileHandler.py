@@ -15,6 +15,99 @@
 
 import sys
 import io
+import os
+import mmap
+
+from KicadModTree.Profiler import profilePhase, isProfiling, PHASE_SERIALIZE, PHASE_WRITE
+
+
+# results of FileHandler.writeFile
+WRITE_NEW = 'new'
+WRITE_CHANGED = 'written'
+WRITE_UNCHANGED = 'unchanged'
+
+# opt-in mode, which leaves files untouched when only their timestamp would change
+_skip_unchanged = False
+
+# number of files per result of FileHandler.writeFile
+_write_statistics = {WRITE_NEW: 0, WRITE_CHANGED: 0, WRITE_UNCHANGED: 0}
+
+# list which receives the path of every file handled by FileHandler.writeFile, or None
+_written_files = None
+
+
+def useSkipUnchanged(enabled=True):
+    r"""Enable or disable skipping of unchanged files for all following FileHandler.writeFile calls
+
+    When enabled, the new content is compared to the existing file first. Files which would only differ in their
+    timestamp are not written at all, so regenerating a whole library only modifies footprints which really changed.
+
+    :param enabled: ``True`` to skip unchanged files, ``False`` to always write them (default)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> from KicadModTree.FileHandler import useSkipUnchanged
+    >>> useSkipUnchanged()
+    """
+    global _skip_unchanged
+    _skip_unchanged = bool(enabled)
+
+
+def isSkipUnchanged():
+    r"""Check if unchanged files are skipped by FileHandler.writeFile
+
+    :return: ``True`` if files which only differ in their timestamp are left untouched
+    """
+    return _skip_unchanged
+
+
+def getWriteStatistics():
+    r"""Get the number of files handled by FileHandler.writeFile since the last reset
+
+    :return: dict with the number of ``new``, ``written`` (changed) and ``unchanged`` files
+    """
+    return dict(_write_statistics)
+
+
+def resetWriteStatistics():
+    r"""Reset the numbers returned by getWriteStatistics"""
+    for key in _write_statistics:
+        _write_statistics[key] = 0
+
+
+def recordWrittenFiles(files):
+    r"""Append the absolute path of every file handled by FileHandler.writeFile to a list
+
+    Used to find out which files are created by a generator, for example by the build cache.
+
+    :param files: list the paths are appended to, or ``None`` to stop recording
+    """
+    global _written_files
+    _written_files = files
+
+
+class _UnicodeStream(object):
+    r"""Wrapper which converts everything written to it into unicode (required by python2 text streams)"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, output):
+        if type(output) != unicode:
+            output = unicode(output, "utf-8")
+        self._stream.write(output)
+
+
+def _textStream(stream):
+    r"""Get a stream which accepts the str written by the serializers
+
+    python2 text streams (like the ones of io.open or io.StringIO) only accept unicode, so they are wrapped into a
+    _UnicodeStream. Other streams, like the python2 sys.stdout, take str as it is.
+    """
+    if sys.version_info[0] == 2 and isinstance(stream, io.TextIOBase):
+        return _UnicodeStream(stream)
+    return stream
 
 
 class FileHandler(object):
@@ -35,6 +128,50 @@ class FileHandler(object):
     def __init__(self, kicad_mod):
         self.kicad_mod = kicad_mod
 
+    @classmethod
+    def readFile(cls, filename):
+        r"""Read a footprint file and rebuild the footprint tree out of it
+
+        The file is memory mapped and parsed in place, without reading it into a string first.
+
+        :param filename:
+            path of the input file
+        :type filename: ``str``
+
+        :return: the footprint described by the file
+        :rtype: ``KicadModTree.Footprint``
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = KicadFileHandler.readFile('example_footprint.kicad_mod')
+        """
+
+        with io.open(filename, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty files cannot be memory mapped
+                return cls.parse(f.read())
+
+            try:
+                return cls.parse(data)
+            finally:
+                data.close()
+
+    @classmethod
+    def parse(cls, data):
+        r"""Rebuild a footprint out of the content of a file in the specified format
+
+        :param data:
+            content of the file as ``str``, ``bytes`` or memory mapped file
+
+        :return: the footprint described by the data
+        :rtype: ``KicadModTree.Footprint``
+        """
+
+        raise NotImplementedError("parse has to be implemented by child class")
+
     def writeFile(self, filename, **kwargs):
         r"""Write the output of FileHandler.serialize to a file
 
@@ -42,6 +179,13 @@ class FileHandler(object):
             path of the output file
         :type filename: ``str``
 
+        :param skip_unchanged:
+            compare the output to the existing file first, and leave the file untouched if only the timestamp
+            differs (default: set by useSkipUnchanged)
+        :type skip_unchanged: ``bool``
+
+        :return: ``WRITE_NEW``, ``WRITE_CHANGED`` or ``WRITE_UNCHANGED``
+
         :Example:
 
         >>> from KicadModTree import *
@@ -50,16 +194,75 @@ class FileHandler(object):
         >>> file_handler.writeFile('example_footprint.kicad_mod')
         """
 
-        with io.open(filename, "w", newline='\n') as f:
-            output = self.serialize(**kwargs)
+        skip_unchanged = kwargs.pop('skip_unchanged', _skip_unchanged)
+
+        if not skip_unchanged and not isProfiling():
+            result = WRITE_CHANGED if os.path.exists(filename) else WRITE_NEW
+
+            with io.open(filename, "w", encoding="utf-8", newline='\n') as f:
+                self.writeStream(f, **kwargs)
+        else:
+            # the profiler needs serialization and writing as separate steps
+            with profilePhase(PHASE_SERIALIZE):
+                content = self.serialize(**kwargs)
+                if sys.version_info[0] == 2:
+                    content = unicode(content, "utf-8")
+
+            if not skip_unchanged:
+                result = WRITE_CHANGED if os.path.exists(filename) else WRITE_NEW
+            else:
+                try:
+                    with io.open(filename, "r", encoding="utf-8", newline='') as f:
+                        existing = f.read()
+                except (IOError, OSError):
+                    result = WRITE_NEW
+                except UnicodeDecodeError:
+                    # an existing file which is no valid utf-8 cannot be equal to our output
+                    result = WRITE_CHANGED
+                else:
+                    if self._stripTimestamp(existing) == self._stripTimestamp(content):
+                        result = WRITE_UNCHANGED
+                    else:
+                        result = WRITE_CHANGED
+
+            if result != WRITE_UNCHANGED:
+                with profilePhase(PHASE_WRITE):
+                    with io.open(filename, "w", encoding="utf-8", newline='\n') as f:
+                        f.write(content)
+
+        _write_statistics[result] += 1
+        if _written_files is not None:
+            _written_files.append(os.path.abspath(filename))
+        return result
+
+    def _stripTimestamp(self, content):
+        r"""Remove the parts of a serialized file which change on every run, like timestamps
+
+        Used to compare a new output against an existing file. Implementations override this method when their
+        format contains a timestamp.
+        """
+        return content
+
+    def writeStream(self, stream, **kwargs):
+        r"""Write the output of FileHandler.serialize into a file-like object
+
+        Implementations can override this method to write the footprint piece by piece, instead of building the
+        whole output as one string first.
 
-            # convert to unicode if running python2
-            if sys.version_info[0] == 2 and type(output) != unicode:
-                output = unicode(output, "utf-8")
+        :param stream:
+            file-like object the footprint is written to
+        :type stream: ``object with a write method``
+
+        :Example:
 
-            f.write(output)
+        >>> import sys
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = KicadFileHandler(kicad_mod)  # KicadFileHandler is a implementation of FileHandler
+        >>> file_handler.writeStream(sys.stdout)
+        """
 
-            f.close()
+        _textStream(stream).write(self.serialize(**kwargs))
 
     def serialize(self, **kwargs):
         r"""Get a valid string representation of the footprint in the specified format
@@ -13,13 +13,21 @@
 #
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-from KicadModTree.FileHandler import FileHandler
+import re
+from itertools import chain
+from math import hypot
+
+from KicadModTree.FileHandler import FileHandler, _textStream
+from KicadModTree.Profiler import profilePhase, PHASE_EXPAND
 from KicadModTree.util.kicad_util import *
+from KicadModTree.nodes.Footprint import Footprint
 from KicadModTree.nodes.base.Pad import Pad  # TODO: why .KicadModTree is not enough?
 from KicadModTree.nodes.base.Arc import Arc
 from KicadModTree.nodes.base.Circle import Circle
 from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Model import Model
 from KicadModTree.nodes.base.Polygon import Polygon
+from KicadModTree.nodes.base.Text import Text
 
 
 DEFAULT_LAYER_WIDTH = {'F.SilkS': 0.12,
@@ -33,6 +41,19 @@ DEFAULT_WIDTH_POLYGON_PAD = 0
 
 DEFAULT_WIDTH = 0.15
 
+SERIALIZED_NODE_TYPES = {'Arc', 'Circle', 'Line', 'Model', 'Pad', 'Polygon', 'Text'}
+
+# timestamp of the last edit in the header of a footprint, which is ignored when comparing files
+_TEDIT = re.compile(r'\(tedit [0-9A-Fa-f]+\)')
+
+# footprint attributes read by KicadFileHandler.parse: (name of the setter, conversion of the value)
+FOOTPRINT_ATTRIBUTE_PARSERS = {'descr': ('setDescription', str),
+                               'tags': ('setTags', str),
+                               'attr': ('setAttribute', str),
+                               'solder_mask_margin': ('setMaskMargin', float),
+                               'solder_paste_margin': ('setPasteMargin', float),
+                               'solder_paste_ratio': ('setPasteMarginRatio', float)}
+
 
 def _get_layer_width(layer, width=None):
     if width is not None:
@@ -41,6 +62,34 @@ def _get_layer_width(layer, width=None):
         return DEFAULT_LAYER_WIDTH.get(layer, DEFAULT_WIDTH)
 
 
+def _split_sexpr(sexpr):
+    r"""Split the content of a parsed sexpr list into its sub lists (by name) and its plain values
+
+    Only the first sub list of every name is kept, which is all the .kicad_mod format needs.
+    """
+    attributes = {}
+    values = []
+
+    for item in sexpr:
+        if isinstance(item, list):
+            if item:
+                attributes.setdefault(item[0], item)
+        else:
+            values.append(item)
+
+    return attributes, values
+
+
+def _parse_xy(sexpr):
+    return [float(sexpr[1]), float(sexpr[2])]
+
+
+def _parse_width(attributes):
+    if 'width' in attributes:
+        return float(attributes['width'][1])
+    return None
+
+
 class KicadFileHandler(FileHandler):
     r"""Implementation of the FileHandler for .kicad_mod files
 
@@ -59,6 +108,174 @@ class KicadFileHandler(FileHandler):
     def __init__(self, kicad_mod):
         FileHandler.__init__(self, kicad_mod)
 
+    @classmethod
+    def parse(cls, data):
+        r"""Rebuild a footprint out of the content of a .kicad_mod file
+
+        Texts, lines, arcs, circles, polygons, pads (including custom pads) and 3D models are converted into their
+        nodes, which are appended directly to the footprint. Elements which have no node representation (like
+        zones) are skipped.
+
+        :param data:
+            content of the file as ``str``, ``bytes`` or memory mapped file
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = KicadFileHandler.parse('(module example_footprint (layer F.Cu) (tedit 0))')
+        """
+
+        sexpr = parseLispString(data)
+        if not isinstance(sexpr, list) or len(sexpr) < 2 or sexpr[0] not in ('module', 'footprint'):
+            raise ValueError('data does not contain a footprint in the .kicad_mod format')
+
+        kicad_mod = Footprint(sexpr[1])
+
+        for element in sexpr[2:]:
+            if not isinstance(element, list) or not element:
+                continue
+
+            key = element[0]
+            if key in FOOTPRINT_ATTRIBUTE_PARSERS:
+                setter, convert = FOOTPRINT_ATTRIBUTE_PARSERS[key]
+                getattr(kicad_mod, setter)(convert(element[1]))
+                continue
+
+            parse_method = getattr(cls, '_parse_{0}'.format(key), None)
+            if parse_method is not None:
+                kicad_mod.append(parse_method(element))
+
+        return kicad_mod
+
+    @staticmethod
+    def _parse_fp_text(sexpr):
+        attributes, values = _split_sexpr(sexpr[3:])
+        at = attributes['at']
+
+        kwargs = {'type': sexpr[1],
+                  'text': sexpr[2],
+                  'at': _parse_xy(at),
+                  'rotation': float(at[3]) if len(at) > 3 else 0,
+                  'hide': 'hide' in values}
+        if 'layer' in attributes:
+            kwargs['layer'] = attributes['layer'][1]
+
+        effects, _ = _split_sexpr(attributes.get('effects', [])[1:])
+        font, _ = _split_sexpr(effects.get('font', [])[1:])
+        if 'size' in font:
+            kwargs['size'] = _parse_xy(font['size'])
+        if 'thickness' in font:
+            kwargs['thickness'] = float(font['thickness'][1])
+        kwargs['mirror'] = 'mirror' in effects.get('justify', [])
+
+        return Text(**kwargs)
+
+    @staticmethod
+    def _parse_fp_line(sexpr, **kwargs):
+        attributes, _ = _split_sexpr(sexpr[1:])
+        if 'layer' in attributes:
+            kwargs['layer'] = attributes['layer'][1]
+
+        return Line(start=_parse_xy(attributes['start']), end=_parse_xy(attributes['end']),
+                    width=_parse_width(attributes), **kwargs)
+
+    @staticmethod
+    def _parse_fp_arc(sexpr, **kwargs):
+        # in KiCAD, some file attributes of Arc are named not in the way of their real meaning
+        attributes, _ = _split_sexpr(sexpr[1:])
+        if 'layer' in attributes:
+            kwargs['layer'] = attributes['layer'][1]
+
+        return Arc(center=_parse_xy(attributes['start']), start=_parse_xy(attributes['end']),
+                   angle=float(attributes['angle'][1]), width=_parse_width(attributes), **kwargs)
+
+    @staticmethod
+    def _parse_fp_circle(sexpr, **kwargs):
+        attributes, _ = _split_sexpr(sexpr[1:])
+        if 'layer' in attributes:
+            kwargs['layer'] = attributes['layer'][1]
+
+        center = _parse_xy(attributes['center'])
+        end = _parse_xy(attributes['end'])
+        radius = hypot(end[0] - center[0], end[1] - center[1])
+
+        return Circle(center=center, radius=radius, width=_parse_width(attributes), **kwargs)
+
+    @staticmethod
+    def _parse_fp_poly(sexpr, **kwargs):
+        attributes, _ = _split_sexpr(sexpr[1:])
+        if 'layer' in attributes:
+            kwargs['layer'] = attributes['layer'][1]
+
+        nodes = [_parse_xy(point) for point in attributes['pts'][1:] if isinstance(point, list)]
+
+        return Polygon(nodes=nodes, width=_parse_width(attributes), **kwargs)
+
+    @staticmethod
+    def _parse_model(sexpr):
+        attributes, _ = _split_sexpr(sexpr[2:])
+
+        kwargs = {'filename': sexpr[1]}
+        for key, name in (('at', 'at'), ('offset', 'at'), ('scale', 'scale'), ('rotate', 'rotate')):
+            if key in attributes:
+                xyz = attributes[key][1]
+                kwargs[name] = [float(xyz[1]), float(xyz[2]), float(xyz[3])]
+
+        return Model(**kwargs)
+
+    @classmethod
+    def _parse_pad(cls, sexpr):
+        attributes, _ = _split_sexpr(sexpr[4:])
+        at = attributes['at']
+
+        kwargs = {'number': sexpr[1],
+                  'type': sexpr[2],
+                  'shape': sexpr[3],
+                  'at': _parse_xy(at),
+                  'rotation': float(at[3]) if len(at) > 3 else 0,
+                  'size': _parse_xy(attributes['size']),
+                  'layers': attributes['layers'][1:]}
+
+        if 'drill' in attributes:
+            drill_attributes, drill = _split_sexpr(attributes['drill'][1:])
+            if drill and drill[0] == 'oval':
+                kwargs['drill'] = [float(drill[1]), float(drill[2])]
+            elif drill:
+                kwargs['drill'] = float(drill[0])
+            if 'offset' in drill_attributes:
+                kwargs['offset'] = _parse_xy(drill_attributes['offset'])
+
+        if 'roundrect_rratio' in attributes:
+            kwargs['radius_ratio'] = float(attributes['roundrect_rratio'][1])
+
+        for key in ('solder_mask_margin', 'solder_paste_margin_ratio', 'solder_paste_margin'):
+            if key in attributes:
+                kwargs[key] = float(attributes[key][1])
+
+        if kwargs['shape'] == Pad.SHAPE_CUSTOM:
+            options, _ = _split_sexpr(attributes.get('options', [])[1:])
+            if 'clearance' in options:
+                kwargs['shape_in_zone'] = options['clearance'][1]
+            if 'anchor' in options:
+                kwargs['anchor_shape'] = options['anchor'][1]
+
+            kwargs['primitives'] = [cls._parse_CustomPadPrimitive(p)
+                                    for p in attributes.get('primitives', [])[1:] if isinstance(p, list)]
+
+        return Pad(**kwargs)
+
+    @classmethod
+    def _parse_CustomPadPrimitive(cls, sexpr):
+        # primitives use the same syntax as the graphical elements of the footprint, except for the layer
+        parse_method = {'gr_poly': cls._parse_fp_poly,
+                        'gr_line': cls._parse_fp_line,
+                        'gr_circle': cls._parse_fp_circle,
+                        'gr_arc': cls._parse_fp_arc}.get(sexpr[0])
+        if parse_method is None:
+            raise TypeError('Unsuported type of primitive for custom pad.')
+
+        return parse_method(sexpr)
+
     def serialize(self, **kwargs):
         r"""Get a valid string representation of the footprint in the .kicad_mod format
 
@@ -70,6 +287,28 @@ class KicadFileHandler(FileHandler):
         >>> print(file_handler.serialize())
         """
 
+        return str(SexprSerializer(self._serializeFootprint(**kwargs)))
+
+    def writeStream(self, stream, **kwargs):
+        r"""Write the footprint in the .kicad_mod format into a file-like object
+
+        The output is written token by token, so the footprint is never held in memory as one big string.
+
+        :Example:
+
+        >>> import sys
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = KicadFileHandler(kicad_mod)
+        >>> file_handler.writeStream(sys.stdout)
+        """
+
+        SexprSerializer(self._serializeFootprint(**kwargs)).write(_textStream(stream))
+
+    def _stripTimestamp(self, content):
+        return _TEDIT.sub('(tedit 0)', content, count=1)
+
+    def _serializeFootprint(self, **kwargs):
         sexpr = ['module', self.kicad_mod.name,
                  ['layer', 'F.Cu'],
                  ['tedit', formatTimestamp(kwargs.get('timestamp'))],
@@ -102,20 +341,20 @@ class KicadFileHandler(FileHandler):
 
         sexpr.extend(self._serializeTree())
 
-        return str(SexprSerializer(sexpr))
+        return sexpr
 
     def _serializeTree(self):
-        nodes = self.kicad_mod.serialize()
-
         grouped_nodes = {}
 
-        for single_node in nodes:
-            node_type = single_node.__class__.__name__
+        with profilePhase(PHASE_EXPAND):
+            for single_node in self.kicad_mod.iter_serialize():
+                node_type = single_node.__class__.__name__
 
-            current_nodes = grouped_nodes.get(node_type, [])
-            current_nodes.append(single_node)
+                # only base nodes are rendered, there is no need to keep the others
+                if node_type not in SERIALIZED_NODE_TYPES:
+                    continue
 
-            grouped_nodes[node_type] = current_nodes
+                grouped_nodes.setdefault(node_type, []).append(single_node)
 
         sexpr = []
 
@@ -266,13 +505,9 @@ class KicadFileHandler(FileHandler):
         return sexpr
 
     def _serialize_CustomPadPrimitives(self, pad):
-        all_primitives = []
-        for p in pad.primitives:
-            all_primitives.extend(p.serialize())
-
         grouped_nodes = {}
 
-        for single_node in all_primitives:
+        for single_node in chain.from_iterable(p.iter_serialize() for p in pad.primitives):
             node_type = single_node.__class__.__name__
 
             current_nodes = grouped_nodes.get(node_type, [])
@@ -355,14 +590,13 @@ class KicadFileHandler(FileHandler):
         if newline_after_pts:
             node_points.append(SexprSerializer.NEW_LINE)
         points_appended = 0
-        for n in node.nodes:
+        for x, y in node.nodes.getTransformedPoints(node.getTransformation()):
             if points_appended >= 4:
                 points_appended = 0
                 node_points.append(SexprSerializer.NEW_LINE)
             points_appended += 1
 
-            n_pos = node.getRealPosition(n)
-            node_points.append(['xy', n_pos.x, n_pos.y])
+            node_points.append(['xy', x, y])
 
         return node_points
 
@@ -16,6 +16,13 @@
 import sys
 import argparse
 import csv
+import multiprocessing
+import traceback
+
+from KicadModTree.FileHandler import useSkipUnchanged, getWriteStatistics, resetWriteStatistics
+from KicadModTree.BuildCache import BuildCache
+from KicadModTree.Profiler import Profiler
+from KicadModTree.util.yaml_util import loadYamlFile, useYamlCache
 
 try:
     import yaml
@@ -23,6 +30,11 @@ try:
 except ImportError:
     YAML_AVAILABLE = False
 
+try:
+    from StringIO import StringIO  # python 2
+except ImportError:
+    from io import StringIO  # python 3
+
 
 class ParserException(Exception):
     def __itruediv__(self, *args, **kwargs):
@@ -59,6 +71,8 @@ class ModArgparser(object):
     def __init__(self, footprint_function):
         self._footprint_function = footprint_function
         self._params = {}
+        self._cache = None
+        self._profiler = None
 
     def add_parameter(self, name, **kwargs):
         r"""Add a parameter to the ModArgparser
@@ -111,6 +125,19 @@ class ModArgparser(object):
         parser.add_argument('-v', '--verbose', help='show some additional information', action='store_true')  # TODO
         parser.add_argument('--print_yml', help='print example .yml file', action='store_true')
         parser.add_argument('--print_csv', help='print example .csv file', action='store_true')
+        parser.add_argument('--skip_unchanged', help='do not rewrite files which only differ in their timestamp',
+                            action='store_true')
+        parser.add_argument('-j', '--jobs', type=int, default=1,
+                            help='number of worker processes used to generate footprints (0 = all cores)')
+        parser.add_argument('--cache', type=str, nargs='?', const=BuildCache.DEFAULT_FILENAME,
+                            help='skip footprints whose parameters and generator sources did not change since the '
+                                 'last run (default cache file: {})'.format(BuildCache.DEFAULT_FILENAME))
+        parser.add_argument('--yaml_cache', help='cache the parsed yaml files (in ~/.cache/kicad-footprint-generator)',
+                            action='store_true')
+        parser.add_argument('--profile', type=str, nargs='?', const='profile.json',
+                            help='measure the time spent per footprint and write it as json report '
+                                 '(default: profile.json)')
+        parser.add_argument('--cprofile', type=str, help='write aggregated cProfile statistics of all footprints')
 
         # TODO: allow writing into sub dir
 
@@ -128,41 +155,139 @@ class ModArgparser(object):
             parser.print_help()
             return
 
-        for filepath in args.files:
+        if args.skip_unchanged:
+            useSkipUnchanged()
+            resetWriteStatistics()
+
+        jobs = args.jobs if args.jobs > 0 else multiprocessing.cpu_count()
+        if jobs > 1 and not _canFork():
+            print("parallel execution is not supported on this platform, use a single process")
+            jobs = 1
+
+        if args.yaml_cache:
+            useYamlCache()
+
+        if args.cache:
+            self._cache = BuildCache(args.cache)
+
+        if args.profile or args.cprofile:
+            self._profiler = Profiler(use_cprofile=bool(args.cprofile))
+
+        try:
+            if jobs == 1:
+                for kwargs in self._parse_files(args.files):
+                    self._execute_script(**kwargs)  # now we can execute the script
+                statistics = getWriteStatistics()
+                errors = []
+            else:
+                statistics, errors = self._execute_parallel(list(self._parse_files(args.files)), jobs)
+        finally:
+            if self._cache is not None:
+                self._cache.save()
+
+        if self._profiler is not None:
+            print(self._profiler.formatSummary())
+            if args.profile:
+                self._profiler.writeReport(args.profile)
+            if args.cprofile and self._profiler.getStats() is not None:
+                self._profiler.writeStats(args.cprofile)
+
+        if args.skip_unchanged:
+            print("files written: {written}, unchanged: {unchanged}, new: {new}".format(**statistics))
+
+        if errors:
+            print("{0} footprint(s) failed:".format(len(errors)))
+            for name in errors:
+                print("  - {0}".format(name))
+            sys.exit(1)
+
+    def _parse_files(self, files):
+        for filepath in files:
             print("use file: {0}".format(filepath))
             if filepath.endswith('.yml') or filepath.endswith('.yaml'):
-                self._parse_and_execute_yml(filepath)
+                for kwargs in self._parse_yml(filepath):
+                    yield kwargs
             elif filepath.endswith('.csv'):
-                self._parse_and_execute_csv(filepath)
+                for kwargs in self._parse_csv(filepath):
+                    yield kwargs
             else:
                 print("unexpected filetype: {0}".format(filepath))
 
+    def _execute_parallel(self, footprints, jobs):
+        r"""Execute all footprint definitions using a pool of worker processes
+
+        The footprints are dispatched in chunks, but the results are collected in the order of the definitions.
+        This way the output is the same as when running in a single process, independent of the scheduling.
+        Exceptions raised by the footprint function are reported, but do not stop the other footprints.
+
+        :return: merged write statistics of all workers and a list of the failed footprint names
+        """
+        global _worker_parser
+
+        statistics = getWriteStatistics()
+        errors = []
+
+        if not footprints:
+            return statistics, errors
+
+        # keep enough chunks per worker to balance footprints which take longer than others
+        chunksize = max(1, len(footprints) // (jobs * 4))
+
+        # the worker processes inherit this parser (and its footprint function) when forking
+        _worker_parser = self
+        try:
+            pool = _createForkPool(min(jobs, len(footprints)))
+            try:
+                results = pool.imap(_execute_footprint, footprints, chunksize)
+                for kwargs, result in zip(footprints, results):
+                    sys.stdout.write(result['output'])
+                    if result['error'] is not None:
+                        name = kwargs.get('name', '<anon>')
+                        print("ERROR: {name} failed:\n{error}".format(name=name, error=result['error']))
+                        errors.append(name)
+                    for key, value in result['statistics'].items():
+                        statistics[key] += value
+                    if self._cache is not None:
+                        self._cache.addChanges(result['cache'])
+                    if self._profiler is not None:
+                        self._profiler.addResults(*result['profile'])
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            _worker_parser = None
+
+        return statistics, errors
+
     def _parse_and_execute_yml(self, filepath):
+        for kwargs in self._parse_yml(filepath):
+            self._execute_script(**kwargs)  # now we can execute the script
+
+    def _parse_yml(self, filepath):
         if not YAML_AVAILABLE:
             print("pyyaml not available!")
             sys.exit(1)
 
-        with open(filepath, 'r') as stream:
-            try:
-                parsed = yaml.safe_load(stream)  # parse file
-
-                if parsed is None:
-                    print("empty file!")
-                    return
+        try:
+            parsed = loadYamlFile(filepath)  # parse file
+        except yaml.YAMLError as exc:
+            print(exc)
+            return
 
-                for footprint in parsed:
-                    kwargs = parsed.get(footprint)
+        if parsed is None:
+            print("empty file!")
+            return
 
-                    # name is a reserved key
-                    if 'name' in kwargs:
-                        print("ERROR: name is already used for root name!")
-                        continue
-                    kwargs['name'] = footprint
+        for footprint in parsed:
+            kwargs = parsed.get(footprint)
 
-                    self._execute_script(**kwargs)  # now we can execute the script
+            # name is a reserved key
+            if 'name' in kwargs:
+                print("ERROR: name is already used for root name!")
+                continue
+            kwargs['name'] = footprint
 
-            except yaml.YAMLError as exc:
-                print(exc)
+            yield kwargs
 
     def _create_example_data_required(self, **kwargs):
         params = {}
@@ -208,6 +333,10 @@ class ModArgparser(object):
         print(yaml.dump(data, default_flow_style=False))
 
     def _parse_and_execute_csv(self, filepath):
+        for kwargs in self._parse_csv(filepath):
+            self._execute_script(**kwargs)  # now we can execute the script
+
+    def _parse_csv(self, filepath):
         with open(filepath, 'r') as stream:
             # dialect = csv.Sniffer().sniff(stream.read(1024))  # check which type of formating the csv file likel has
             # stream.seek(0)
@@ -220,7 +349,7 @@ class ModArgparser(object):
                 for k, v in row.items():
                     kwargs[k.strip()] = v.strip()
 
-                self._execute_script(**kwargs)  # now we can execute the script
+                yield kwargs
 
     def _print_example_csv(self):
         writer = csv.DictWriter(sys.stdout, fieldnames=self._params.keys())
@@ -260,4 +389,67 @@ class ModArgparser(object):
         if error:
             return
 
-        self._footprint_function(parsed_args)
+        name = kwargs.get('name', '<anon>')
+        if self._profiler is not None:
+            generated = self._profiler.profile(name, self._generate_footprint, name, parsed_args)
+        else:
+            generated = self._generate_footprint(name, parsed_args)
+
+        if not generated:
+            print("    up to date")
+
+    def _generate_footprint(self, name, parsed_args):
+        if self._cache is None:
+            self._footprint_function(parsed_args)
+            return True
+
+        return self._cache.execute(name, parsed_args, self._footprint_function, parsed_args)
+
+
+# parser used by the worker processes of ModArgparser._execute_parallel
+_worker_parser = None
+
+
+def _canFork():
+    r"""Check if worker processes can be created by forking, which lets them inherit the parser"""
+    if hasattr(multiprocessing, 'get_all_start_methods'):
+        return 'fork' in multiprocessing.get_all_start_methods()
+
+    # python 2 forks on all platforms except windows
+    return sys.platform != 'win32'
+
+
+def _createForkPool(processes):
+    r"""Create a pool of worker processes, which are forked from this process"""
+    if hasattr(multiprocessing, 'get_context'):
+        return multiprocessing.get_context('fork').Pool(processes)
+
+    # python 2 has no start methods, its pool forks wherever _canFork() allows parallel execution
+    return multiprocessing.Pool(processes)
+
+
+def _execute_footprint(kwargs):
+    r"""Generate a single footprint inside a worker process
+
+    :return: dict with the captured output, formatted traceback (or None), write statistics, build cache changes and
+             profiler results of this footprint
+    """
+    resetWriteStatistics()
+    stdout = sys.stdout
+    sys.stdout = output = StringIO()
+    try:
+        _worker_parser._execute_script(**kwargs)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        sys.stdout = stdout
+
+    cache = _worker_parser._cache
+    profiler = _worker_parser._profiler
+
+    return {'output': output.getvalue(),
+            'error': error,
+            'statistics': getWriteStatistics(),
+            'cache': cache.popChanges() if cache is not None else None,
+            'profile': profiler.popResults() if profiler is not None else None}
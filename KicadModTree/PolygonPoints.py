@@ -14,10 +14,60 @@
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 # (C) 2018 by Rene Poeschl, github @poeschlr
 
+import sys
 import warnings
+from bisect import bisect_left
+from math import sin, cos, hypot, radians
 
-from KicadModTree.Vector import Vector2D
-from KicadModTree.nodes.Node import Node
+from KicadModTree.Vector import Vector2D, _vector2D, _parse2D
+from KicadModTree.nodes.Node import Node, IDENTITY_TRANSFORMATION
+
+# numpy takes longer to import than all of KicadModTree, so it is only imported when point arrays are enabled
+numpy = None
+
+# opt-in mode, which stores the points of new polygons in a (N, 2) numpy array
+_point_arrays = False
+
+
+def usePointArrays(enabled=True):
+    r"""Enable or disable the numpy backed point storage of polygons
+
+    When enabled, all polygon points created afterwards are stored in a (N, 2) float array. Rotating, translating,
+    mirroring, rounding and calculating the bounding box are then done as single array operations, which makes
+    transforming outlines and custom pads with many vertices considerably faster.
+
+    Accessing the points as ``Vector2D`` (``nodes``, iteration or indexing) converts the storage back to a list
+    of vectors, which are not updated by later array operations.
+
+    :param enabled: ``True`` to store points in numpy arrays, ``False`` to use lists of Vector2D (default)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> from KicadModTree.PolygonPoints import usePointArrays
+    >>> usePointArrays()
+    """
+    global _point_arrays, numpy
+    if enabled and numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError('numpy is required for storing polygon points in arrays')
+    _point_arrays = bool(enabled)
+
+
+def isPointArrays():
+    r"""Check if polygon points are stored in numpy arrays
+
+    :return: ``True`` if new polygons store their points in numpy arrays
+    """
+    return _point_arrays
+
+
+def _isArray(nodes):
+    # without numpy being imported, there cannot be any arrays
+    numpy_module = sys.modules.get('numpy')
+    return numpy_module is not None and isinstance(nodes, numpy_module.ndarray)
 
 
 class PolygonPoints(object):
@@ -40,14 +90,16 @@ class PolygonPoints(object):
     >>> PolyPoint([{'x': 0, 'y':0}, {'x': 1, 'y':0}])
     """
     def __init__(self, **kwargs):
+        self._nodes = None
+        self._array = None
+        self._use_array = _point_arrays
+
         self._initMirror(**kwargs)
         self._initNodes(**kwargs)
 
     def _initNodes(self, **kwargs):
-        self.nodes = []
         if 'nodes' in kwargs:
-            for n in kwargs['nodes']:
-                self.nodes.append(Vector2D(n))
+            nodes = kwargs['nodes']
             if 'polygone' in kwargs:
                 raise KeyError('Use of "nodes" and "polygone" parameter at the same time is not supported.')
         elif 'polygone' in kwargs:
@@ -55,12 +107,30 @@ class PolygonPoints(object):
                 "polygone argument is deprecated, use nodes instead",
                 DeprecationWarning
             )
-            for n in kwargs['polygone']:
-                self.nodes.append(Vector2D(n))
+            nodes = kwargs['polygone']
         else:
             raise KeyError('Either "nodes" or "polygone" parameter is required for creating a PolyPoint instance.')
 
-        for point in self.nodes:
+        if self._use_array:
+            if isinstance(nodes, numpy.ndarray):
+                points = numpy.array(nodes, dtype=float).reshape(-1, 2)
+            else:
+                points = numpy.array([tuple(Vector2D(n)) for n in nodes], dtype=float).reshape(-1, 2)
+
+            if self.mirror[0] is not None:
+                points[:, 0] = 2 * self.mirror[0] - points[:, 0]
+            if self.mirror[1] is not None:
+                points[:, 1] = 2 * self.mirror[1] - points[:, 1]
+
+            self._array = points
+            return
+
+        if _isArray(nodes):
+            nodes = nodes.tolist()
+
+        self._nodes = [Vector2D(n) for n in nodes]
+
+        for point in self._nodes:
             if self.mirror[0] is not None:
                 point.x = 2 * self.mirror[0] - point.x
             if self.mirror[1] is not None:
@@ -73,40 +143,83 @@ class PolygonPoints(object):
         if 'y_mirror' in kwargs and type(kwargs['y_mirror']) in [float, int]:
             self.mirror[1] = kwargs['y_mirror']
 
+    @property
+    def nodes(self):
+        r""" list of Vector2D describing the points
+
+        For array backed points the list is created on first access, and replaces the array as storage.
+        """
+        if self._nodes is None:
+            self._nodes = [_vector2D(x, y) for x, y in self._array.tolist()]
+            self._array = None
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes):
+        self._nodes = nodes
+        self._array = None
+
+    def _getArray(self):
+        if self._array is None:
+            self._array = numpy.array([(n.x, n.y) for n in self._nodes], dtype=float).reshape(-1, 2)
+            self._nodes = None
+        return self._array
+
     def calculateBoundingBox(self):
-        min = max = self.getRealPosition(self.nodes[0])
+        r""" Calculate the bounding box of all points
 
-        for n in self.nodes:
-            min.x = min([min.x, n.x])
-            min.y = min([min.y, n.y])
-            max.x = max([max.x, n.x])
-            max.y = max([max.y, n.y])
+        :return: dict with the Vector2D ``min`` and ``max`` corners
+        """
+        if self._use_array:
+            points = self._getArray()
+            (min_x, min_y), (max_x, max_y) = points.min(axis=0).tolist(), points.max(axis=0).tolist()
+        else:
+            min_x = min(n.x for n in self._nodes)
+            min_y = min(n.y for n in self._nodes)
+            max_x = max(n.x for n in self._nodes)
+            max_y = max(n.y for n in self._nodes)
+
+        return {'min': Vector2D(min_x, min_y), 'max': Vector2D(max_x, max_y)}
 
-        return Node.calculateBoundingBox({'min': min, 'max': max})
+    def getTransformedPoints(self, transformation=IDENTITY_TRANSFORMATION):
+        r""" Get the points after applying a node transformation
+
+        Used by the serializer to get the real position of all points without creating a vector for each of them.
+
+        :param transformation: transformation as returned by ``Node.getTransformation()``
+        :return: list of (x, y) tuples
+        """
+        if self._array is not None:
+            if transformation is IDENTITY_TRANSFORMATION:
+                return [(x, y) for x, y in self._array.tolist()]
+
+            a, b, c, d, tx, ty, r = transformation
+            xs, ys = self._array[:, 0], self._array[:, 1]
+            return list(zip((a*xs + b*ys + tx).tolist(), (c*xs + d*ys + ty).tolist()))
+
+        if transformation is IDENTITY_TRANSFORMATION:
+            return [(float(n.x), float(n.y)) for n in self._nodes]
+
+        a, b, c, d, tx, ty, r = transformation
+        return [(a*n.x + b*n.y + tx, c*n.x + d*n.y + ty) for n in self._nodes]
 
     def findNearestPoints(self, other):
         r""" Find the nearest points for two polygons
 
         Find the two points for both polygons that are nearest to each other.
+        If several pairs have the same distance, the one with the lowest indexes is returned.
 
+        The points of the other polygon are sorted by their x coordinate, which allows to skip all points which
+        are further away in x direction than the nearest pair found so far.
 
         :param other: the polygon points of the other polygon
         :return: a tuble with the indexes of the two points
                  (pint in self, point in other)
         """
 
-        min_distance = self[0].distance_to(other[0])
-        pi = 0
-        pj = 0
-        for i in range(len(self)):
-            for j in range(len(other)):
-                d = self[i].distance_to(other[j])
-                if d < min_distance:
-                    pi = i
-                    pj = j
-                    min_distance = d
-
-        return (pi, pj)
+        distance, idx_self, idx_other = _nearestPair(_SortedPoints(_pointTuples(other)), _pointTuples(self),
+                                                     query_is_self=True)
+        return (idx_self, idx_other)
 
     def getPoints(self):
         r""" get the points contained within self
@@ -115,7 +228,7 @@ class PolygonPoints(object):
         """
         return self.nodes
 
-    def cut(self, other):
+    def cut(self, *other):
         r""" Cut other polygon points from self
 
         As kicad has no native support for cuting one polygon from the other,
@@ -126,6 +239,10 @@ class PolygonPoints(object):
         It also assumes that connecting the two nearest points creates a valid
         polygon. (There are no geometry checks)
 
+        Multiple polygons can be cut in one pass. Each of them is connected to the nearest point of the outline
+        of this polygon as it was before the cut. Polygons connected to the same point are added in the given
+        order.
+
         :param other: the polygon points that are cut from this polygon
         """
 
@@ -135,13 +252,45 @@ class PolygonPoints(object):
             "Check resulting polygon carefully.",
             Warning
         )
-        idx_self, idx_other = self.findNearestPoints(other)
 
-        self.nodes.insert(idx_self+1, self[idx_self])
-        for i in range(len(other)):
-            self.nodes.insert(idx_self+1, other[(i+idx_other) % len(other)])
+        index = _SortedPoints(_pointTuples(self))
+        cuts = {}
+        for polygon in other:
+            distance, idx_self, idx_other = _nearestPair(index, _pointTuples(polygon), query_is_self=False)
+            cuts.setdefault(idx_self, []).append((polygon, idx_other))
 
-        self.nodes.insert(idx_self+1, other[idx_other])
+        if self._array is not None:
+            self._array = self._cutArray(self._array, cuts)
+        else:
+            self._nodes = self._cutList(self._nodes, cuts)
+
+    @staticmethod
+    def _cutList(nodes, cuts):
+        result = []
+        for idx_self, node in enumerate(nodes):
+            result.append(node)
+            for polygon, idx_other in cuts.get(idx_self, []):
+                # go around the other polygon, starting and ending at its nearest point
+                other = _pointTuples(polygon)
+                result.extend(_vector2D(*other[(idx_other - i) % len(other)]) for i in range(len(other) + 1))
+                result.append(node.__copy__())
+
+        return result
+
+    @staticmethod
+    def _cutArray(points, cuts):
+        parts = []
+        last = 0
+        for idx_self in sorted(cuts):
+            parts.append(points[last:idx_self + 1])
+            for polygon, idx_other in cuts[idx_self]:
+                other = numpy.array(_pointTuples(polygon), dtype=float).reshape(-1, 2)
+                parts.append(other[(idx_other - numpy.arange(len(other) + 1)) % len(other)])
+                parts.append(points[idx_self:idx_self + 1])
+            last = idx_self + 1
+        parts.append(points[last:])
+
+        return numpy.concatenate(parts)
 
     def rotate(self, angle, origin=(0, 0), use_degrees=True):
         r""" Rotate points around given origin
@@ -155,8 +304,25 @@ class PolygonPoints(object):
                 rotation angle is given in degrees. default:True
         """
 
-        for p in self.nodes:
-            p.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        if not self._use_array:
+            for p in self._nodes:
+                p.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+            return self
+
+        op = Vector2D(origin)
+
+        if use_degrees:
+            angle = radians(angle)
+
+        cos_angle = cos(angle)
+        sin_angle = sin(angle)
+
+        points = self._getArray()
+        dx = points[:, 0] - op.x
+        dy = points[:, 1] - op.y
+        points[:, 0] = op.x + cos_angle * dx - sin_angle * dy
+        points[:, 1] = op.y + sin_angle * dx + cos_angle * dy
+
         return self
 
     def translate(self, distance_vector):
@@ -167,11 +333,33 @@ class PolygonPoints(object):
                 2D vector defining by how much and in what direction to translate.
         """
 
-        for p in self.nodes:
-            p += distance_vector
+        if not self._use_array:
+            for p in self._nodes:
+                p += distance_vector
+            return self
+
+        x, y = _parse2D(distance_vector)
+
+        points = self._getArray()
+        points[:, 0] += x
+        points[:, 1] += y
+
         return self
 
+    def round_to(self, base):
+        r""" Round all points to a specific base (like it's required for a grid)
+
+        :param base: base we want to round to
+        :return: polygon points with the rounded points
+        """
+        if not self._use_array or base == 0 or base is None:
+            return PolygonPoints(nodes=[n.round_to(base) for n in self])
+
+        return PolygonPoints(nodes=numpy.round(self._getArray() / base) * base)
+
     def __copy__(self):
+        if self._array is not None:
+            return PolygonPoints(nodes=self._array)
         return PolygonPoints(nodes=self.nodes)
 
     def __iter__(self):
@@ -182,4 +370,59 @@ class PolygonPoints(object):
         return self.nodes[idx]
 
     def __len__(self):
-        return len(self.nodes)
+        if self._array is not None:
+            return len(self._array)
+        return len(self._nodes)
+
+
+def _pointTuples(points):
+    # coordinates of polygon points as list of (x, y) tuples
+    if isinstance(points, PolygonPoints):
+        return points.getTransformedPoints()
+    return [_parse2D(p) for p in points]
+
+
+class _SortedPoints(object):
+    # points sorted by their x coordinate, used for nearest point searches
+
+    def __init__(self, points):
+        order = sorted(range(len(points)), key=lambda i: points[i][0])
+        self.indexes = order
+        self.xs = [points[i][0] for i in order]
+        self.ys = [points[i][1] for i in order]
+
+
+def _nearestPair(index, points, query_is_self):
+    r""" Find the nearest pair between the points of an index, and a list of points
+
+    The result is the pair with the lowest (distance, index in self, index in other), which is the same pair a
+    brute force search over all pairs would return.
+
+    :param index: _SortedPoints of one polygon
+    :param points: list of (x, y) tuples of the other polygon
+    :param query_is_self: ``True`` if points belong to self, and index to the other polygon
+    :return: (distance, index in self, index in other)
+    """
+    if not index.xs or not points:
+        raise IndexError('polygon without points')
+
+    xs, ys, indexes = index.xs, index.ys, index.indexes
+    count = len(xs)
+    best = None
+
+    for q, (x, y) in enumerate(points):
+        start = bisect_left(xs, x)
+
+        # search in both directions until the x distance alone is bigger than the best distance found so far
+        for candidates in (range(start, count), range(start - 1, -1, -1)):
+            for k in candidates:
+                dx = xs[k] - x
+                if best is not None and abs(dx) > best[0]:
+                    break
+
+                distance = hypot(dx, ys[k] - y)
+                candidate = (distance, q, indexes[k]) if query_is_self else (distance, indexes[k], q)
+                if best is None or candidate < best:
+                    best = candidate
+
+    return best
@@ -0,0 +1,251 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import json
+import time
+import cProfile
+import pstats
+
+
+# wall clock and cpu time, python 2 does not have the more precise clocks of python 3.3
+_clock = getattr(time, 'perf_counter', time.time)
+_cpu_clock = time.process_time if hasattr(time, 'process_time') else time.clock
+
+
+# phases of the generation of a footprint
+PHASE_BUILD = 'build'  # everything which is not part of another phase, mainly building the footprint tree
+PHASE_EXPAND = 'expand'  # walking the tree and expanding the virtual childs
+PHASE_SERIALIZE = 'serialize'  # converting the base nodes into the file format
+PHASE_WRITE = 'write'  # writing the file
+PHASES = (PHASE_BUILD, PHASE_EXPAND, PHASE_SERIALIZE, PHASE_WRITE)
+
+# profiler of the footprint which is currently generated
+_active_profiler = None
+
+
+class _NullPhase(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def profilePhase(phase):
+    r"""Measure the time of a phase of the footprint which is currently profiled
+
+    Used by the file handlers to split the time of a footprint into its phases. Without an active profiler, the
+    returned context manager does nothing.
+
+    :param phase: one of ``PHASE_EXPAND``, ``PHASE_SERIALIZE`` or ``PHASE_WRITE``
+
+    :Example:
+
+    >>> from KicadModTree.Profiler import profilePhase, PHASE_WRITE
+    >>> with profilePhase(PHASE_WRITE):
+    ...     f.write(content)
+    """
+    if _active_profiler is None:
+        return _NULL_PHASE
+    return _Phase(_active_profiler, phase)
+
+
+def isProfiling():
+    r"""Check if the footprint which is currently generated is profiled
+
+    :return: ``True`` if a Profiler measures the current footprint
+    """
+    return _active_profiler is not None
+
+
+class _Phase(object):
+    def __init__(self, profiler, phase):
+        self._profiler = profiler
+        self._phase = phase
+
+    def __enter__(self):
+        # the time of nested phases is only accounted to the inner phase
+        self._profiler._stack.append([self._phase, _clock(), _cpu_clock(), 0.0, 0.0])
+        return self
+
+    def __exit__(self, *args):
+        phase, wall_start, cpu_start, child_wall, child_cpu = self._profiler._stack.pop()
+        wall = _clock() - wall_start
+        cpu = _cpu_clock() - cpu_start
+
+        timing = self._profiler._record['phases'][phase]
+        timing['wall'] += wall - child_wall
+        timing['cpu'] += cpu - child_cpu
+
+        parent = self._profiler._stack[-1]
+        parent[3] += wall
+        parent[4] += cpu
+        return False
+
+
+def _newTimings():
+    return dict((phase, {'wall': 0.0, 'cpu': 0.0}) for phase in PHASES)
+
+
+class Profiler(object):
+    r"""Measure where the time is spent when generating footprints
+
+    For every footprint, the wall and cpu time is recorded and split into the time to build the tree, to expand the
+    virtual childs, to serialize the footprint and to write the file. Optionally, all footprints are also profiled
+    using ``cProfile``, and the aggregated statistics can be stored for analysis with ``pstats`` or other tools.
+
+    :param use_cprofile:
+        additionally collect ``cProfile`` statistics (default: False)
+    :type use_cprofile: ``bool``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> profiler = Profiler(use_cprofile=True)
+    >>> for name, parameters in footprints.items():
+    ...     profiler.profile(name, generate_footprint, parameters)
+    >>> profiler.writeReport('profile.json')
+    >>> profiler.writeStats('profile.pstats')
+    """
+
+    def __init__(self, use_cprofile=False):
+        self._records = []
+        self._record = None
+        self._stack = []
+        self._stats = None
+        self._cprofile = cProfile.Profile() if use_cprofile else None
+
+    def profile(self, name, function, *args, **kwargs):
+        r"""Call a footprint generating function and record its timing
+
+        :param name:
+            name of the footprint in the report
+        :param function:
+            function which generates the footprint, called with the remaining arguments
+
+        :return: the return value of the function
+        """
+        global _active_profiler
+
+        if _active_profiler is not None:
+            raise RuntimeError("footprint {} is already profiled".format(_active_profiler._record['name']))
+
+        self._record = {'name': name, 'wall': 0.0, 'cpu': 0.0, 'phases': _newTimings()}
+        self._stack = [[PHASE_BUILD, _clock(), _cpu_clock(), 0.0, 0.0]]
+        _active_profiler = self
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            if self._cprofile is not None:
+                self._cprofile.disable()
+            _active_profiler = None
+
+            _, wall_start, cpu_start, child_wall, child_cpu = self._stack.pop()
+            record = self._record
+            record['wall'] = _clock() - wall_start
+            record['cpu'] = _cpu_clock() - cpu_start
+            record['phases'][PHASE_BUILD]['wall'] += record['wall'] - child_wall
+            record['phases'][PHASE_BUILD]['cpu'] += record['cpu'] - child_cpu
+            self._records.append(record)
+            self._record = None
+
+    def getRecords(self):
+        r"""Get the timings of all profiled footprints, in the order they were generated"""
+        return list(self._records)
+
+    def getSummary(self):
+        r"""Get the timings summed over all profiled footprints"""
+        summary = {'footprints': len(self._records), 'wall': 0.0, 'cpu': 0.0, 'phases': _newTimings()}
+        for record in self._records:
+            summary['wall'] += record['wall']
+            summary['cpu'] += record['cpu']
+            for phase, timing in record['phases'].items():
+                summary['phases'][phase]['wall'] += timing['wall']
+                summary['phases'][phase]['cpu'] += timing['cpu']
+        return summary
+
+    def getStats(self):
+        r"""Get the aggregated ``cProfile`` statistics
+
+        :return: ``pstats.Stats`` or ``None`` if no statistics were collected
+        """
+        if self._cprofile is not None and self._cprofile.getstats():
+            self.addStats(self._popProfileStats())
+        return self._stats
+
+    def _popProfileStats(self):
+        self._cprofile.create_stats()
+        stats = self._cprofile.stats
+        self._cprofile = cProfile.Profile()
+        return stats
+
+    def popResults(self):
+        r"""Get and forget the records and ``cProfile`` statistics, used to move them between processes"""
+        records, self._records = self._records, []
+        stats = None
+        if self._cprofile is not None and self._cprofile.getstats():
+            stats = self._popProfileStats()
+        return records, stats
+
+    def addResults(self, records, stats=None):
+        r"""Add results returned by Profiler.popResults of another profiler"""
+        self._records.extend(records)
+        if stats:
+            self.addStats(stats)
+
+    def addStats(self, stats):
+        r"""Add raw ``cProfile`` statistics, like ``cProfile.Profile().stats``"""
+        source = _RawStats(stats)
+        if self._stats is None:
+            self._stats = pstats.Stats(source)
+        else:
+            self._stats.add(source)
+
+    def writeReport(self, filename):
+        r"""Write the timings of all footprints and their sum as json file"""
+        report = {'summary': self.getSummary(), 'footprints': self._records}
+        with io.open(filename, 'wb') as f:
+            # json.dumps returns str on python 2, which a text stream does not accept
+            f.write(json.dumps(report, sort_keys=True, indent=1).encode('utf-8'))
+
+    def writeStats(self, filename):
+        r"""Write the aggregated ``cProfile`` statistics in the format of ``pstats.Stats.dump_stats``"""
+        stats = self.getStats()
+        if stats is None:
+            raise RuntimeError("no cProfile statistics collected")
+        stats.dump_stats(filename)
+
+    def formatSummary(self):
+        r"""Get a single line describing where the time was spent"""
+        summary = self.getSummary()
+        phases = ", ".join("{} {:.3f}s".format(phase, summary['phases'][phase]['wall']) for phase in PHASES)
+        return "profiled {footprints} footprints: {wall:.3f}s wall, {cpu:.3f}s cpu ({phases})".format(
+            footprints=summary['footprints'], wall=summary['wall'], cpu=summary['cpu'], phases=phases)
+
+
+class _RawStats(object):
+    r"""Wrapper to load a dict of raw ``cProfile`` statistics into ``pstats.Stats``"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
@@ -22,6 +22,56 @@ from KicadModTree.util.kicad_util import formatFloat
 from math import sqrt, sin, cos, hypot, atan2, degrees, radians
 
 
+_new = object.__new__
+
+
+def _vector2D(x, y):
+    r"""Create a Vector2D without parsing or validating the arguments
+
+    Only meant for internal use where x and y are already known to be floats.
+    """
+    vector = _new(Vector2D)
+    vector.x = x
+    vector.y = y
+    return vector
+
+
+def _vector3D(x, y, z):
+    r"""Create a Vector3D without parsing or validating the arguments
+
+    Only meant for internal use where x, y and z are already known to be floats.
+    """
+    vector = _new(Vector3D)
+    vector.x = x
+    vector.y = y
+    vector.z = z
+    return vector
+
+
+def _parse2D(value):
+    # operand of an arithmetic operation as (x, y) tuple
+    if isinstance(value, Vector2D):
+        return value.x, value.y
+    if type(value) in (int, float):
+        value = float(value)
+        return value, value
+
+    other = Vector2D(value)
+    return other.x, other.y
+
+
+def _parse3D(value):
+    # operand of an arithmetic operation as (x, y, z) tuple
+    if isinstance(value, Vector3D):
+        return value.x, value.y, value.z
+    if type(value) in (int, float):
+        value = float(value)
+        return value, value, value
+
+    other = Vector3D(value)
+    return other.x, other.y, other.z
+
+
 class Vector2D(object):
     r"""Representation of a 2D Vector in space
 
@@ -34,18 +84,36 @@ class Vector2D(object):
     >>> Vector2D({'x': 0, 'y':0})
     >>> Vector2D(Vector2D(0, 0))
     """
+    __slots__ = ('x', 'y')
+
     def __init__(self, coordinates=None, y=None):
-        # parse constructor
+        # parse constructor, most common formats first
+        coordinates_type = type(coordinates)
+
+        # parse vectors with format: Vector2D(0, 0)
+        if coordinates_type in (int, float):
+            if y is None:
+                raise TypeError('you have to give x and y coordinate')
+            self.x = float(coordinates)
+            self.y = float(y)
+            return
+
+        # parse vectors with format: Vector2D([0, 0]) or Vector2D((0, 0))
+        if coordinates_type in (list, tuple):
+            if len(coordinates) != 2:
+                raise TypeError('invalid list size (2 elements expected)')
+            self.x = float(coordinates[0])
+            self.y = float(coordinates[1])
+            return
+
+        # parse Vector2D as well as Vector3D
+        if isinstance(coordinates, Vector2D):
+            self.x = float(coordinates.x)
+            self.y = float(coordinates.y)
+            return
+
         if coordinates is None:
             coordinates = {}
-        elif type(coordinates) in [int, float]:
-            if y is not None:
-                coordinates = [coordinates, y]
-            else:
-                raise TypeError('you have to give x and y coordinate')
-        elif isinstance(coordinates, Vector2D):
-            # convert Vector2D as well as Vector3D to dict
-            coordinates = coordinates.__dict__()
 
         # parse vectors with format: Vector2D({'x':0, 'y':0})
         if type(coordinates) is dict:
@@ -53,15 +121,6 @@ class Vector2D(object):
             self.y = float(coordinates.get('y', 0.))
             return
 
-        # parse vectors with format: Vector2D([0, 0]) or Vector2D((0, 0))
-        if type(coordinates) in [list, tuple]:
-            if len(coordinates) == 2:
-                self.x = float(coordinates[0])
-                self.y = float(coordinates[1])
-                return
-            else:
-                raise TypeError('invalid list size (2 elements expected)')
-
         raise TypeError('invalid parameters given')
 
     def round_to(self, base):
@@ -84,18 +143,8 @@ class Vector2D(object):
         :param value: the other point
         :return: distance between self and other point
         """
-        other = Vector2D.__arithmetic_parse(value)
-        d = other - self
-        return hypot(d.x, d.y)
-
-    @staticmethod
-    def __arithmetic_parse(value):
-        if isinstance(value, Vector2D):
-            return value
-        elif type(value) in [int, float]:
-            return Vector2D([value, value])
-        else:
-            return Vector2D(value)
+        x, y = _parse2D(value)
+        return hypot(x - self.x, y - self.y)
 
     def __eq__(self, other):
         if not isinstance(self, other.__class__):
@@ -106,45 +155,37 @@ class Vector2D(object):
         return not self.__eq__(other)
 
     def __add__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-
-        return Vector2D({'x': self.x + other.x,
-                         'y': self.y + other.y})
+        x, y = _parse2D(value)
+        return _vector2D(self.x + x, self.y + y)
 
     def __iadd__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-        self.x += other.x
-        self.y += other.y
+        x, y = _parse2D(value)
+        self.x += x
+        self.y += y
 
         return self
 
     def __neg__(self):
-        return Vector2D({'x': -self.x, 'y': -self.y})
+        return _vector2D(-self.x, -self.y)
 
     def __sub__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-
-        return Vector2D({'x': self.x - other.x,
-                         'y': self.y - other.y})
+        x, y = _parse2D(value)
+        return _vector2D(self.x - x, self.y - y)
 
     def __isub__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-        self.x -= other.x
-        self.y -= other.y
+        x, y = _parse2D(value)
+        self.x -= x
+        self.y -= y
 
         return self
 
     def __mul__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-
-        return Vector2D({'x': self.x * other.x,
-                         'y': self.y * other.y})
+        x, y = _parse2D(value)
+        return _vector2D(self.x * x, self.y * y)
 
     def __div__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-
-        return Vector2D({'x': self.x / other.x,
-                         'y': self.y / other.y})
+        x, y = _parse2D(value)
+        return _vector2D(self.x / x, self.y / y)
 
     def __truediv__(self, obj):
         return self.__div__(obj)
@@ -152,6 +193,18 @@ class Vector2D(object):
     def __dict__(self):
         return {'x': self.x, 'y': self.y}
 
+    def __getstate__(self):
+        return (self.x, self.y)
+
+    def __setstate__(self, state):
+        self.x, self.y = state
+
+    def __deepcopy__(self, memo):
+        other = _new(self.__class__)
+        other.x = self.x
+        other.y = self.y
+        return other
+
     def render(self, formatcode):
         warnings.warn(
             "render is deprecated, read values directly instead",
@@ -190,7 +243,7 @@ class Vector2D(object):
         yield self.y
 
     def __copy__(self):
-        return Vector2D(self.x, self.y)
+        return _vector2D(self.x, self.y)
 
     def rotate(self, angle, origin=(0, 0), use_degrees=True):
         r""" Rotate vector around given origin
@@ -209,9 +262,13 @@ class Vector2D(object):
         if use_degrees:
             angle = radians(angle)
 
-        temp = op.x + cos(angle) * (self.x - op.x) - sin(angle) * (self.y - op.y)
-        self.y = op.y + sin(angle) * (self.x - op.x) + cos(angle) * (self.y - op.y)
-        self.x = temp
+        cos_angle = cos(angle)
+        sin_angle = sin(angle)
+        dx = self.x - op.x
+        dy = self.y - op.y
+
+        self.x = op.x + cos_angle * dx - sin_angle * dy
+        self.y = op.y + sin_angle * dx + cos_angle * dy
 
         return self
 
@@ -227,10 +284,11 @@ class Vector2D(object):
 
         op = Vector2D(origin)
 
-        diff = self - op
-        radius = hypot(diff.x, diff.y)
+        dx = self.x - op.x
+        dy = self.y - op.y
+        radius = hypot(dx, dy)
 
-        angle = atan2(diff.y, diff.x)
+        angle = atan2(dy, dx)
         if use_degrees:
             angle = degrees(angle)
 
@@ -254,16 +312,15 @@ class Vector2D(object):
         if use_degrees:
             angle = radians(angle)
 
-        x = radius * cos(angle)
-        y = radius * sin(angle)
+        op = Vector2D(origin)
 
-        return Vector2D({'x': x, 'y': y})+Vector2D(origin)
+        return _vector2D(float(radius * cos(angle)) + op.x, float(radius * sin(angle)) + op.y)
 
     def to_homogeneous(self):
         r""" Get homogeneous representation
         """
 
-        return Vector3D(self.x, self.y, 1)
+        return _vector3D(self.x, self.y, 1.)
 
     @staticmethod
     def from_homogeneous(source):
@@ -290,50 +347,53 @@ class Vector3D(Vector2D):
     >>> Vector3D(Vector2D(0, 0))
     >>> Vector3D(Vector3D(0, 0, 0))
     """
+    __slots__ = ('z',)
 
     def __init__(self, coordinates=None, y=None, z=None):
         # we don't need a super constructor here
 
-        # parse constructor
+        # parse constructor, most common formats first
+        coordinates_type = type(coordinates)
+
+        # parse vectors with format: Vector3D(0, 0) or Vector3D(0, 0, 0)
+        if coordinates_type in (int, float):
+            if y is None:
+                raise TypeError('you have to give at least x and y coordinate')
+            self.x = float(coordinates)
+            self.y = float(y)
+            self.z = float(z) if z is not None else 0.
+            return
+
+        # parse vectors with format: Vector3D([0, 0]), Vector3D([0, 0, 0]) or Vector3D((0, 0)), Vector3D((0, 0, 0))
+        if coordinates_type in (list, tuple):
+            if len(coordinates) < 2:
+                raise TypeError('invalid list size (to small)')
+            if len(coordinates) > 3:
+                raise TypeError('invalid list size (to big)')
+
+            self.x = float(coordinates[0])
+            self.y = float(coordinates[1])
+            self.z = float(coordinates[2]) if len(coordinates) == 3 else 0.
+            return
+
+        # parse Vector2D as well as Vector3D
+        if isinstance(coordinates, Vector2D):
+            self.x = float(coordinates.x)
+            self.y = float(coordinates.y)
+            self.z = float(coordinates.z) if isinstance(coordinates, Vector3D) else 0.
+            return
+
         if coordinates is None:
             coordinates = {}
-        elif type(coordinates) in [int, float]:
-            if y is not None:
-                if z is not None:
-                    coordinates = [coordinates, y, z]
-                else:
-                    coordinates = [coordinates, y]
-            else:
-                raise TypeError('you have to give at least x and y coordinate')
-        elif isinstance(coordinates, Vector2D):
-            # convert Vector2D as well as Vector3D to dict
-            coordinates = coordinates.__dict__()
 
-        # parse vectors with format: Vector2D({'x':0, 'y':0})
+        # parse vectors with format: Vector3D({'x':0, 'y':0, 'z':0})
         if type(coordinates) is dict:
             self.x = float(coordinates.get('x', 0.))
             self.y = float(coordinates.get('y', 0.))
             self.z = float(coordinates.get('z', 0.))
             return
 
-        # parse vectors with format: Vector3D([0, 0]), Vector3D([0, 0, 0]) or Vector3D((0, 0)), Vector3D((0, 0, 0))
-        if type(coordinates) in [list, tuple]:
-            if len(coordinates) >= 2:
-                self.x = float(coordinates[0])
-                self.y = float(coordinates[1])
-            else:
-                raise TypeError('invalid list size (to small)')
-
-            if len(coordinates) == 3:
-                self.z = float(coordinates[2])
-            else:
-                self.z = 0.
-
-            if len(coordinates) > 3:
-                raise TypeError('invalid list size (to big)')
-
-        else:
-            raise TypeError('dict or list type required')
+        raise TypeError('dict or list type required')
 
     def round_to(self, base):
         r"""Round to a specific base (like it's required for a grid)
@@ -350,26 +410,16 @@ class Vector3D(Vector2D):
         return Vector3D([round(v / base) * base for v in self])
 
     def cross_product(self, other):
-        other = Vector3D.__arithmetic_parse(other)
+        x, y, z = _parse3D(other)
 
-        return Vector3D({
-                    'x': self.y*other.z - self.z*other.y,
-                    'y': self.z*other.x - self.x*other.z,
-                    'z': self.x*other.y - self.y*other.x})
+        return _vector3D(self.y*z - self.z*y,
+                         self.z*x - self.x*z,
+                         self.x*y - self.y*x)
 
     def dot_product(self, other):
-        other = Vector3D.__arithmetic_parse(other)
+        x, y, z = _parse3D(other)
 
-        return self.x*other.x + self.y*other.y + self.z*other.z
-
-    @staticmethod
-    def __arithmetic_parse(value):
-        if isinstance(value, Vector3D):
-            return value
-        elif type(value) in [int, float]:
-            return Vector3D([value, value, value])
-        else:
-            return Vector3D(value)
+        return self.x*x + self.y*y + self.z*z
 
     def __eq__(self, other):
         if not isinstance(self, other.__class__):
@@ -380,53 +430,40 @@ class Vector3D(Vector2D):
         return not self.__eq__(other)
 
     def __add__(self, value):
-        other = Vector3D.__arithmetic_parse(value)
-
-        return Vector3D({'x': self.x + other.x,
-                         'y': self.y + other.y,
-                         'z': self.z + other.z})
+        x, y, z = _parse3D(value)
+        return _vector3D(self.x + x, self.y + y, self.z + z)
 
     def __iadd__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-        self.x += other.x
-        self.y += other.y
-        self.z += other.z
+        x, y, z = _parse3D(value)
+        self.x += x
+        self.y += y
+        self.z += z
 
         return self
 
     def __neg__(self):
-        return Vector2D({'x': -self.x,
-                         'y': -self.y,
-                         'z': -self.z})
+        # kept for compatibility: negating a Vector3D has always returned a Vector2D
+        return _vector2D(-self.x, -self.y)
 
     def __sub__(self, value):
-        other = Vector3D.__arithmetic_parse(value)
-
-        return Vector3D({'x': self.x - other.x,
-                         'y': self.y - other.y,
-                         'z': self.z - other.z})
+        x, y, z = _parse3D(value)
+        return _vector3D(self.x - x, self.y - y, self.z - z)
 
     def __isub__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-        self.x -= other.x
-        self.y -= other.y
-        self.z -= other.z
+        x, y, z = _parse3D(value)
+        self.x -= x
+        self.y -= y
+        self.z -= z
 
         return self
 
     def __mul__(self, value):
-        other = Vector3D.__arithmetic_parse(value)
-
-        return Vector3D({'x': self.x * other.x,
-                         'y': self.y * other.y,
-                         'z': self.z * other.z})
+        x, y, z = _parse3D(value)
+        return _vector3D(self.x * x, self.y * y, self.z * z)
 
     def __div__(self, value):
-        other = Vector3D.__arithmetic_parse(value)
-
-        return Vector3D({'x': self.x / other.x,
-                         'y': self.y / other.y,
-                         'z': self.z / other.z})
+        x, y, z = _parse3D(value)
+        return _vector3D(self.x / x, self.y / y, self.z / z)
 
     def __truediv__(self, obj):
         return self.__div__(obj)
@@ -434,6 +471,19 @@ class Vector3D(Vector2D):
     def __dict__(self):
         return {'x': self.x, 'y': self.y, 'z': self.z}
 
+    def __getstate__(self):
+        return (self.x, self.y, self.z)
+
+    def __setstate__(self, state):
+        self.x, self.y, self.z = state
+
+    def __deepcopy__(self, memo):
+        other = _new(self.__class__)
+        other.x = self.x
+        other.y = self.y
+        other.z = self.z
+        return other
+
     def render(self, formatcode):
         warnings.warn(
             "render is deprecated, read values directly instead",
@@ -478,4 +528,4 @@ class Vector3D(Vector2D):
         yield self.z
 
     def __copy__(self):
-        return Vector3D(self.x, self.y, self.z)
+        return _vector3D(self.x, self.y, self.z)
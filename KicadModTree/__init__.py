@@ -13,14 +13,38 @@
 #
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-from KicadModTree.Vector import *
-from KicadModTree.Point import *  # backwards compatibility
+from KicadModTree.util.lazy_import import lazyImport
+from KicadModTree import nodes
 
-# all different types of nodes
-from KicadModTree.nodes import *
+_attributes = {
+    'Vector': ('.Vector', None),
+    'Vector2D': ('.Vector', 'Vector2D'),
+    'Vector3D': ('.Vector', 'Vector3D'),
+
+    # backwards compatibility
+    'Point': ('.Point', 'Point'),
+    'Point2D': ('.Point', 'Point2D'),
+    'Point3D': ('.Point', 'Point3D'),
+
+    'nodes': ('.nodes', None),
+    'util': ('.util', None),
+
+    # File Handlers
+    'FileHandler': ('.FileHandler', None),
+    'KicadFileHandler': ('.KicadFileHandler', 'KicadFileHandler'),
 
-# File Handlers
-from KicadModTree.KicadFileHandler import KicadFileHandler
+    # Argparser
+    'ModArgparser': ('.ModArgparser', 'ModArgparser'),
+
+    # Incremental builds
+    'BuildCache': ('.BuildCache', 'BuildCache'),
+
+    # Profiling
+    'Profiler': ('.Profiler', 'Profiler'),
+}
+
+# all different types of nodes
+_attributes.update((name, ('.nodes', name)) for name in nodes.__all__ if name not in _attributes)
 
-# Argparser
-from KicadModTree.ModArgparser import ModArgparser
+# everything is imported on first access, so scripts only load the modules they use
+__all__, __getattr__, __dir__ = lazyImport(__name__, _attributes)
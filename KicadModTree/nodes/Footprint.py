@@ -74,3 +74,15 @@ class Footprint(Node):
         assert abs(value) <= 1, "Solder paste margin must be between -1 and 1. {} is too large.".format(value)
 
         self.pasteMarginRatio = value
+
+    def clipSilkscreen(self, clearance, min_length=0.01):
+        r"""Trim all silkscreen lines, arcs and circles, so they keep the clearance to all pads
+
+        Meant to be called after the footprint is complete, see
+        :class:`KicadModTree.util.silkscreen_clearance.SilkscreenClearance`
+
+        :return: number of silkscreen nodes which were trimmed
+        """
+        # imported on use, the clipper depends on KicadFileHandler, which imports this module
+        from KicadModTree.util.silkscreen_clearance import SilkscreenClearance
+        return SilkscreenClearance(self, clearance, min_length=min_length).apply()
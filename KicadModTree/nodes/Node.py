@@ -14,8 +14,10 @@
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 from copy import copy, deepcopy
+from itertools import chain
 
 from KicadModTree.Vector import *
+from KicadModTree.util.spatial_index import RTree
 
 
 class MultipleParentsError(RuntimeError):
@@ -32,8 +34,45 @@ class RecursionDetectedError(RuntimeError):
         super(RecursionDetectedError, self).__init__(message)
 
 
+# affine transformation (a, b, c, d, tx, ty, rotation) which maps a point onto:
+#   x' = a*x + b*y + tx
+#   y' = c*x + d*y + ty
+# and adds rotation to the rotation of the transformed element
+IDENTITY_TRANSFORMATION = (1., 0., 0., 1., 0., 0., 0)
+
+
+def composeTransformations(outer, inner):
+    '''
+    return the transformation which applies inner first, and outer afterwards
+    '''
+    if inner is IDENTITY_TRANSFORMATION:
+        return outer
+    if outer is IDENTITY_TRANSFORMATION:
+        return inner
+
+    oa, ob, oc, od, otx, oty, orot = outer
+    ia, ib, ic, id, itx, ity, irot = inner
+
+    return (oa*ia + ob*ic, oa*ib + ob*id,
+            oc*ia + od*ic, oc*ib + od*id,
+            oa*itx + ob*ity + otx, oc*itx + od*ity + oty,
+            irot + orot)
+
+
 class Node(object):
+    # world transformation of this node, calculated on first use
+    _transformation = None
+    # virtual childs of this node, created on first use
+    _virtual_childs = None
+    # spatial index of the serialized nodes, created on first use
+    _spatial_index = None
+    # set while the node is part of a cached spatial index, which is kept by the node itself or one of its parents
+    _spatially_indexed = False
+    # defined for the class as well, as specialized nodes can set attributes before calling Node.__init__
+    _parent = None
+
     def __init__(self):
+        # the caches are not set here, their class attributes are used until they are filled
         self._parent = None
         self._childs = []
 
@@ -50,6 +89,8 @@ class Node(object):
         self._childs.append(node)
 
         node._parent = self
+        node._invalidateTransformation()
+        self._invalidateSpatialIndex()
 
     def extend(self, nodes):
         '''
@@ -68,8 +109,10 @@ class Node(object):
         # when all went smooth by now, we can set the parent nodes to ourself
         for node in new_nodes:
             node._parent = self
+            node._invalidateTransformation()
 
         self._childs.extend(new_nodes)
+        self._invalidateSpatialIndex()
 
     def remove(self, node):
         '''
@@ -82,6 +125,8 @@ class Node(object):
             self._childs.remove(node)
 
         node._parent = None
+        node._invalidateTransformation()
+        self._invalidateSpatialIndex()
 
     def insert(self, node):
         '''
@@ -96,16 +141,61 @@ class Node(object):
 
         self.append(node)
 
+    def replace(self, node, new_nodes):
+        '''
+        replace a child by a list of nodes, which take its position in the childs
+        '''
+        if not isinstance(node, Node):
+            raise TypeError('invalid object, has to be based on Node')
+
+        for new_node in new_nodes:
+            if not isinstance(new_node, Node):
+                raise TypeError('invalid object, has to be based on Node')
+
+            if new_node._parent:
+                raise MultipleParentsError('muliple parents are not allowed!')
+
+        for index, child in enumerate(self._childs):
+            if child is node:
+                break
+        else:
+            raise ValueError('node is not a child of this node')
+
+        self._childs[index:index + 1] = new_nodes
+
+        node._parent = None
+        node._invalidateTransformation()
+        for new_node in new_nodes:
+            new_node._parent = self
+            new_node._invalidateTransformation()
+        self._invalidateSpatialIndex()
+
     def copy(self):
         copy = deepcopy(self)
         copy._parent = None
+        copy._invalidateTransformation()
         return copy
 
     def serialize(self):
-        nodes = [self]
-        for child in self.getAllChilds():
-            nodes += child.serialize()
-        return nodes
+        return list(self.iter_serialize())
+
+    def iter_serialize(self):
+        '''
+        iterate over this node and all its (virtual) childs, in the same order as serialize() returns them
+
+        The tree is walked without recursion, and without building temporary child lists on every level.
+        '''
+        yield self
+
+        stack = [self._iterAllChilds()]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
+
+            yield child
+            stack.append(child._iterAllChilds())
 
     def getNormalChilds(self):
         '''
@@ -116,15 +206,41 @@ class Node(object):
     def getVirtualChilds(self):
         '''
         Get virtual childs of this node
+
+        The virtual childs are created once, and reused until _invalidateVirtualChilds() is called.
+        '''
+        if self._virtual_childs is None:
+            self._virtual_childs = self._createVirtualChilds()
+        return self._virtual_childs
+
+    def _createVirtualChilds(self):
+        '''
+        Create the virtual childs of this node, which have to be implemented by specialized nodes
         '''
         return []
 
+    def _invalidateVirtualChilds(self):
+        '''
+        Forget the virtual childs of this node, so they are created again on next use
+
+        Has to be called by every method which changes a parameter of the node after it was created. Setting an
+        attribute directly does not call it, as checking every attribute set would slow down creating nodes.
+        '''
+        self._virtual_childs = None
+        self._invalidateSpatialIndex()
+
     def getAllChilds(self):
         '''
         Get virtual and normal childs of this node
         '''
         return self.getNormalChilds() + self.getVirtualChilds()
 
+    def _iterAllChilds(self):
+        '''
+        Iterate over normal and virtual childs of this node, without concatenating them into a new list
+        '''
+        return chain(self.getNormalChilds(), self.getVirtualChilds())
+
     def getParent(self):
         '''
         get Parent Node of this Node
@@ -146,14 +262,112 @@ class Node(object):
         '''
         return position of point after applying all transformation and rotation operations
         '''
-        if not self._parent:
-            if rotation is None:
-                # TODO: most of the points are 2D Nodes
-                return Vector3D(coordinate)
-            else:
-                return Vector3D(coordinate), rotation
+        transformation = self.getTransformation()
+        position = Vector3D(coordinate)
+
+        if transformation is not IDENTITY_TRANSFORMATION:
+            a, b, c, d, tx, ty, r = transformation
+            x, y = position.x, position.y
+            position.x = a*x + b*y + tx
+            position.y = c*x + d*y + ty
+
+            if rotation is not None:
+                rotation += r
+
+        if rotation is None:
+            # TODO: most of the points are 2D Nodes
+            return position
+        else:
+            return position, rotation
+
+    def _getLocalTransformation(self):
+        '''
+        transformation which this node applies to its own coordinates and to all of its childs
+        '''
+        return IDENTITY_TRANSFORMATION
+
+    def getTransformation(self):
+        '''
+        get the transformation from the coordinate system of this node into the one of the root node
+
+        The result is composed once and cached until this node, or one of its parents is moved in the tree.
+        '''
+        if self._transformation is not None:
+            return self._transformation
 
-        return self._parent.getRealPosition(coordinate, rotation)
+        # walk up until we find a node which already knows its transformation
+        uncached_nodes = []
+        node = self
+        while node is not None and node._transformation is None:
+            uncached_nodes.append(node)
+            node = node._parent
+
+        transformation = IDENTITY_TRANSFORMATION if node is None else node._transformation
+        for node in reversed(uncached_nodes):
+            transformation = composeTransformations(transformation, node._getLocalTransformation())
+            node._transformation = transformation
+
+        return transformation
+
+    def _invalidateTransformation(self):
+        '''
+        forget the cached transformation of this node and all of its childs
+        '''
+        # the spatial indices of the parents contain the world positions of this node
+        self._invalidateSpatialIndex()
+
+        # a child can only have a cached transformation when its parent has one as well, and a spatial index can
+        # only exist when the transformations of the node and its childs are known
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._transformation is None:
+                continue
+
+            node._transformation = None
+            node._spatial_index = None
+            stack.extend(node._iterAllChilds())
+
+    def calculateWorldBoundingBox(self):
+        '''
+        get the bounding box (min_x, min_y, max_x, max_y) of this node in the coordinates of the root node
+
+        Only implemented by the base nodes, which are rendered into the footprint. The childs are not included.
+        Returns None for nodes without a position.
+        '''
+        return None
+
+    def getSpatialIndex(self):
+        '''
+        get an R-tree of the world bounding boxes of all nodes in serialize() which have a bounding box
+
+        Allows window, nearest neighbour and pairwise overlap queries over the rendered nodes, like pads or
+        silkscreen lines (see :class:`KicadModTree.util.spatial_index.RTree`). The index is created on first use,
+        and reused until a node below this one is added, removed, moved, rotated or translated. Other changes, like
+        setting a coordinate of a node directly, have to be followed by _invalidateSpatialIndex().
+        '''
+        if self._spatial_index is None:
+            entries = []
+            for node in self.iter_serialize():
+                node._spatially_indexed = True
+                box = node.calculateWorldBoundingBox()
+                if box is not None:
+                    entries.append(box + (node,))
+            self._spatial_index = RTree(entries)
+        return self._spatial_index
+
+    def _invalidateSpatialIndex(self):
+        '''
+        forget the spatial indices which contain this node, kept by the node itself or by its parents
+
+        All nodes between a node and the parent keeping an index are part of this index, so the walk stops at the
+        first node which is not part of any index. As long as no index was created, nothing is walked at all.
+        '''
+        node = self
+        while node is not None and node._spatially_indexed:
+            node._spatially_indexed = False
+            node._spatial_index = None
+            node = node._parent
 
     def calculateBoundingBox(self, outline=None):
         min_x, min_y = 0, 0
@@ -13,11 +13,23 @@
 #
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-# generic node
-from .Node import Node, MultipleParentsError, RecursionDetectedError
+from KicadModTree.util.lazy_import import lazyImport
+from . import base, specialized
 
-# root node
-from .Footprint import Footprint
+_attributes = {
+    # generic node
+    'Node': ('.Node', 'Node'),
+    'MultipleParentsError': ('.Node', 'MultipleParentsError'),
+    'RecursionDetectedError': ('.Node', 'RecursionDetectedError'),
 
-from .base import *
-from .specialized import *
+    # root node
+    'Footprint': ('.Footprint', 'Footprint'),
+
+    'base': ('.base', None),
+    'specialized': ('.specialized', None),
+}
+_attributes.update((name, ('.specialized', name)) for name in specialized.__all__ if name not in _attributes)
+_attributes.update((name, ('.base', name)) for name in base.__all__)
+
+# all different types of nodes, imported on first access
+__all__, __getattr__, __dir__ = lazyImport(__name__, _attributes)
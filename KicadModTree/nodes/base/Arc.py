@@ -17,6 +17,7 @@ from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
 import math
 from KicadModTree.util.geometric_util import geometricArc, BaseNodeIntersection
+from KicadModTree.util.spatial_index import boundingBox
 
 
 class Arc(Node, geometricArc):
@@ -68,6 +69,39 @@ class Arc(Node, geometricArc):
             layer=self.layer, width=self.width
             )
 
+    def rotate(self, angle, origin=(0, 0), use_degrees=True):
+        r""" Rotate arc around given origin
+
+        :params:
+            * *angle* (``float``)
+                rotation angle
+            * *origin* (``Vector2D``)
+                origin point for the rotation. default: (0, 0)
+            * *use_degrees* (``boolean``)
+                rotation angle is given in degrees. default:True
+        """
+
+        geometricArc.rotate(self, angle=angle, origin=origin, use_degrees=use_degrees)
+        self._invalidateSpatialIndex()
+        return self
+
+    def translate(self, distance_vector):
+        r""" Translate arc
+
+        :params:
+            * *distance_vector* (``Vector2D``)
+                2D vector defining by how much and in what direction to translate.
+        """
+
+        geometricArc.translate(self, distance_vector)
+        self._invalidateSpatialIndex()
+        return self
+
+    def setRadius(self, radius):
+        geometricArc.setRadius(self, radius)
+        self._invalidateSpatialIndex()
+        return self
+
     def cut(self, *other):
         r""" cut line with given other element
 
@@ -107,6 +141,20 @@ class Arc(Node, geometricArc):
 
         return Node.calculateBoundingBox({'min': Vector2D((min_x, min_y)), 'max': Vector2D((max_x, max_y))})
 
+    def calculateWorldBoundingBox(self):
+        center = self.getRealPosition(self.center_pos)
+        start = self.getRealPosition(self.start_pos)
+        radius = math.hypot(start.x - center.x, start.y - center.y)
+        start_angle = math.atan2(start.y - center.y, start.x - center.x)
+        end_angle = start_angle + math.radians(self.angle)
+
+        # the end points, and the points where the arc crosses the axes
+        angles = [start_angle, end_angle]
+        low, high = min(angles), max(angles)
+        angles += [k * math.pi / 2 for k in range(int(math.ceil(low / (math.pi / 2))),
+                                                  int(math.floor(high / (math.pi / 2))) + 1)]
+        return boundingBox([(center.x + radius * math.cos(a), center.y + radius * math.sin(a)) for a in angles])
+
     def _getRenderTreeText(self):
         render_strings = ['fp_arc']
         render_strings.append(self.center_pos.render('(center {x} {y})'))
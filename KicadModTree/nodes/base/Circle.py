@@ -60,6 +60,7 @@ class Circle(Node, geometricCircle):
         """
 
         self.center_pos.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self._invalidateSpatialIndex()
         return self
 
     def translate(self, distance_vector):
@@ -71,6 +72,7 @@ class Circle(Node, geometricCircle):
         """
 
         self.center_pos += distance_vector
+        self._invalidateSpatialIndex()
         return self
 
     def cut(self, *other):
@@ -87,6 +89,10 @@ class Circle(Node, geometricCircle):
 
         return Node.calculateBoundingBox({'min': ParseXY(min_x, min_y), 'max': ParseXY(max_x, max_y)})
 
+    def calculateWorldBoundingBox(self):
+        center = self.getRealPosition(self.center_pos)
+        return (center.x - self.radius, center.y - self.radius, center.x + self.radius, center.y + self.radius)
+
     def _getRenderTreeText(self):
         render_strings = ['fp_circle']
         render_strings.append(self.center_pos.render('(center {x} {y})'))
@@ -16,6 +16,7 @@
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
 from KicadModTree.util.geometric_util import geometricLine, BaseNodeIntersection
+from KicadModTree.util.spatial_index import boundingBox
 
 
 class Line(Node, geometricLine):
@@ -67,6 +68,34 @@ class Line(Node, geometricLine):
             layer=self.layer, width=self.width
             )
 
+    def rotate(self, angle, origin=(0, 0), use_degrees=True):
+        r""" Rotate line around given origin
+
+        :params:
+            * *angle* (``float``)
+                rotation angle
+            * *origin* (``Vector2D``)
+                origin point for the rotation. default: (0, 0)
+            * *use_degrees* (``boolean``)
+                rotation angle is given in degrees. default:True
+        """
+
+        geometricLine.rotate(self, angle=angle, origin=origin, use_degrees=use_degrees)
+        self._invalidateSpatialIndex()
+        return self
+
+    def translate(self, distance_vector):
+        r""" Translate line
+
+        :params:
+            * *distance_vector* (``Vector2D``)
+                2D vector defining by how much and in what direction to translate.
+        """
+
+        geometricLine.translate(self, distance_vector)
+        self._invalidateSpatialIndex()
+        return self
+
     def cut(self, *other):
         r""" cut line with given other element
 
@@ -103,3 +132,8 @@ class Line(Node, geometricLine):
         max_y = max([render_start_pos.y, render_end_pos.y])
 
         return Node.calculateBoundingBox({'min': Vector2D(min_x, min_y), 'max': Vector2D(max_x, max_y)})
+
+    def calculateWorldBoundingBox(self):
+        start = self.getRealPosition(self.start_pos)
+        end = self.getRealPosition(self.end_pos)
+        return boundingBox([(start.x, start.y), (end.x, end.y)])
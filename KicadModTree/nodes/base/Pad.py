@@ -18,6 +18,7 @@ from KicadModTree.util.paramUtil import *
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
 from KicadModTree.util.kicad_util import lispString
+from KicadModTree.util.spatial_index import rotatedBoundingBox
 from KicadModTree.nodes.base.Arc import Arc
 from KicadModTree.nodes.base.Circle import Circle
 from KicadModTree.nodes.base.Line import Line
@@ -364,6 +365,7 @@ class Pad(Node):
 
         # subtraction because kicad text field rotation is the wrong way round
         self.rotation -= a
+        self._invalidateSpatialIndex()
         return self
 
     def translate(self, distance_vector):
@@ -375,12 +377,27 @@ class Pad(Node):
         """
 
         self.at += distance_vector
+        self._invalidateSpatialIndex()
         return self
 
     # calculate the outline of a pad
     def calculateBoundingBox(self):
         return Node.calculateBoundingBox(self)
 
+    def calculateWorldBoundingBox(self):
+        position, rotation = self.getRealPosition(self.at, self.rotation)
+        hw, hh = self.size.x / 2., self.size.y / 2.
+        points = [(-hw, -hh), (hw, -hh), (hw, hh), (-hw, hh)]
+
+        # the primitives of custom pads are given relative to the pad
+        if self.shape == Pad.SHAPE_CUSTOM:
+            for node in (node for p in self.primitives for node in p.iter_serialize()):
+                box = node.calculateWorldBoundingBox()
+                if box is not None:
+                    points += [(box[0], box[1]), (box[2], box[1]), (box[2], box[3]), (box[0], box[3])]
+
+        return rotatedBoundingBox(points, position.x, position.y, rotation)
+
     def _getRenderTreeText(self):
         render_strings = ['pad']
         render_strings.append(lispString(self.number))
@@ -402,6 +419,7 @@ class Pad(Node):
         :param p: the primitive to add
         """
         self.primitives.append(p)
+        self._invalidateSpatialIndex()
 
     def getRoundRadius(self):
         if self.shape == Pad.SHAPE_CUSTOM:
@@ -16,6 +16,7 @@
 from KicadModTree.PolygonPoints import *
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.spatial_index import boundingBox
 
 
 class Polygon(Node):
@@ -62,6 +63,7 @@ class Polygon(Node):
         """
 
         self.nodes.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self._invalidateSpatialIndex()
         return self
 
     def translate(self, distance_vector):
@@ -73,10 +75,15 @@ class Polygon(Node):
         """
 
         self.nodes.translate(distance_vector)
+        self._invalidateSpatialIndex()
         return self
 
     def calculateBoundingBox(self):
-        return nodes.calculateBoundingBox()
+        return self.nodes.calculateBoundingBox()
+
+    def calculateWorldBoundingBox(self):
+        points = self.nodes.getTransformedPoints(self.getTransformation())
+        return boundingBox(points) if points else None
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -98,11 +105,11 @@ class Polygon(Node):
 
         return render_text
 
-    def cut(self, other):
-        r""" Cut other polygon from this polygon
+    def cut(self, *other):
+        r""" Cut other polygons from this polygon
 
         More details see PolygonPoints.cut docstring.
 
-        :param other: the other polygon
+        :param other: the other polygons
         """
-        self.nodes.cut(other.nodes)
+        self.nodes.cut(*[o.nodes for o in other])
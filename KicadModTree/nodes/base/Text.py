@@ -15,6 +15,7 @@
 
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.spatial_index import rotatedBoundingBox
 
 
 class Text(Node):
@@ -93,6 +94,7 @@ class Text(Node):
 
         # subtraction because kicad text field rotation is the wrong way round
         self.rotation -= a
+        self._invalidateSpatialIndex()
         return self
 
     def translate(self, distance_vector):
@@ -104,6 +106,7 @@ class Text(Node):
         """
 
         self.at += distance_vector
+        self._invalidateSpatialIndex()
         return self
 
     def calculateBoundingBox(self):
@@ -117,6 +120,12 @@ class Text(Node):
 
         return Node.calculateBoundingBox({'min': Vector2D(min_x, min_y), 'max': Vector2D(max_x, max_y)})
 
+    def calculateWorldBoundingBox(self):
+        # the size of the text is estimated like in calculateBoundingBox
+        position, rotation = self.getRealPosition(self.at, self.rotation)
+        hw, hh = len(self.text) * self.size.x / 2., self.size.y / 2.
+        return rotatedBoundingBox([(-hw, -hh), (hw, -hh), (hw, hh), (-hw, hh)], position.x, position.y, rotation)
+
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
 
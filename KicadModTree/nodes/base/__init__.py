@@ -13,16 +13,15 @@
 #
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-from .Arc import Arc
+from KicadModTree.util.lazy_import import lazyImport
 
-from .Circle import Circle
-
-from .Line import Line
-
-from .Model import Model
-
-from .Pad import Pad
-
-from .Polygon import Polygon
-
-from .Text import Text
+# the node classes are imported on first access
+__all__, __getattr__, __dir__ = lazyImport(__name__, {
+    'Arc': ('.Arc', 'Arc'),
+    'Circle': ('.Circle', 'Circle'),
+    'Line': ('.Line', 'Line'),
+    'Model': ('.Model', 'Model'),
+    'Pad': ('.Pad', 'Pad'),
+    'Polygon': ('.Polygon', 'Polygon'),
+    'Text': ('.Text', 'Text'),
+})
@@ -372,9 +372,10 @@ class ChamferedPad(Node):
         self.chamfer_size = Vector2D([x if x > 0 else 0 for x in self.chamfer_size])
 
         self.pad = self._generatePad()
+        self._invalidateVirtualChilds()
         return self.chamfer_size
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return [self.pad]
 
     def getRoundRadius(self):
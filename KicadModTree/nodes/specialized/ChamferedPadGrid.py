@@ -291,6 +291,7 @@ class ChamferedPadGrid(Node):
         )
         self.chamfer_size = temp_pad.chamferAvoidCircle(
             center=relative_center, diameter=diameter, clearance=clearance)
+        self._invalidateVirtualChilds()
         return self.chamfer_size
 
     def __padCornerSelection(self, idx_x, idx_y):
@@ -351,10 +352,11 @@ class ChamferedPadGrid(Node):
                     ))
         return pads
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return self._generatePads()
 
     def __copy__(self):
         newone = type(self)()
         newone.__dict__.update(self.__dict__)
+        newone._invalidateVirtualChilds()
         return newone
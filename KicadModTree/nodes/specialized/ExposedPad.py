@@ -26,7 +26,6 @@ from KicadModTree.nodes.specialized.PadArray import *
 from KicadModTree.nodes.Node import Node
 from math import sqrt, floor
 from copy import copy
-import traceback
 
 
 class ExposedPad(Node):
@@ -152,6 +151,9 @@ class ExposedPad(Node):
         self._initThermalVias(**kwargs)
         self._initPaste(**kwargs)
 
+        if self.has_vias:
+            self.round_radius_handler.limitMaxRadius(self.via_size/2)
+
     def _initNumber(self, **kwargs):
         if not kwargs.get('number'):
             raise KeyError('pad number for exposed pad not declared (like "number=9")')
@@ -172,6 +174,7 @@ class ExposedPad(Node):
         self.via_layout = toIntArray(layout, min_value=0)
         if self.via_layout[0] == 0 or self.via_layout[1] == 0:
             self.has_vias = False
+        self._invalidateVirtualChilds()
         return self.has_vias
 
     def __initViaGrid(self, **kwargs):
@@ -551,11 +554,7 @@ class ExposedPad(Node):
 
         return pads
 
-    def getVirtualChilds(self):
-        # traceback.print_stack()
-        if self.has_vias:
-            self.round_radius_handler.limitMaxRadius(self.via_size/2)
-
+    def _createVirtualChilds(self):
         pads = []
         pads += self.__createMainPad()
         if self.has_vias:
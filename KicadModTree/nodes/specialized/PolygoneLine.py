@@ -47,7 +47,8 @@ class PolygoneLine(Node):
 
         self._initPolyPoint(**kwargs)
 
-        self.virtual_childs = self._createChildNodes(self.nodes)
+        # the points are taken as (x, y) tuples, which keeps the array of array backed points
+        self.virtual_childs = self._createChildNodes(self.nodes.getTransformedPoints())
 
     def _initPolyPoint(self, **kwargs):
         self.nodes = PolygonPoints(**kwargs)
@@ -70,10 +71,8 @@ class PolygoneLine(Node):
         render_text += " ["
 
         node_strings = []
-        for node in self.nodes:
-            node_position = Vector2D(node)
-            node_strings.append("[x: {x}, y: {y}]".format(x=node_position.x,
-                                                          y=node_position.y))
+        for x, y in self.nodes.getTransformedPoints():
+            node_strings.append("[x: {x}, y: {y}]".format(x=x, y=y))
 
         if len(node_strings) <= 6:
             render_text += " ,".join(node_strings)
@@ -61,7 +61,7 @@ class RingPadPrimitive(Node):
                     number=self.number
                     )
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return [Pad(number=self.number,
                     type=Pad.TYPE_SMT, shape=Pad.SHAPE_CUSTOM,
                     at=(self.at+Vector2D(self.radius, 0)),
@@ -116,6 +116,7 @@ class ArcPadPrimitive(Node):
         self.setLimitingLines(**kwargs)
 
     def setRoundRadius(self, **kwargs):
+        self._invalidateVirtualChilds()
         if 'round_radius' in kwargs:
             self.round_radius = kwargs['round_radius']
             return
@@ -135,6 +136,7 @@ class ArcPadPrimitive(Node):
             self.end_line = geometricLine(geometry=kwargs.get('end_line'))
         else:
             self.end_line = None
+        self._invalidateVirtualChilds()
 
     def copy(self):
         return ArcPadPrimitive(
@@ -165,6 +167,7 @@ class ArcPadPrimitive(Node):
             self.start_line.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
         if self.end_line is not None:
             self.end_line.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self._invalidateVirtualChilds()
         return self
 
     def translate(self, distance_vector):
@@ -180,6 +183,7 @@ class ArcPadPrimitive(Node):
             self.start_line.translate(distance_vector)
         if self.end_line is not None:
             self.end_line.translate(distance_vector)
+        self._invalidateVirtualChilds()
         return self
 
     def _getStep(self):
@@ -227,7 +231,7 @@ class ArcPadPrimitive(Node):
                                  "did not result in the expected number of arcs.")
         return result
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         at = self.reference_arc.getMidPoint()
         primitives = self._getArcPrimitives()
         for p in primitives:
@@ -15,7 +15,6 @@
 
 import math
 
-from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
 
 
@@ -35,25 +34,21 @@ class Rotation(Node):
         Node.__init__(self)
         self.rotation = r  # in degree
 
-    def getRealPosition(self, coordinate, rotation=None):
-        if rotation is None:
-            rotation = 0
+    @property
+    def rotation(self):
+        return self._rotation
 
-        parsed_coordinate = Vector2D(coordinate)
+    @rotation.setter
+    def rotation(self, r):
+        self._rotation = r
+        self._invalidateTransformation()
 
+    def _getLocalTransformation(self):
         phi = self.rotation*math.pi/180
-        rotation_coordinate = {'x': parsed_coordinate.x*math.cos(phi) + parsed_coordinate.y*math.sin(phi),
-                               'y': -parsed_coordinate.x*math.sin(phi) + parsed_coordinate.y*math.cos(phi)}
-
-        if not self._parent:
-            if rotation is None:
-                return rotation_coordinate
-            else:
-                return rotation_coordinate, rotation + self.rotation
-        else:
-            if rotation is None:
-                rotation = 0
-            return self._parent.getRealPosition(rotation_coordinate, rotation + self.rotation)
+        cos_phi = math.cos(phi)
+        sin_phi = math.sin(phi)
+
+        return (cos_phi, sin_phi, -sin_phi, cos_phi, 0., 0., self.rotation)
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -13,16 +13,34 @@
 #
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-from .Translation import Translation
-from .Rotation import Rotation
+from KicadModTree.util.lazy_import import lazyImport
 
-from .PolygoneLine import PolygoneLine
-from .RectLine import RectLine
-from .RectFill import RectFill
-from .FilledRect import FilledRect
+_attributes = {
+    'Translation': ('.Translation', 'Translation'),
+    'Rotation': ('.Rotation', 'Rotation'),
 
-from .PadArray import PadArray
-from .ExposedPad import ExposedPad
-from .ChamferedPad import ChamferedPad, CornerSelection
-from .ChamferedPadGrid import *
-from .RingPad import RingPad
+    'PolygoneLine': ('.PolygoneLine', 'PolygoneLine'),
+    'RectLine': ('.RectLine', 'RectLine'),
+    'RectFill': ('.RectFill', 'RectFill'),
+    'FilledRect': ('.FilledRect', 'FilledRect'),
+
+    'PadArray': ('.PadArray', 'PadArray'),
+    'ExposedPad': ('.ExposedPad', 'ExposedPad'),
+    'ChamferedPad': ('.ChamferedPad', 'ChamferedPad'),
+    'CornerSelection': ('.ChamferedPad', 'CornerSelection'),
+    'ChamferedPadGrid': ('.ChamferedPadGrid', 'ChamferedPadGrid'),
+    'ChamferSelPadGrid': ('.ChamferedPadGrid', 'ChamferSelPadGrid'),
+    'RingPad': ('.RingPad', 'RingPad'),
+}
+
+# names which used to be exported by "from .ChamferedPadGrid import *", kept for backwards compatibility
+for _name in """
+    Node Pad Polygon PolygonPoints RoundRadiusHandler Vector2D Vector3D
+    atan2 copy cos degrees division formatFloat getOptionalNumberTypeParam
+    hypot isAnyLarger radians round sin sqrt toFloatArray toIntArray
+    toNumberArray toVectorUseCopyIfNumber warnings
+""".split():
+    _attributes[_name] = ('.ChamferedPadGrid', _name)
+
+# the node classes are imported on first access
+__all__, __getattr__, __dir__ = lazyImport(__name__, _attributes)
@@ -15,3 +15,4 @@
 
 from .test_Vector2D import Vector2DTests
 from .test_Vector3D import Vector3DTests
+from .test_PolygonPoints import PolygonPointsTests
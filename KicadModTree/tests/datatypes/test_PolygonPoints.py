@@ -0,0 +1,140 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+from KicadModTree.PolygonPoints import *
+from KicadModTree.nodes.Node import composeTransformations
+from KicadModTree.nodes.specialized.Translation import Translation
+from KicadModTree.nodes.specialized.Rotation import Rotation
+from KicadModTree.nodes.specialized.PolygoneLine import PolygoneLine
+from KicadModTree.nodes.specialized.RectLine import RectLine
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+POINTS = [(0, 0), (1.27, 0), (1.27, 2.54), (0.3, 1.7), (-0.635, 2.1)]
+
+
+class PolygonPointsTests(unittest.TestCase):
+
+    def tearDown(self):
+        if numpy is not None:
+            usePointArrays(False)
+
+    def assertPointsAlmostEqual(self, points, expected):
+        self.assertEqual(len(points), len(expected))
+        for point, (x, y) in zip(points, expected):
+            self.assertAlmostEqual(point[0], x)
+            self.assertAlmostEqual(point[1], y)
+
+    def test_init(self):
+        points = PolygonPoints(nodes=POINTS)
+        self.assertEqual(len(points), 5)
+        self.assertEqual(points[1], Vector2D(1.27, 0))
+
+        mirrored = PolygonPoints(nodes=POINTS, x_mirror=1, y_mirror=0)
+        self.assertPointsAlmostEqual(list(mirrored), [(2 - x, -y) for x, y in POINTS])
+
+    def test_bounding_box(self):
+        bbox = PolygonPoints(nodes=POINTS).calculateBoundingBox()
+        self.assertEqual(bbox['min'], Vector2D(-0.635, 0))
+        self.assertEqual(bbox['max'], Vector2D(1.27, 2.54))
+
+    def test_transformed_points(self):
+        transformation = composeTransformations(Translation(1, 2).getTransformation(),
+                                                Rotation(90).getTransformation())
+        points = PolygonPoints(nodes=POINTS).getTransformedPoints(transformation)
+        self.assertPointsAlmostEqual(points, [(1 + y, 2 - x) for x, y in POINTS])
+
+    def test_round_to(self):
+        points = PolygonPoints(nodes=POINTS).round_to(0.5)
+        self.assertPointsAlmostEqual(list(points), [(0, 0), (1.5, 0), (1.5, 2.5), (0.5, 1.5), (-0.5, 2)])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_point_arrays(self):
+        reference = PolygonPoints(nodes=POINTS, y_mirror=0.5)
+        reference.rotate(33, origin=(1, -1)).translate([0.1, -2])
+
+        usePointArrays()
+        points = PolygonPoints(nodes=POINTS, y_mirror=0.5)
+        points.rotate(33, origin=(1, -1)).translate([0.1, -2])
+
+        self.assertEqual(points.getTransformedPoints(), reference.getTransformedPoints())
+        self.assertEqual(points.calculateBoundingBox(), reference.calculateBoundingBox())
+        self.assertEqual(list(points.round_to(0.01)), list(reference.round_to(0.01)))
+
+        # accessing the vectors converts the storage back to a list
+        self.assertEqual(points.nodes, reference.nodes)
+        self.assertEqual(points.rotate(10).nodes, reference.rotate(10).nodes)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_polygone_line_point_arrays(self):
+        reference = PolygoneLine(nodes=POINTS)
+
+        usePointArrays()
+        polygone_line = PolygoneLine(nodes=POINTS)
+        rect_line = RectLine(start=[-1, -2], end=[1, 2], layer='F.SilkS')
+
+        # creating the lines and the render tree does not convert the array back into vectors
+        self.assertEqual([(line.start_pos, line.end_pos) for line in polygone_line.getVirtualChilds()],
+                         [(line.start_pos, line.end_pos) for line in reference.getVirtualChilds()])
+        self.assertEqual(polygone_line.getRenderTree(), reference.getRenderTree())
+        self.assertIsNotNone(polygone_line.nodes._array)
+        self.assertIsNotNone(rect_line.nodes._array)
+        self.assertEqual(len(rect_line.getVirtualChilds()), 4)
+
+    def test_find_nearest_points(self):
+        outer = PolygonPoints(nodes=[(-5, -5), (5, -5), (5, 5), (-5, 5)])
+        inner = PolygonPoints(nodes=[(-1, -1), (1, -1), (3, 3), (-1, 1)])
+        self.assertEqual(outer.findNearestPoints(inner), (2, 2))
+
+        # on equal distance the pair with the lowest indexes wins
+        inner = PolygonPoints(nodes=[(1, 1), (-1, 1), (-1, -1), (1, -1)])
+        self.assertEqual(outer.findNearestPoints(inner), (0, 2))
+
+    def test_cut(self):
+        outer = PolygonPoints(nodes=[(-5, -5), (5, -5), (5, 5), (-5, 5)])
+        outer.cut(PolygonPoints(nodes=[(-1, -1), (1, -1), (3, 3), (-1, 1)]))
+        self.assertEqual([tuple(n) for n in outer],
+                         [(-5, -5), (5, -5), (5, 5),
+                          (3, 3), (1, -1), (-1, -1), (-1, 1), (3, 3),
+                          (5, 5), (-5, 5)])
+
+    def test_cut_multiple(self):
+        outer = PolygonPoints(nodes=[(-5, -5), (5, -5), (5, 5), (-5, 5)])
+        outer.cut(PolygonPoints(nodes=[(2, 2), (3, 2), (3, 3)]),
+                  PolygonPoints(nodes=[(-3, -3), (-2, -3), (-2, -2)]))
+        self.assertEqual([tuple(n) for n in outer],
+                         [(-5, -5),
+                          (-3, -3), (-2, -2), (-2, -3), (-3, -3), (-5, -5),
+                          (5, -5), (5, 5),
+                          (3, 3), (3, 2), (2, 2), (3, 3), (5, 5),
+                          (-5, 5)])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_cut_point_arrays(self):
+        reference = PolygonPoints(nodes=[(-5, -5), (5, -5), (5, 5), (-5, 5)])
+        reference.cut(PolygonPoints(nodes=[(2, 2), (3, 2), (3, 3)]),
+                      PolygonPoints(nodes=[(-3, -3), (-2, -3), (-2, -2)]))
+
+        usePointArrays()
+        points = PolygonPoints(nodes=[(-5, -5), (5, -5), (5, 5), (-5, 5)])
+        points.cut(PolygonPoints(nodes=[(2, 2), (3, 2), (3, 3)]),
+                   PolygonPoints(nodes=[(-3, -3), (-2, -3), (-2, -2)]))
+
+        self.assertEqual(points.getTransformedPoints(), reference.getTransformedPoints())
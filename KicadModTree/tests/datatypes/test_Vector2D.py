@@ -15,6 +15,8 @@
 
 import unittest
 import math
+import copy
+import pickle
 from KicadModTree.Vector import *
 
 
@@ -191,3 +193,22 @@ class Vector2DTests(unittest.TestCase):
         r, a = p1.to_polar(use_degrees=True)
         self.assertAlmostEqual(r, math.sqrt(2))
         self.assertAlmostEqual(a, -135)
+
+    def test_slots(self):
+        # the coordinates are stored in slots, instances have no attribute dict (__dict__ is a method of the class)
+        self.assertEqual(Vector2D.__slots__, ('x', 'y'))
+        self.assertEqual(Vector2D.__dictoffset__, 0)
+
+        p1 = Vector2D(1, 2)
+        self.assertFalse(hasattr(p1, '__weakref__'))
+        with self.assertRaises(AttributeError):
+            p1.z = 3
+
+        self.assertEqual(p1.__dict__(), {'x': 1, 'y': 2})
+
+        p2 = copy.deepcopy(p1)
+        self.assertEqual(p1, p2)
+        self.assertIsNot(p1, p2)
+
+        p3 = pickle.loads(pickle.dumps(p1))
+        self.assertEqual(p1, p3)
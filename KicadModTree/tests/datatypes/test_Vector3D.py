@@ -14,6 +14,8 @@
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 import unittest
+import copy
+import pickle
 
 from KicadModTree.Vector import *
 
@@ -208,3 +210,30 @@ class Vector3DTests(unittest.TestCase):
 
         # TODO: division by zero tests
         # TODO: invalid type tests
+
+    def test_inplace(self):
+        p1 = Vector3D(1, 2, 3)
+        p1 += 2
+        self.assertEqual(p1, Vector3D(3, 4, 5))
+
+        p1 -= Vector2D(1, 1)
+        self.assertEqual(p1, Vector3D(2, 3, 5))
+
+    def test_slots(self):
+        # z is added to the slots of Vector2D, instances have no attribute dict
+        self.assertEqual(Vector3D.__slots__, ('z',))
+        self.assertEqual(Vector3D.__dictoffset__, 0)
+
+        p1 = Vector3D(1, 2, 3)
+        self.assertFalse(hasattr(p1, '__weakref__'))
+        with self.assertRaises(AttributeError):
+            p1.w = 4
+
+        self.assertEqual(p1.__dict__(), {'x': 1, 'y': 2, 'z': 3})
+
+        p2 = copy.deepcopy(p1)
+        self.assertEqual(p1, p2)
+        self.assertIsNot(p1, p2)
+
+        p3 = pickle.loads(pickle.dumps(p1))
+        self.assertEqual(p1, p3)
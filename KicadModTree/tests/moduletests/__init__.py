@@ -18,3 +18,11 @@ from .test_kicad5_padshapes import Kicad5PadsTests
 from .test_exposed_pad import ExposedPadTests
 from .test_arc import ArcTests
 from .test_rotation import RotationTests
+from .test_read_footprint import ReadFootprintTests
+from .test_modargparser import ModArgparserTests
+from .test_yaml_util import YamlUtilTests
+from .test_profiler import ProfilerTests
+from .test_build_cache import BuildCacheTests
+from .test_import_time import ImportTimeTests
+from .test_silkscreen_clearance import SilkscreenClearanceTests
+from .test_clip_util import ClipUtilTests
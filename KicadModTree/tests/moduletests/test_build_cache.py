@@ -0,0 +1,106 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import importlib
+
+from KicadModTree import *
+
+# the package exports the class with the same name as its module
+build_cache_module = importlib.import_module('KicadModTree.BuildCache')
+
+
+class BuildCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_filename = os.path.join(self.directory, 'cache.json')
+        self.calls = []
+
+        # modules inside of the temporary directory are treated like the sources of the repository
+        self.repository_root = build_cache_module._REPOSITORY_ROOT
+        build_cache_module._REPOSITORY_ROOT = os.path.realpath(self.directory)
+        sys.path.insert(0, self.directory)
+        self.writeModule('0.5')
+
+    def tearDown(self):
+        build_cache_module._REPOSITORY_ROOT = self.repository_root
+        sys.path.remove(self.directory)
+        sys.modules.pop('build_cache_helper', None)
+        shutil.rmtree(self.directory)
+
+    def writeModule(self, width):
+        with open(os.path.join(self.directory, 'build_cache_helper.py'), 'w') as f:
+            f.write("WIDTH = {}\n".format(width))
+
+    def generate(self, name, size):
+        # the helper module is only imported while generating, after the cache key was calculated
+        import build_cache_helper
+
+        self.calls.append(name)
+        kicad_mod = Footprint(name)
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[0, 0],
+                             size=[size, build_cache_helper.WIDTH], layers=Pad.LAYERS_SMT))
+        KicadFileHandler(kicad_mod).writeFile(os.path.join(self.directory, name + '.kicad_mod'))
+
+    def execute(self, cache, name, size):
+        return cache.execute(name, [size], self.generate, name, size)
+
+    def testHit(self):
+        cache = BuildCache(self.cache_filename)
+        self.assertTrue(self.execute(cache, 'A', 1))
+        self.assertFalse(self.execute(cache, 'A', 1))
+
+        # a new process only sees the saved entries
+        cache.save()
+        cache = BuildCache(self.cache_filename)
+        self.assertFalse(self.execute(cache, 'A', 1))
+        self.assertEqual(self.calls, ['A'])
+
+    def testMiss(self):
+        cache = BuildCache(self.cache_filename)
+        self.assertTrue(self.execute(cache, 'A', 1))
+        self.assertTrue(self.execute(cache, 'B', 1))
+        self.assertTrue(self.execute(cache, 'A', 2))
+        self.assertEqual(self.calls, ['A', 'B', 'A'])
+
+        # unsaved entries are lost
+        cache = BuildCache(self.cache_filename)
+        self.assertTrue(self.execute(cache, 'A', 2))
+
+    def testInvalidation(self):
+        cache = BuildCache(self.cache_filename)
+        self.assertTrue(self.execute(cache, 'A', 1))
+        cache.save()
+
+        # a changed module, which was imported while generating the footprint
+        self.writeModule('0.75')
+        cache = BuildCache(self.cache_filename)
+        self.assertTrue(self.execute(cache, 'A', 1))
+        self.assertFalse(self.execute(cache, 'A', 1))
+
+        # a removed output file
+        os.remove(os.path.join(self.directory, 'A.kicad_mod'))
+        self.assertTrue(self.execute(cache, 'A', 1))
+        self.assertEqual(self.calls, ['A', 'A', 'A'])
+
+        # an outdated cache file is ignored
+        with open(self.cache_filename, 'w') as f:
+            f.write('{"version": 0, "entries": {}}')
+        self.assertTrue(self.execute(BuildCache(self.cache_filename), 'A', 1))
@@ -0,0 +1,29 @@
+import unittest
+import math
+from KicadModTree.util.clip_util import freeIntervals, joinCircleIntervals
+
+
+class ClipUtilTests(unittest.TestCase):
+
+    def testFreeIntervals(self):
+        self.assertEqual(freeIntervals(0, 10, [2, 4, 12], lambda t: 2 < t < 4), [(0, 2), (4, 10)])
+        self.assertEqual(freeIntervals(0, 10, [-1, 12], lambda t: False), None)
+        self.assertEqual(freeIntervals(0, 10, [0, 10], lambda t: True), [])
+
+    def testFreeIntervalsTolerance(self):
+        # the same crossing from two keepouts, one rounding error apart
+        crossings = [2, 4, 0.6872593749999999, 0.687259375]
+        self.assertEqual(freeIntervals(0, 10, crossings, lambda t: 2 < t < 4), [(0, 2), (4, 10)])
+
+        # a keepout touching the curve in a single point does not split it
+        self.assertEqual(freeIntervals(0, 10, [5 - 1e-10, 5 + 1e-10, 8, 9], lambda t: 8 < t < 9),
+                         [(0, 8), (9, 10)])
+
+    def testJoinCircleIntervals(self):
+        intervals = [(-math.pi, -1), (1, 2), (3, math.pi)]
+        self.assertEqual(joinCircleIntervals(intervals, -math.pi, math.pi), [(3, 2 * math.pi - 1), (1, 2)])
+
+        # the first interval does not start at the start angle
+        intervals = [(-math.pi + 0.1, -1), (3, math.pi)]
+        self.assertEqual(joinCircleIntervals(intervals, -math.pi, math.pi), intervals)
+        self.assertEqual(joinCircleIntervals([(0, 1)], 0, 2 * math.pi), [(0, 1)])
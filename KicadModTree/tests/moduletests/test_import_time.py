@@ -0,0 +1,86 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+import KicadModTree
+
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(KicadModTree.__file__)))
+
+# start-up budget of "from KicadModTree import *", generous enough for slow machines
+IMPORT_TIME_BUDGET = 1.0
+
+
+def runImport(statement):
+    r"""Execute an import in a new interpreter, and get its duration and the loaded modules"""
+    code = "\n".join([
+        "import sys, time, json",
+        "start = time.time()",
+        statement,
+        "duration = time.time() - start",
+        "print(json.dumps({'duration': duration, 'modules': sorted(sys.modules)}))"])
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPOSITORY_ROOT, env.get('PYTHONPATH')]))
+    output = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', code], env=env)
+    return json.loads(output.decode('utf-8').splitlines()[-1])
+
+
+class ImportTimeTests(unittest.TestCase):
+
+    @unittest.skipUnless(sys.version_info >= (3, 7), "modules are only imported lazily since python 3.7 (PEP 562)")
+    def testLazyImport(self):
+        result = runImport("import KicadModTree")
+        self.assertNotIn('KicadModTree.nodes.base.Pad', result['modules'])
+        self.assertNotIn('KicadModTree.ModArgparser', result['modules'])
+        self.assertNotIn('numpy', result['modules'])
+        self.assertNotIn('yaml', result['modules'])
+
+        result = runImport("from KicadModTree import Footprint, Line, KicadFileHandler")
+        self.assertIn('KicadModTree.nodes.base.Line', result['modules'])
+        self.assertNotIn('KicadModTree.nodes.specialized.ExposedPad', result['modules'])
+        self.assertNotIn('KicadModTree.ModArgparser', result['modules'])
+
+    def testStarImport(self):
+        result = runImport("from KicadModTree import *")
+        self.assertIn('KicadModTree.ModArgparser', result['modules'])
+        self.assertNotIn('numpy', result['modules'])
+
+        # the fastest of multiple runs, to be independent of other load on the machine
+        duration = min(runImport("from KicadModTree import *")['duration'] for _ in range(3))
+        self.assertLess(duration, IMPORT_TIME_BUDGET)
+
+    def testAttributes(self):
+        from KicadModTree.nodes.base.Pad import Pad
+        from KicadModTree.nodes.specialized.RectLine import RectLine
+
+        # the classes are not replaced by their submodules of the same name
+        self.assertIs(KicadModTree.Pad, Pad)
+        self.assertIs(KicadModTree.nodes.base.Pad, Pad)
+        self.assertIs(KicadModTree.nodes.specialized.RectLine, RectLine)
+        self.assertIn('Footprint', dir(KicadModTree))
+
+        namespace = {}
+        exec("from KicadModTree import *", namespace)
+        for name in ['Footprint', 'Pad', 'PadArray', 'KicadFileHandler', 'ModArgparser', 'Vector2D', 'Point']:
+            self.assertIs(namespace[name], getattr(KicadModTree, name))
+
+        with self.assertRaises(AttributeError):
+            KicadModTree.DoesNotExist
@@ -0,0 +1,102 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree import ModArgparser
+
+try:
+    from StringIO import StringIO  # python 2
+except ImportError:
+    from io import StringIO  # python 3
+
+
+def footprint_gen(args):
+    if args['pincount'] < 0:
+        raise ValueError("invalid pincount")
+    print("create footprint: {name} {pincount}".format(**args))
+
+
+class ModArgparserTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'footprints.csv')
+        with open(self.filename, 'w') as f:
+            f.write("name,pincount\n")
+            for i in range(20):
+                f.write("fp_{0},{1}\n".format(i, -1 if i == 7 else i))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def runParser(self, *args):
+        parser = ModArgparser(footprint_gen)
+        parser.add_parameter("name", type=str, required=True)
+        parser.add_parameter("pincount", type=int, required=True)
+
+        argv, stdout = sys.argv, sys.stdout
+        sys.argv = ['test'] + list(args) + [self.filename]
+        sys.stdout = output = StringIO()
+        exit_code = 0
+        try:
+            parser.run()
+        except SystemExit as e:
+            exit_code = e.code
+        finally:
+            sys.argv, sys.stdout = argv, stdout
+        return output.getvalue(), exit_code
+
+    def testSerial(self):
+        self.assertRaises(ValueError, self.runParser)
+
+    def testParallel(self):
+        output, exit_code = self.runParser('-j', '3')
+        self.assertEqual(exit_code, 1)
+
+        lines = output.splitlines()
+        self.assertEqual(lines[0], "use file: {0}".format(self.filename))
+        created = [line for line in lines if line.startswith("create footprint")]
+        self.assertEqual(created, ["create footprint: fp_{0} {0}".format(i) for i in range(20) if i != 7])
+        self.assertIn("ERROR: fp_7 failed:", output)
+        self.assertIn("ValueError: invalid pincount", output)
+        self.assertEqual(lines[-2:], ["1 footprint(s) failed:", "  - fp_7"])
+
+    def testParallelDeterministic(self):
+        output, _ = self.runParser('-j', '2')
+        for jobs in ['3', '4']:
+            self.assertEqual(self.runParser('-j', jobs)[0], output)
+
+    def testCache(self):
+        cache = os.path.join(self.directory, 'cache.json')
+
+        output, _ = self.runParser('-j', '2', '--cache', cache)
+        self.assertIn("create footprint: fp_3 3", output)
+        self.assertNotIn("up to date", output)
+
+        output, _ = self.runParser('-j', '2', '--cache', cache)
+        self.assertNotIn("create footprint: fp_3 3", output)
+        self.assertEqual(output.count("up to date"), 19)
+        self.assertIn("ERROR: fp_7 failed:", output)  # failed footprints are not cached
+
+        with open(self.filename, 'a') as f:
+            f.write("fp_20,20\n")
+        output, _ = self.runParser('-j', '2', '--cache', cache)
+        self.assertEqual(output.count("up to date"), 19)
+        self.assertIn("create footprint: fp_20 20", output)
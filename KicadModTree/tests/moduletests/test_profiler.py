@@ -0,0 +1,98 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import json
+import shutil
+import pstats
+import tempfile
+import unittest
+
+from KicadModTree import *
+from KicadModTree.Profiler import PHASES, isProfiling
+
+
+def create_footprint(name, filename):
+    kicad_mod = Footprint(name)
+    kicad_mod.append(RectLine(start=[-2, -2], end=[5, 2], layer='F.SilkS'))
+    kicad_mod.append(PadArray(pincount=20, spacing=[1, 0], type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                              size=[0.5, 1.5], layers=Pad.LAYERS_SMT))
+
+    file_handler = KicadFileHandler(kicad_mod)
+    file_handler.writeFile(filename, timestamp=0)
+    return file_handler.serialize(timestamp=0)
+
+
+class ProfilerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testProfile(self):
+        profiler = Profiler()
+        for i in range(3):
+            filename = os.path.join(self.directory, 'fp_{}.kicad_mod'.format(i))
+            expected = profiler.profile('fp_{}'.format(i), create_footprint, 'fp_{}'.format(i), filename)
+            with io.open(filename, 'r') as f:
+                self.assertEqual(f.read(), expected)
+        self.assertFalse(isProfiling())
+
+        records = profiler.getRecords()
+        self.assertEqual([r['name'] for r in records], ['fp_0', 'fp_1', 'fp_2'])
+        for record in records:
+            self.assertEqual(sorted(record['phases']), sorted(PHASES))
+            for timing in record['phases'].values():
+                self.assertGreater(timing['wall'], 0)
+            self.assertAlmostEqual(sum(t['wall'] for t in record['phases'].values()), record['wall'])
+            self.assertAlmostEqual(sum(t['cpu'] for t in record['phases'].values()), record['cpu'])
+
+        summary = profiler.getSummary()
+        self.assertEqual(summary['footprints'], 3)
+        self.assertAlmostEqual(summary['wall'], sum(r['wall'] for r in records))
+        self.assertIsNone(profiler.getStats())
+
+        report_file = os.path.join(self.directory, 'profile.json')
+        profiler.writeReport(report_file)
+        with io.open(report_file, 'r') as f:
+            report = json.load(f)
+        self.assertEqual(report['summary']['footprints'], 3)
+        self.assertEqual(len(report['footprints']), 3)
+
+    def testCProfile(self):
+        profiler = Profiler(use_cprofile=True)
+        profiler.profile('fp', create_footprint, 'fp', os.path.join(self.directory, 'fp.kicad_mod'))
+
+        # results of other profilers (like worker processes) are merged
+        other = Profiler(use_cprofile=True)
+        other.profile('fp_other', create_footprint, 'fp_other', os.path.join(self.directory, 'fp_other.kicad_mod'))
+        profiler.addResults(*other.popResults())
+        self.assertEqual(other.getRecords(), [])
+
+        self.assertEqual([r['name'] for r in profiler.getRecords()], ['fp', 'fp_other'])
+
+        stats_file = os.path.join(self.directory, 'profile.pstats')
+        profiler.writeStats(stats_file)
+        stats = pstats.Stats(stats_file)
+        calls = [v[1] for k, v in stats.stats.items() if k[2] == 'create_footprint']
+        self.assertEqual(calls, [2])
+
+    def testNestedProfile(self):
+        profiler = Profiler()
+        self.assertRaises(RuntimeError, profiler.profile, 'outer', profiler.profile, 'inner', lambda: None)
+        self.assertFalse(isProfiling())
@@ -0,0 +1,73 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util.kicad_util import lispTokenizer, parseLispString
+from . import test_arc, test_exposed_pad, test_kicad5_padshapes, test_rotation, test_simple_footprints
+
+
+def allResults():
+    for module in (test_arc, test_exposed_pad, test_kicad5_padshapes, test_rotation, test_simple_footprints):
+        for name in sorted(dir(module)):
+            if name.startswith('RESULT_'):
+                yield name, getattr(module, name)
+
+
+class ReadFootprintTests(unittest.TestCase):
+
+    def testParseLispString(self):
+        self.assertEqual(parseLispString('(module "a b" (layer F.Cu) (descr "x \\"q\\" (y)") (tags ""))'),
+                         ['module', 'a b', ['layer', 'F.Cu'], ['descr', 'x "q" (y)'], ['tags', '']])
+        self.assertEqual(parseLispString(b'(a (b 1.5))'), ['a', ['b', '1.5']])
+        self.assertEqual(lispTokenizer('(a "b c")'), ['(', 'a', 'b c', ')'])
+
+        for invalid in ['(a "b)', '(a (b)', '(a))', '(a "b\\" c)']:
+            self.assertRaises(RuntimeError, parseLispString, invalid)
+
+    def testRoundTrip(self):
+        for name, result in allResults():
+            kicad_mod = KicadFileHandler.parse(result)
+            self.assertEqual(KicadFileHandler(kicad_mod).serialize(timestamp=0), result, name)
+
+    def testReadFile(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmp_dir, 'test.kicad_mod')
+            KicadFileHandler(test_simple_footprints.createSampleFootprint()).writeFile(filename, timestamp=0)
+
+            kicad_mod = KicadFileHandler.readFile(filename)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        self.assertEqual(kicad_mod.name, 'test')
+        self.assertEqual(kicad_mod.description, 'A example footprint')
+        self.assertEqual(kicad_mod.tags, 'example')
+
+        nodes = kicad_mod.getNormalChilds()
+        self.assertEqual([type(n).__name__ for n in nodes], ['Text', 'Text'] + ['Line'] * 8 + ['Pad', 'Pad', 'Model'])
+        self.assertEqual(nodes[1].text, 'test')
+        self.assertEqual(nodes[1].at, Vector2D(1.5, 3))
+        self.assertEqual(nodes[-2].shape, Pad.SHAPE_CIRCLE)
+        self.assertEqual(nodes[-2].drill, Vector2D(1.2, 1.2))
+        self.assertEqual(nodes[-1].filename, 'example.3dshapes/example_footprint.wrl')
+
+    def testInvalidFootprint(self):
+        self.assertRaises(ValueError, KicadFileHandler.parse, '')
+        self.assertRaises(ValueError, KicadFileHandler.parse, '(kicad_pcb (version 4))')
@@ -152,6 +152,11 @@ RESULT_rotPad = """(module test_rotate (layer F.Cu) (tedit 0)
     ))
 )"""
 
+RESULT_rotNode = """(module test_rotate (layer F.Cu) (tedit 0)
+  (fp_line (start 1 1) (end 1 0) (layer F.SilkS) (width 0.12))
+  (pad 1 smd rect (at 1 1 90) (size 1 2) (layers F.Cu F.Mask F.Paste))
+)"""
+
 
 class RotationTests(unittest.TestCase):
 
@@ -251,3 +256,18 @@ class RotationTests(unittest.TestCase):
         file_handler = KicadFileHandler(kicad_mod)
         file_handler.writeFile('test.kicad_mod')
         self.assertEqual(file_handler.serialize(timestamp=0), RESULT_rotPad)
+
+    def testRotationNode(self):
+        kicad_mod = Footprint("test_rotate")
+
+        translation = Translation(1, 2)
+        kicad_mod.append(translation)
+        rotation = Rotation(90)
+        translation.append(rotation)
+
+        rotation.append(Line(start=[1, 0], end=[2, 0]))
+        rotation.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                            at=[1, 0], size=[1, 2], layers=Pad.LAYERS_SMT))
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_rotNode)
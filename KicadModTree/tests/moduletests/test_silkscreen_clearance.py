@@ -0,0 +1,115 @@
+import unittest
+from KicadModTree import *
+
+RESULT_clipLines = """(module test_silkscreen_clearance (layer F.Cu) (tedit 0)
+  (fp_line (start -2 0) (end -0.76 0) (layer F.SilkS) (width 0.12))
+  (fp_line (start 0.76 0) (end 2 0) (layer F.SilkS) (width 0.12))
+  (fp_line (start 0 3) (end 1 3) (layer F.SilkS) (width 0.12))
+  (fp_line (start -2 0.2) (end 2 0.2) (layer B.SilkS) (width 0.12))
+  (fp_line (start -2 -0.2) (end 2 -0.2) (layer F.Fab) (width 0.1))
+  (pad 1 smd rect (at 0 0) (size 1 1) (layers F.Cu F.Mask F.Paste))
+)"""
+
+RESULT_clipCircles = """(module test_silkscreen_clearance (layer F.Cu) (tedit 0)
+  (fp_arc (start 1 0) (end 0.6638 -0.370094) (angle 264.505139) (layer F.SilkS) (width 0.12))
+  (fp_arc (start 0 1) (end -1 1) (angle -180) (layer F.SilkS) (width 0.12))
+  (fp_circle (center 0 0) (end 1 0) (layer F.SilkS) (width 0.12))
+  (pad 1 thru_hole circle (at 0 0) (size 1 1) (drill 0.6) (layers *.Cu *.Mask))
+)"""
+
+RESULT_clipSpecializedNodes = """(module test_silkscreen_clearance (layer F.Cu) (tedit 0)
+  (fp_line (start 0 -2) (end 0 0.54) (layer F.SilkS) (width 0.12))
+  (fp_line (start 0 1.46) (end 0 2) (layer F.SilkS) (width 0.12))
+  (fp_line (start 0 2) (end 2 2) (layer F.SilkS) (width 0.12))
+  (fp_line (start 2 2) (end 2 -0.24) (layer F.SilkS) (width 0.12))
+  (fp_line (start 2 -1.76) (end 2 -2) (layer F.SilkS) (width 0.12))
+  (fp_line (start 2 -2) (end 0 -2) (layer F.SilkS) (width 0.12))
+  (pad 1 smd roundrect (at 2 -1 90) (size 1 0.6) (layers F.Cu F.Mask F.Paste) (roundrect_rratio 0.25))
+  (pad 2 smd custom (at 0 1) (size 0.4 0.4) (layers F.Cu F.Mask F.Paste)
+    (options (clearance outline) (anchor circle))
+    (primitives
+      (gr_poly (pts
+         (xy 0 0) (xy -1 0.5) (xy -1 -0.5)) (width 0))
+    ))
+)"""
+
+RESULT_clipPadRow = """(module test_silkscreen_clearance (layer F.Cu) (tedit 0)
+  (fp_line (start -3 -2) (end 1.529953 -2) (layer F.SilkS) (width 0.12))
+  (fp_line (start 2.419456 -2) (end 2.598076 -2) (layer F.SilkS) (width 0.12))
+  (fp_line (start 3.891341 -2) (end 6 -2) (layer F.SilkS) (width 0.12))
+  (pad 1 smd oval (at 0 0 30) (size 0.6 1.5) (layers F.Cu F.Mask F.Paste))
+  (pad 2 smd oval (at 1.099852 -0.635 30) (size 0.6 1.5) (layers F.Cu F.Mask F.Paste))
+  (pad 3 smd oval (at 2.199705 -1.27 30) (size 0.6 1.5) (layers F.Cu F.Mask F.Paste))
+  (pad 4 smd oval (at 3.299557 -1.905 30) (size 0.6 1.5) (layers F.Cu F.Mask F.Paste))
+)"""
+
+
+class SilkscreenClearanceTests(unittest.TestCase):
+
+    def testClipLines(self):
+        kicad_mod = Footprint("test_silkscreen_clearance")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                             at=[0, 0], size=[1, 1], layers=Pad.LAYERS_SMT))
+
+        kicad_mod.append(Line(start=[-2, 0], end=[2, 0], layer='F.SilkS', width=0.12))
+        kicad_mod.append(Line(start=[0, 3], end=[1, 3], layer='F.SilkS', width=0.12))
+        # the pad is only on the front, and fab lines are not touched
+        kicad_mod.append(Line(start=[-2, 0.2], end=[2, 0.2], layer='B.SilkS', width=0.12))
+        kicad_mod.append(Line(start=[-2, -0.2], end=[2, -0.2], layer='F.Fab', width=0.1))
+
+        self.assertEqual(kicad_mod.clipSilkscreen(0.2), 1)
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_clipLines)
+
+        # the clipped lines end on the clearance, so clipping again does not change them
+        self.assertEqual(kicad_mod.clipSilkscreen(0.2), 0)
+
+    def testClipCircles(self):
+        kicad_mod = Footprint("test_silkscreen_clearance")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+                             at=[0, 0], size=[1, 1], drill=0.6, layers=Pad.LAYERS_THT))
+
+        kicad_mod.append(Circle(center=[0, 0], radius=1, layer='F.SilkS', width=0.12))
+        kicad_mod.append(Circle(center=[1, 0], radius=0.5, layer='F.SilkS', width=0.12))
+        kicad_mod.append(Circle(center=[0, 0], radius=0.6, layer='F.SilkS', width=0.12))
+        kicad_mod.append(Arc(center=[0, 1], start=[-1, 1], angle=-180, layer='F.SilkS', width=0.12))
+
+        self.assertEqual(kicad_mod.clipSilkscreen(0.2), 2)
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_clipCircles)
+
+    def testClipSpecializedNodes(self):
+        kicad_mod = Footprint("test_silkscreen_clearance")
+        translation = Translation(1, 0)
+        kicad_mod.append(translation)
+
+        translation.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_ROUNDRECT, at=[1, -1], size=[1, 0.6],
+                               rotation=90, radius_ratio=0.25, layers=Pad.LAYERS_SMT))
+        translation.append(RectLine(start=[-1, -2], end=[1, 2], layer='F.SilkS', width=0.12))
+        translation.append(Pad(number=2, type=Pad.TYPE_SMT, shape=Pad.SHAPE_CUSTOM, at=[-1, 1], size=[0.4, 0.4],
+                               layers=Pad.LAYERS_SMT,
+                               primitives=[Polygon(nodes=[(0, 0), (-1, 0.5), (-1, -0.5)], width=0)]))
+
+        self.assertEqual(kicad_mod.clipSilkscreen(0.2), 2)
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_clipSpecializedNodes)
+
+    def testClipPadRow(self):
+        kicad_mod = Footprint("test_silkscreen_clearance")
+        rotation = Rotation(30)
+        kicad_mod.append(rotation)
+        for i in range(4):
+            rotation.append(Pad(number=i + 1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_OVAL, at=[i * 1.27, 0],
+                                size=[0.6, 1.5], layers=Pad.LAYERS_SMT))
+
+        # the edges of the pads are on one line, which crosses the silkscreen line between two pads. the crossings
+        # of the pads differ by rounding errors only, and must not split the line
+        kicad_mod.append(Line(start=[-3, -2], end=[6, -2], layer='F.SilkS', width=0.12))
+
+        self.assertEqual(kicad_mod.clipSilkscreen(0.2), 1)
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_clipPadRow)
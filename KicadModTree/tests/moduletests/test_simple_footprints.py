@@ -13,9 +13,14 @@
 #
 # (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import io
+import os
+import shutil
+import tempfile
 import unittest
 
 from KicadModTree import *
+from KicadModTree.FileHandler import WRITE_NEW, WRITE_CHANGED, WRITE_UNCHANGED, getWriteStatistics, resetWriteStatistics
 
 
 RESULT_MINIMUM = """(module test (layer F.Cu) (tedit 0)
@@ -72,6 +77,26 @@ RESULT_BASIC_NODES = """(module test (layer F.Cu) (tedit 0)
 )"""
 
 
+def createSampleFootprint():
+    kicad_mod = Footprint("test")
+
+    kicad_mod.setDescription("A example footprint")
+    kicad_mod.setTags("example")
+
+    kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
+    kicad_mod.append(Text(type='value', text="test", at=[1.5, 3], layer='F.Fab'))
+    kicad_mod.append(RectLine(start=[-2, -2], end=[5, 2], layer='F.SilkS'))
+    kicad_mod.append(RectLine(start=[-2.25, -2.25], end=[5.25, 2.25], layer='F.CrtYd'))
+    kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+                         at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+    kicad_mod.append(Pad(number=2, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+                         at=[3, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+    kicad_mod.append(Model(filename="example.3dshapes/example_footprint.wrl",
+                           at=[0, 0, 0], scale=[1, 1, 1], rotate=[0, 0, 0]))
+
+    return kicad_mod
+
+
 class SimpleFootprintTests(unittest.TestCase):
 
     def testMinimum(self):
@@ -91,24 +116,63 @@ class SimpleFootprintTests(unittest.TestCase):
         self.assertEqual(file_handler.serialize(timestamp=0), RESULT_BASIC_TAGS)
 
     def testSampleFootprint(self):
-        kicad_mod = Footprint("test")
+        kicad_mod = createSampleFootprint()
 
-        kicad_mod.setDescription("A example footprint")
-        kicad_mod.setTags("example")
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_SIMPLE_FOOTPRINT)
 
-        kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
-        kicad_mod.append(Text(type='value', text="test", at=[1.5, 3], layer='F.Fab'))
-        kicad_mod.append(RectLine(start=[-2, -2], end=[5, 2], layer='F.SilkS'))
-        kicad_mod.append(RectLine(start=[-2.25, -2.25], end=[5.25, 2.25], layer='F.CrtYd'))
-        kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
-                             at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
-        kicad_mod.append(Pad(number=2, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
-                             at=[3, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
-        kicad_mod.append(Model(filename="example.3dshapes/example_footprint.wrl",
-                               at=[0, 0, 0], scale=[1, 1, 1], rotate=[0, 0, 0]))
+    def testWriteStream(self):
+        kicad_mod = createSampleFootprint()
 
+        stream = io.StringIO()
         file_handler = KicadFileHandler(kicad_mod)
-        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_SIMPLE_FOOTPRINT)
+        file_handler.writeStream(stream, timestamp=0)
+        self.assertEqual(stream.getvalue(), RESULT_SIMPLE_FOOTPRINT)
+
+    def testWriteFile(self):
+        kicad_mod = createSampleFootprint()
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmp_dir, 'test.kicad_mod')
+            file_handler = KicadFileHandler(kicad_mod)
+            file_handler.writeFile(filename, timestamp=0)
+
+            with io.open(filename, 'r', newline='') as f:
+                self.assertEqual(f.read(), RESULT_SIMPLE_FOOTPRINT)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def testWriteFileSkipUnchanged(self):
+        kicad_mod = createSampleFootprint()
+        resetWriteStatistics()
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmp_dir, 'test.kicad_mod')
+            file_handler = KicadFileHandler(kicad_mod)
+            self.assertEqual(file_handler.writeFile(filename, timestamp=0, skip_unchanged=True), WRITE_NEW)
+
+            # only the timestamp differs, the file is not touched
+            self.assertEqual(file_handler.writeFile(filename, timestamp=1, skip_unchanged=True), WRITE_UNCHANGED)
+            with io.open(filename, 'r', newline='') as f:
+                self.assertEqual(f.read(), RESULT_SIMPLE_FOOTPRINT)
+
+            kicad_mod.setTags("changed")
+            self.assertEqual(file_handler.writeFile(filename, timestamp=1, skip_unchanged=True), WRITE_CHANGED)
+            with io.open(filename, 'r', newline='') as f:
+                self.assertIn("(tedit 1)", f.read())
+
+            # a file which is no valid utf-8 is replaced
+            with io.open(filename, 'wb') as f:
+                f.write(b'(module \xff)')
+            self.assertEqual(file_handler.writeFile(filename, timestamp=1, skip_unchanged=True), WRITE_CHANGED)
+            with io.open(filename, 'r', encoding='utf-8', newline='') as f:
+                self.assertIn("(tedit 1)", f.read())
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        self.assertEqual(getWriteStatistics(), {WRITE_NEW: 1, WRITE_CHANGED: 2, WRITE_UNCHANGED: 1})
 
     def testBasicNodes(self):
         kicad_mod = Footprint("test")
@@ -0,0 +1,95 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import shutil
+import datetime
+import tempfile
+import unittest
+
+import yaml
+
+from KicadModTree.util.yaml_util import loadYaml, loadYamlFile, useYamlCache, isYamlCache
+
+DOCUMENT = """\
+SOIC-8:
+  size_source: 'http://www.example.com/soic.pdf'
+  body_size_x:
+    minimum: 3.8
+    maximum: 4.0
+  pitch: 1.27
+  num_pins_x: 0
+  num_pins_y: 4
+  pad_length_addition: [0.1, 0.2]
+  thermal_vias: ~
+"""
+
+
+class YamlUtilTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'test.yaml')
+        self.cache_directory = os.path.join(self.directory, 'cache')
+        with open(self.filename, 'w') as f:
+            f.write(DOCUMENT)
+        useYamlCache(True, self.cache_directory)
+
+    def tearDown(self):
+        useYamlCache(False)
+        shutil.rmtree(self.directory)
+
+    def testLoad(self):
+        expected = yaml.safe_load(DOCUMENT)
+        self.assertEqual(loadYaml(DOCUMENT), expected)
+        with open(self.filename, 'r') as stream:
+            self.assertEqual(loadYaml(stream), expected)
+        self.assertEqual(loadYamlFile(self.filename), expected)
+
+        # strings are always documents, even if they are the name of a file
+        self.assertEqual(loadYaml(self.filename), self.filename)
+
+    def testCache(self):
+        self.assertTrue(isYamlCache())
+        document = loadYamlFile(self.filename)
+        self.assertEqual(len(os.listdir(self.cache_directory)), 1)
+
+        # cached documents are returned as new objects, which can be modified
+        document['SOIC-8']['pitch'] = 0.5
+        self.assertEqual(loadYamlFile(self.filename)['SOIC-8']['pitch'], 1.27)
+
+        # a modified file has to be parsed again, and replaces the outdated entry
+        with open(self.filename, 'a') as f:
+            f.write("  pin_count: 8\n")
+        self.assertEqual(loadYamlFile(self.filename)['SOIC-8']['pin_count'], 8)
+        self.assertEqual(loadYamlFile(self.filename)['SOIC-8']['pin_count'], 8)
+        self.assertEqual(len(os.listdir(self.cache_directory)), 1)
+
+    def testCacheTypes(self):
+        with open(self.filename, 'w') as f:
+            f.write("date: 2018-05-01\n")
+        self.assertEqual(loadYamlFile(self.filename), {'date': datetime.date(2018, 5, 1)})
+        self.assertEqual(loadYamlFile(self.filename), {'date': datetime.date(2018, 5, 1)})
+
+    def testCacheDisabled(self):
+        useYamlCache(False)
+        self.assertFalse(isYamlCache())
+        self.assertEqual(loadYamlFile(self.filename), yaml.safe_load(DOCUMENT))
+        self.assertFalse(os.path.exists(self.cache_directory))
+
+    def testInvalidDocument(self):
+        with open(self.filename, 'w') as f:
+            f.write("a: [1, 2\n")
+        self.assertRaises(yaml.YAMLError, loadYamlFile, self.filename)
@@ -16,6 +16,11 @@
 import unittest
 
 from KicadModTree.nodes.Node import *
+from KicadModTree.nodes.specialized.Translation import Translation
+from KicadModTree.nodes.specialized.RectLine import RectLine
+from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Circle import Circle
+from KicadModTree.nodes.base.Pad import Pad
 
 
 class TestChildNode(Node):
@@ -23,6 +28,30 @@ class TestChildNode(Node):
         Node.__init__(self)
 
 
+class TestVirtualChildNode(Node):
+    def __init__(self, virtual_childs):
+        Node.__init__(self)
+        self.virtual_childs = virtual_childs
+
+    def getVirtualChilds(self):
+        return self.virtual_childs
+
+
+class TestCreateVirtualChildNode(Node):
+    def __init__(self, count):
+        Node.__init__(self)
+        self.count = count
+        self._created = 0
+
+    def setCount(self, count):
+        self.count = count
+        self._invalidateVirtualChilds()
+
+    def _createVirtualChilds(self):
+        self._created += 1
+        return [Node() for i in range(self.count)]
+
+
 class NodeTests(unittest.TestCase):
 
     def testInit(self):
@@ -264,3 +293,163 @@ class NodeTests(unittest.TestCase):
         node.insert(insertNode)
         self.assertEqual(len(node.getNormalChilds()), 1)
         self.assertEqual(len(insertNode.getNormalChilds()), 200)
+
+    def testSerialize(self):
+        node = Node()
+        childNode1 = Node()
+        childNode2 = Node()
+        virtualNode1 = Node()
+        virtualNode2 = Node()
+        virtualParent = TestVirtualChildNode([virtualNode1, virtualNode2])
+        node.append(childNode1)
+        node.append(virtualParent)
+        childNode1.append(childNode2)
+
+        expected = [node, childNode1, childNode2, virtualParent, virtualNode1, virtualNode2]
+        self.assertEqual(node.serialize(), expected)
+        self.assertEqual(list(node.iter_serialize()), expected)
+
+    def testIterSerializeDeepTree(self):
+        node = Node()
+        expected = [node]
+        current = node
+        for i in range(0, 5000):
+            child = Node()
+            current.append(child)
+            expected.append(child)
+            current = child
+
+        self.assertEqual(list(node.iter_serialize()), expected)
+
+    def testRealPositionAfterMove(self):
+        translation1 = Translation(1, 2)
+        translation2 = Translation(10, 20)
+        middle = Translation(0.5, 0)
+        node = Node()
+        middle.append(node)
+        translation1.append(middle)
+
+        self.assertEqual(node.getRealPosition([0, 0]), Vector3D(1.5, 2))
+
+        translation1.remove(middle)
+        self.assertEqual(node.getRealPosition([0, 0]), Vector3D(0.5, 0))
+
+        translation2.append(middle)
+        self.assertEqual(node.getRealPosition([1, 1], 10), (Vector3D(11.5, 21), 10))
+
+        translation2.offset_x = 5
+        self.assertEqual(node.getRealPosition([1, 1]), Vector3D(6.5, 21))
+
+        translation1.append(translation2)
+        self.assertEqual(node.getRealPosition([1, 1]), Vector3D(7.5, 23))
+
+        translation1.insert(Translation(0, 1))
+        self.assertEqual(node.getRealPosition([1, 1]), Vector3D(7.5, 24))
+
+    def testVirtualChildsCache(self):
+        node = TestCreateVirtualChildNode(3)
+        self.assertEqual(node._created, 0)
+
+        childs = node.getVirtualChilds()
+        self.assertEqual(len(childs), 3)
+        self.assertEqual(len(node.serialize()), 4)
+        node.calculateBoundingBox()
+        node.getCompleteRenderTree()
+        self.assertIs(node.getVirtualChilds(), childs)
+        self.assertEqual(node._created, 1)
+
+        node.setCount(5)
+        self.assertEqual(len(node.getVirtualChilds()), 5)
+        self.assertEqual(node._created, 2)
+
+        node._invalidateVirtualChilds()
+        self.assertIsNot(node.getVirtualChilds(), childs)
+        self.assertEqual(node._created, 3)
+
+    def testSpatialIndex(self):
+        node = Node()
+        translation = Translation(10, 0)
+        node.append(translation)
+
+        line = Line(start=[0, 0], end=[1, 1])
+        circle = Circle(center=[5, 0], radius=1)
+        pad = Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[0, 5], size=[2, 1], rotation=90,
+                  layers=Pad.LAYERS_SMT)
+        rect = RectLine(start=[-1, -1], end=[7, 7], layer='F.SilkS')
+        translation.extend([line, circle, pad, rect])
+        rect_lines = rect.getVirtualChilds()
+
+        index = node.getSpatialIndex()
+        self.assertEqual(len(index), 7)
+        self.assertEqual(index.intersecting(9.5, -0.5, 10.5, 0.5), [line])
+        self.assertEqual(index.intersecting(9.6, 4, 10.4, 6), [pad])
+        self.assertEqual(index.intersecting(14, -0.5, 16, 0.5), [circle])
+
+        self.assertEqual(index.nearest(15, 0), [circle])
+        self.assertEqual(index.nearest(10.2, 3, count=2), [pad, rect_lines[0]])
+        self.assertEqual(index.nearest(3, 3, max_distance=1), [])
+
+        # the sides of the rectangle touch each other at the corners
+        self.assertEqual(index.overlappingPairs(),
+                         [(circle, rect_lines[3]),
+                          (rect_lines[0], rect_lines[1]), (rect_lines[0], rect_lines[3]),
+                          (rect_lines[1], rect_lines[2]), (rect_lines[2], rect_lines[3])])
+
+    def testSpatialIndexCache(self):
+        node = Node()
+        translation = Translation(0, 0)
+        node.append(translation)
+        line = Line(start=[0, 0], end=[1, 1])
+        translation.append(line)
+
+        index = node.getSpatialIndex()
+        child_index = translation.getSpatialIndex()
+        self.assertIs(node.getSpatialIndex(), index)
+        self.assertEqual(index.intersecting(0.5, 0.5, 0.5, 0.5), [line])
+
+        # moving a parent invalidates the indices of the nodes below it as well
+        translation.offset_x = 5
+        self.assertIsNot(node.getSpatialIndex(), index)
+        self.assertIsNot(translation.getSpatialIndex(), child_index)
+        self.assertEqual(node.getSpatialIndex().intersecting(0.5, 0.5, 0.5, 0.5), [])
+        self.assertEqual(node.getSpatialIndex().intersecting(5.5, 0.5, 5.5, 0.5), [line])
+
+        index = node.getSpatialIndex()
+        line.rotate(90)
+        self.assertIsNot(node.getSpatialIndex(), index)
+        self.assertEqual(node.getSpatialIndex().intersecting(4, 1, 4, 1), [line])
+
+        index = node.getSpatialIndex()
+        circle = Circle(center=[0, 0], radius=1)
+        translation.append(circle)
+        self.assertIsNot(node.getSpatialIndex(), index)
+        self.assertEqual(node.getSpatialIndex().intersecting(5, 0, 5, 0), [line, circle])
+
+        index = node.getSpatialIndex()
+        translation.remove(line)
+        self.assertIsNot(node.getSpatialIndex(), index)
+        self.assertEqual(node.getSpatialIndex().intersecting(5, 0, 5, 0), [circle])
+
+        index = node.getSpatialIndex()
+        circle.translate([0, 9])
+        self.assertIsNot(node.getSpatialIndex(), index)
+        self.assertEqual(node.getSpatialIndex().intersecting(5, 9, 5, 9), [circle])
+
+    def testSpatialIndexUnrelatedChanges(self):
+        node = Node()
+        translation = Translation(0, 0)
+        node.append(translation)
+        line = Line(start=[0, 0], end=[1, 1])
+        translation.append(line)
+        other_line = Line(start=[0, 0], end=[1, 1])
+        node.append(other_line)
+
+        # changes outside of the nodes below the translation do not touch its index
+        index = translation.getSpatialIndex()
+        other_line.translate([1, 1])
+        node.append(Circle(center=[0, 0], radius=1))
+        self.assertIs(translation.getSpatialIndex(), index)
+
+        line.translate([1, 1])
+        self.assertIsNot(translation.getSpatialIndex(), index)
+        self.assertEqual(translation.getSpatialIndex().intersecting(2, 2, 2, 2), [line])
@@ -0,0 +1,121 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from __future__ import division
+
+import os
+import sys
+import math
+import random
+import unittest
+
+from KicadModTree import Footprint
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', '..', 'scripts')
+sys.path.append(os.path.join(SCRIPTS_DIR, 'Connector_PinSocket'))
+
+from canvas import Layer, Keepout, _KeepoutGrid  # NOQA
+
+
+def createKeepout():
+    return Keepout(Layer(Footprint("test_canvas"), 'F.SilkS'))
+
+
+class CanvasTests(unittest.TestCase):
+
+    def assertArcsOutside(self, keepout, x, y, radius, arcs):
+        for a0, a1 in arcs:
+            for a in [a0 + (a1 - a0) * i / 10 for i in range(1, 10)]:
+                self.assertFalse(any(k.contains(x + radius * math.cos(a), y + radius * math.sin(a))
+                                     for k in keepout.keepouts))
+
+    def testGrid(self):
+        keepout = createKeepout()
+        rng = random.Random(42)
+        for i in range(200):
+            keepout.addRect(rng.uniform(-20, 20), rng.uniform(-20, 20), rng.uniform(0.1, 3), rng.uniform(0.1, 3), 0)
+        grid = _KeepoutGrid(keepout.keepouts)
+
+        for i in range(100):
+            x0, y0 = rng.uniform(-25, 25), rng.uniform(-25, 25)
+            x1, y1 = x0 + rng.uniform(0, 5), y0 + rng.uniform(0, 5)
+            found = list(grid.query(x0, y0, x1, y1))
+            self.assertEqual(found, sorted(found))
+
+            # the buckets may hold more keepouts, but never miss one overlapping the rectangle
+            overlapping = [j for j, k in enumerate(keepout.keepouts)
+                           if k.x0 <= x1 and k.x1 >= x0 and k.y0 <= y1 and k.y1 >= y0]
+            self.assertTrue(set(overlapping) <= set(found))
+
+        # a query covering more cells than there are buckets gets all keepouts
+        self.assertEqual(list(grid.query(-100, -100, 100, 100)), list(range(200)))
+
+    def testGridUpdate(self):
+        keepout = createKeepout()
+        for i in range(10):
+            keepout.addRect(i * 2, 0, 1, 1, 0)
+        self.assertEqual(len(keepout._near(4, 4, 5, 5)), 0)
+
+        # the grid is built again when keepouts were added
+        keepout.addRect(4.5, 4.5, 1, 1, 0)
+        self.assertEqual(len(keepout._near(4, 4, 5, 5)), 1)
+
+    def testProcessArc(self):
+        keepout = createKeepout()
+        self.assertEqual(keepout.processArc(0, 0, 2, 0, math.pi), False)
+
+        keepout.addRect(0, 2, 1, 1, 0)
+        # the keepout does not touch this part of the circle
+        self.assertEqual(keepout.processArc(0, 0, 2, -math.pi, 0), False)
+
+        # the arc ends exactly at the edges of the keepout
+        arcs = keepout.processArc(0, 0, 2, 0, math.pi)
+        self.assertEqual(len(arcs), 2)
+        self.assertAlmostEqual(arcs[0][0], 0)
+        self.assertAlmostEqual(arcs[0][1], math.acos(0.25))
+        self.assertAlmostEqual(arcs[1][0], math.pi - math.acos(0.25))
+        self.assertAlmostEqual(arcs[1][1], math.pi)
+        self.assertArcsOutside(keepout, 0, 0, 2, arcs)
+
+    def testProcessCircle(self):
+        keepout = createKeepout()
+        keepout.addRect(2, 0, 1, 1, 0)
+
+        # the free arc runs across the start angle of the circle, and is joined into one arc
+        arcs = keepout.processCircle(0, 0, 2)
+        self.assertEqual(len(arcs), 1)
+        self.assertAlmostEqual(arcs[0][0], math.asin(0.25))
+        self.assertAlmostEqual(arcs[0][1], 2 * math.pi - math.asin(0.25))
+        self.assertArcsOutside(keepout, 0, 0, 2, arcs)
+
+        # rounded keepouts are clipped at their rounded corners
+        keepout = createKeepout()
+        keepout.addRound(1.5, 1.5, 1, 1, 0)
+        arcs = keepout.processCircle(0, 0, 2)
+        self.assertEqual(len(arcs), 1)
+        self.assertArcsOutside(keepout, 0, 0, 2, arcs)
+
+    def testProcessCircleTouchingCorner(self):
+        keepout = createKeepout()
+        keepout.addRect(0, -1.3, 2, 2, 0)
+        # the corner (0.5, 1.2) lies on the circle, its crossings with both edges differ by rounding errors only
+        keepout.addRect(1, 1.7, 1, 1, 0)
+
+        # one arc between the crossings with the sides of the lower keepout
+        arcs = keepout.processCircle(0, 0, 1.3)
+        self.assertEqual(len(arcs), 1)
+        self.assertAlmostEqual(arcs[0][0], -math.acos(1 / 1.3))
+        self.assertAlmostEqual(arcs[0][1], math.pi + math.acos(1 / 1.3))
+        self.assertArcsOutside(keepout, 0, 0, 1.3, arcs)
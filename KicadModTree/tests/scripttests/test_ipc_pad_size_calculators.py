@@ -0,0 +1,97 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import sys
+import itertools
+import unittest
+
+from KicadModTree.util.yaml_util import loadYamlFile
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', '..', 'scripts')
+sys.path.append(os.path.join(SCRIPTS_DIR, 'tools'))
+
+from ipc_pad_size_calculators import TolerancedSize, TolerancedSizeArray, IPC_DENSITIES, \
+    ipc_gull_wing, ipc_gull_wing_batch  # NOQA
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+MANF_TOL = {'manufacturing_tolerance': 0.1, 'placement_tolerance': 0.05}
+
+
+def createDevices():
+    r"""Get lead width, lead outside, lead length and heel reduction of a sweep over typical gull wing devices"""
+    devices = []
+    for width, width_tol, outside, outside_tol, length, length_tol, heel_reduction in itertools.product(
+            [0.2, 0.31, 0.42], [0.02, 0.05], [3.9, 6.0, 9.2], [0.1, 0.2], [0.4, 0.635, 1.27], [0.1, 0.15], [0, 0.05]):
+        devices.append((TolerancedSize(nominal=width, tolerance=width_tol),
+                        TolerancedSize(nominal=outside, tolerance=outside_tol),
+                        TolerancedSize(nominal=length, tolerance=length_tol),
+                        heel_reduction))
+    return devices
+
+
+class IpcPadSizeCalculatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ipc_definitions = loadYamlFile(os.path.join(SCRIPTS_DIR, 'Packages', 'ipc_definitions.yaml'))
+
+    def assertSizeEqual(self, size, expected):
+        for name in ['minimum', 'nominal', 'maximum', 'ipc_tol', 'ipc_tol_RMS', 'minimum_RMS', 'maximum_RMS']:
+            self.assertAlmostEqual(getattr(size, name), getattr(expected, name), places=9)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def testGullWingBatch(self):
+        devices = createDevices()
+        lead_width, lead_outside, lead_len, heel_reduction = zip(*devices)
+        lead_width = TolerancedSizeArray.fromSizes(lead_width)
+        lead_outside = TolerancedSizeArray.fromSizes(lead_outside)
+        lead_len = TolerancedSizeArray.fromSizes(lead_len)
+
+        references = ['ipc_spec_gw_large_pitch', 'ipc_spec_gw_small_pitch']
+        for reference in references:
+            ipc_definition = self.ipc_definitions[reference]
+            results = ipc_gull_wing_batch(ipc_definition, MANF_TOL, lead_width, lead_outside,
+                                          lead_len=lead_len, heel_reduction=numpy.array(heel_reduction))
+
+            for row, density in enumerate(IPC_DENSITIES):
+                for column, device in enumerate(devices):
+                    expected = ipc_gull_wing(ipc_definition[density], ipc_definition['round_base'], MANF_TOL,
+                                             device[0], device[1], lead_len=device[2], heel_reduction=device[3])
+                    self.assertEqual(tuple(float(r[row][column]) for r in results), expected)
+
+        # every device with its own ipc reference
+        ipc_definition = [self.ipc_definitions[references[i % 2]] for i in range(len(devices))]
+        results = ipc_gull_wing_batch(ipc_definition, MANF_TOL, lead_width, lead_outside, lead_len=lead_len)
+        for row, density in enumerate(IPC_DENSITIES):
+            for column, device in enumerate(devices):
+                expected = ipc_gull_wing(ipc_definition[column][density], ipc_definition[column]['round_base'],
+                                         MANF_TOL, device[0], device[1], lead_len=device[2])
+                self.assertEqual(tuple(float(r[row][column]) for r in results), expected)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def testArrayArithmetic(self):
+        sizes = [device[1] for device in createDevices()[:8]]
+        array = TolerancedSizeArray.fromSizes(sizes)
+
+        # without division from __future__, python 2 uses __div__
+        for i, size in enumerate(sizes):
+            self.assertSizeEqual((array / 0.5)[i], size / 0.5)
+            self.assertSizeEqual((array * 2)[i], size * 2)
+            self.assertSizeEqual((array * 2 - array)[i], size * 2 - size)
@@ -0,0 +1,126 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from __future__ import division
+
+import os
+import sys
+import math
+import unittest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', '..', 'scripts')
+sys.path.append(os.path.join(SCRIPTS_DIR, 'tools'))
+
+from keepouts import KeepoutIndex, applyKeepouts, containedInAnyKeepout, clipArc, clipCircle  # NOQA
+
+# the circles used to be sampled in steps of one degree, this is a lot finer
+STEP = math.radians(0.05)
+
+
+def sampleArc(x, y, radius, angle_start, angle_end, keepouts):
+    r"""Get the free parts of an arc by checking points along it, like the drawing tools did before clipArc"""
+    arcs = []
+    start = None
+    count = int(round((angle_end - angle_start) / STEP))
+    for i in range(count + 1):
+        a = angle_start + (angle_end - angle_start) * i / count
+        if containedInAnyKeepout(x + radius * math.sin(a), y + radius * math.cos(a), keepouts):
+            if start is not None:
+                arcs.append((start, previous))
+            start = None
+        elif start is None:
+            start = a
+        previous = a
+    if start is not None:
+        arcs.append((start, angle_end))
+    return arcs
+
+
+def sampleCircle(x, y, radius, keepouts):
+    arcs = sampleArc(x, y, radius, 0, 2 * math.pi, keepouts)
+    if len(arcs) > 1 and arcs[0][0] == 0 and arcs[-1][1] == 2 * math.pi:
+        arcs = [(arcs[-1][0], arcs[0][1] + 2 * math.pi)] + arcs[1:-1]
+    return arcs
+
+
+class KeepoutsTests(unittest.TestCase):
+
+    def assertArcsAlmostEqual(self, arcs, expected):
+        self.assertEqual(len(arcs), len(expected))
+        for arc, expected_arc in zip(arcs, expected):
+            self.assertAlmostEqual(arc[0], expected_arc[0], delta=STEP)
+            self.assertAlmostEqual(arc[1], expected_arc[1], delta=STEP)
+
+    def testFullCircle(self):
+        # keepouts which do not touch the circle, one of them inside of it
+        keepouts = KeepoutIndex([[5, 6, 5, 6], [-0.5, 0.5, -0.5, 0.5], [-3, 3, 2.5, 3]])
+        self.assertEqual(clipCircle(0, 0, 2, keepouts), [(0, 2 * math.pi)])
+        self.assertEqual(clipArc(0, 0, 2, -1, 1, keepouts), [(-1, 1)])
+
+        # a circle completely inside of a keepout
+        keepouts = KeepoutIndex([[-3, 3, -3, 3]])
+        self.assertEqual(clipCircle(0, 0, 2, keepouts), [])
+        self.assertEqual(sampleCircle(0, 0, 2, keepouts), [])
+
+    def testPartialOverlap(self):
+        # the keepout crosses the circle at angle 0, which is the start and end of the circle
+        keepouts = KeepoutIndex([[-0.5, 0.5, 1.5, 2.5]])
+        arcs = clipCircle(0, 0, 2, keepouts)
+        self.assertArcsAlmostEqual(arcs, sampleCircle(0, 0, 2, keepouts))
+        self.assertAlmostEqual(arcs[0][0], math.asin(0.25))
+        self.assertAlmostEqual(arcs[0][1], 2 * math.pi - math.asin(0.25))
+
+        # two keepouts on opposite sides and a corner of a third one
+        keepouts = KeepoutIndex([[1.5, 2.5, -0.5, 0.5], [-2.5, -1.5, -0.3, 0.8], [1, 3, 1, 3]])
+        self.assertArcsAlmostEqual(clipCircle(1e-3, 0, 2, keepouts), sampleCircle(1e-3, 0, 2, keepouts))
+
+        # an arc which starts inside of a keepout and ends outside
+        self.assertArcsAlmostEqual(clipArc(0, 0, 2, 1, 4, keepouts), sampleArc(0, 0, 2, 1, 4, keepouts))
+
+    def testWrapAround(self):
+        # the keepout crosses the circle at angle pi, the free arc runs across angle 0
+        keepouts = KeepoutIndex([[-0.5, 0.5, -2.5, -1.5]])
+        self.assertEqual(len(clipArc(0, 0, 2, 0, 2 * math.pi, keepouts)), 2)
+
+        arcs = clipCircle(0, 0, 2, keepouts)
+        self.assertArcsAlmostEqual(arcs, sampleCircle(0, 0, 2, keepouts))
+        self.assertAlmostEqual(arcs[0][0], math.pi + math.asin(0.25))
+        self.assertAlmostEqual(arcs[0][1], 3 * math.pi - math.asin(0.25))
+
+        # a keepout crossing angle 0 leaves two arcs of an arc running across it
+        keepouts = KeepoutIndex([[-0.5, 0.5, 1.5, 2.5]])
+        arcs = clipArc(0, 0, 2, -1, 1, keepouts)
+        self.assertArcsAlmostEqual(arcs, sampleArc(0, 0, 2, -1, 1, keepouts))
+        self.assertEqual(len(arcs), 2)
+
+    def testRoundKeepout(self):
+        # round keepouts are stacks of rectangles, like the ones created by addKeepoutRound
+        keepouts = []
+        for i in range(-9, 10):
+            h = 0.1 * i
+            w = math.sqrt(1 - h * h)
+            keepouts.append([2 - w, 2 + w, h - 0.05, h + 0.05])
+        keepouts = KeepoutIndex(keepouts)
+        self.assertArcsAlmostEqual(clipCircle(0, 0, 2, keepouts), sampleCircle(0, 0, 2, keepouts))
+
+    def testPlainList(self):
+        keepouts = [[0, 1, 0, 1], [5, 6, 0, 1]]
+        self.assertEqual(applyKeepouts([[-5, 10]], 0.5, 0, 2, keepouts), [[-5, 0], [1, 5], [6, 10]])
+
+        # a plain list is indexed on every call, so changes of the list are always seen
+        keepouts[1] = [3, 4, 0, 1]
+        self.assertEqual(applyKeepouts([[-5, 10]], 0.5, 0, 2, keepouts), [[-5, 0], [1, 3], [4, 10]])
+        self.assertTrue(containedInAnyKeepout(3.5, 0.5, keepouts))
+        self.assertFalse(containedInAnyKeepout(5.5, 0.5, keepouts))
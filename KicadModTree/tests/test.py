@@ -22,6 +22,7 @@ sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../..
 from nodes import *  # NOQA
 from datatypes import *  # NOQA
 from moduletests import *  # NOQA
+from scripttests import *  # NOQA
 
 
 def run_tests():
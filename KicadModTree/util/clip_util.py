@@ -0,0 +1,76 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Clip lines, arcs and circles against keepouts, given the points where they cross the outlines of the keepouts
+
+The silkscreen clearance, the keepouts of the drawing tools and the canvas keepouts all calculate the parameters
+(the position along a line, or the angle on a circle) where a curve may enter or leave a keepout. Between two
+neighbouring crossings the curve is either completely inside or completely outside of the keepouts, so one test at
+the midpoint decides the whole part.
+"""
+
+# crossings closer than this are treated as the same point
+EPSILON = 1e-9
+
+
+def freeIntervals(t0, t1, crossings, inside, epsilon=EPSILON):
+    r"""Split [t0, t1] at the crossings, and get the parts which are not inside of a keepout
+
+    Parts shorter than epsilon are skipped, and free parts which are less than epsilon apart are merged. Crossings
+    which only differ by rounding errors (like the edges of a row of equal pads) do not split the result.
+
+    :param t0: start of the curve
+    :param t1: end of the curve, t1 > t0
+    :param crossings: parameters where the curve may cross the outline of a keepout, crossings outside of
+                      [t0, t1] are ignored
+    :param inside: function checking if the point of the curve at the parameter t lies in a keepout
+    :param epsilon: tolerance of the crossings
+
+    :return: list of intervals (a, b) with t0 <= a < b <= t1, or None if no part of [t0, t1] is inside
+
+    :Example:
+
+    >>> from KicadModTree.util.clip_util import freeIntervals
+    >>> freeIntervals(0, 10, [2, 4], lambda t: 2 < t < 4)
+    [(0, 2), (4, 10)]
+    """
+    ts = [t0] + sorted(t for t in crossings if t0 < t < t1) + [t1]
+
+    result = []
+    touched = False
+    for a, b in zip(ts, ts[1:]):
+        if b - a <= epsilon:
+            continue
+        if inside((a + b) / 2.):
+            touched = True
+        elif result and a - result[-1][1] <= epsilon:
+            result[-1] = (result[-1][0], b)
+        else:
+            result.append((a, b))
+    return result if touched else None
+
+
+def joinCircleIntervals(intervals, t0, t1, epsilon=EPSILON):
+    r"""Join the first and the last interval of a full circle [t0, t1] if both touch the start angle
+
+    :param intervals: intervals as returned by freeIntervals
+    :param t0: start angle of the circle
+    :param t1: end angle of the circle, t0 + 2*pi
+
+    :return: list of intervals, the joined interval is the first one and ends after t1
+    """
+    if len(intervals) > 1 and intervals[0][0] - t0 <= epsilon and t1 - intervals[-1][1] <= epsilon:
+        return [(intervals[-1][0], intervals[0][1] + t1 - t0)] + intervals[1:-1]
+    return intervals
@@ -13,9 +13,15 @@
 #
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import codecs
 import time
 import re
 
+try:
+    from StringIO import StringIO  # python2 (accepts str and unicode)
+except ImportError:
+    from io import StringIO
+
 
 def formatFloat(val):
     '''
@@ -40,75 +46,87 @@ def lispString(string):
     return string
 
 
-def lispTokenizer(input):
-    '''
-    Convert a string of characters into a list of tokens.
-    '''
-    input = input.replace('(', ' ( ').replace(')', ' ) ')
+# quoted string, which can contain escaped characters
+_LISP_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"', re.DOTALL)
+_LISP_ESCAPE = re.compile(r'\\(.)', re.DOTALL)
 
-    # split input, including whitespaces
-    base_tokens = re.split(r'(\s+)', input)
 
-    tokens = []
-    in_string = False
+def _toText(input):
+    # decode bytes or a buffer (like a memory mapped file) directly, without copying it into bytes first
+    if isinstance(input, (str, type(u''))):
+        return input
+    return codecs.utf_8_decode(input)[0]
 
-    for token in base_tokens:
-        if not in_string and token.isspace():
-            continue
 
-        if len(token) == 0:
-            continue
+def _splitLispStrings(text):
+    r"""Split a sexpr into the parts outside and inside of quotation marks
 
-        if token[0] == '"':
-            if in_string:
-                tokens[-1] += token[1:]
-                in_string = False
-            else:
-                tokens.append(token[1:])
-                in_string = True
+    Parts with an even index are outside of quotation marks, parts with an odd index are the content of a string.
+    Without backslashes in the text, there are no escaped quotation marks and splitting at every quotation mark
+    is enough.
+    """
+    if '\\' not in text:
+        parts = text.split('"')
+        if len(parts) % 2 == 0:
+            raise RuntimeError("missing closing quotation mark")
+        return parts
 
-        elif token[-1] == '"':
-            if in_string:
-                tokens[-1] += token[:-1]
-                in_string = False
-            else:
-                tokens.append(token[:-1])
-                in_string = True
+    parts = _LISP_STRING.split(text)
+    for i in range(0, len(parts), 2):
+        if '"' in parts[i]:
+            raise RuntimeError("missing closing quotation mark")
+    for i in range(1, len(parts), 2):
+        parts[i] = _LISP_ESCAPE.sub(r'\1', parts[i])
+
+    return parts
 
-        else:
-            if in_string:
-                tokens[-1] += token
-            else:
-                tokens.append(token)
 
-    if in_string:
-        raise RuntimeError("missing closing quotation mark")
+def lispTokenizer(input):
+    '''
+    Convert a string of characters into a list of tokens.
+    '''
+    tokens = []
 
-    # TOOD: remove invalid spaces from quotation (when having brackets inside)
+    for i, part in enumerate(_splitLispStrings(_toText(input))):
+        if i % 2:
+            tokens.append(part)
+        else:
+            tokens.extend(part.replace('(', ' ( ').replace(')', ' ) ').split())
 
     return tokens
 
 
 def parseLispString(input):
+    '''
+    Convert a string, bytes or a memory mapped file into nested lists of strings
+
+    Strings are split once at quotation marks, the parts between them are split at brackets and whitespaces by the
+    string methods. The tree is built in a single pass over the resulting tokens.
+    '''
     syntax_tree = []
     current_node = syntax_tree
     scope = [syntax_tree]
 
-    for token in lispTokenizer(input):
-        if token == "(":
-            scope.append([])
-            current_node.append(scope[-1])
-            current_node = scope[-1]
+    for i, part in enumerate(_splitLispStrings(_toText(input))):
+        if i % 2:
+            current_node.append(part)
+            continue
 
-        elif token == ")":
-            if len(scope) <= 1:
-                raise RuntimeError("missing opening brackets")
+        for token in part.replace('(', ' ( ').replace(')', ' ) ').split():
+            if token == '(':
+                current_node = []
+                scope[-1].append(current_node)
+                scope.append(current_node)
 
-            scope.pop()
-            current_node = scope[-1]
+            elif token == ')':
+                if len(scope) <= 1:
+                    raise RuntimeError("missing opening brackets")
 
-        else:
-            current_node.append(token)
+                scope.pop()
+                current_node = scope[-1]
+
+            else:
+                current_node.append(token)
 
     if len(scope) > 1:
         raise RuntimeError("missing closing brackets")
@@ -144,46 +162,61 @@ class SexprSerializer(object):
             raise RuntimeError("unexpected type: {}".format(pType))
 
     def sexpr_to_string(self, sexpr, prefix=None):
-        if prefix is None:
-            prefix = ""
+        stream = StringIO()
+        self.write_sexpr(stream, sexpr, prefix)
+        return stream.getvalue()
 
-        serial_string = "("
+    def write_sexpr(self, stream, sexpr, prefix=None):
+        r"""Write a sexpr token by token into a file-like object
 
-        # see: https://stackoverflow.com/questions/3190706/nonlocal-keyword-in-python-2-x
-        loop_ctrl = {'first': True, 'indentation': False}
+        Every line break inside a list is indented by the prefix of the list. When a list starts on a new line, all
+        of its lines are indented by one additional space.
 
-        def get_separator():
-            if loop_ctrl['first']:
-                loop_ctrl['first'] = False
-                return_str = ""
-            else:
-                return_str = " "
+        :param stream: file-like object with a ``write`` method
+        :param sexpr: A list of lists and primitive values
+        :param prefix: indentation used after every line break inside of the sexpr
+        """
+        if prefix is None:
+            prefix = ""
 
-            if loop_ctrl['indentation']:
-                return_str += " "
-                loop_ctrl['indentation'] = False
+        write = stream.write
+        write("(")
 
-            return return_str
+        first = True
+        indentation = False
 
         for attr in sexpr:
             if isinstance(attr, (tuple, list)):
-                return_string = self.sexpr_to_string(attr, prefix + " ")
-
-                if loop_ctrl['indentation']:
-                    return_string = return_string.replace('\n', '\n ')
-                serial_string += get_separator()
-
-                serial_string += return_string
+                if not first:
+                    write(" ")
+                if indentation:
+                    write(" ")
+                    self.write_sexpr(stream, attr, prefix + "  ")
+                else:
+                    self.write_sexpr(stream, attr, prefix + " ")
+                first = False
+                indentation = False
             elif attr == SexprSerializer.NEW_LINE:
-                serial_string += "\n"
-                serial_string += prefix
-                loop_ctrl['indentation'] = True
+                write("\n")
+                write(prefix)
+                indentation = True
             else:
-                serial_string += get_separator()
-                serial_string += self.primitive_to_string(attr)
-
-        serial_string += ")"
-        return serial_string
+                if not first:
+                    write(" ")
+                if indentation:
+                    write(" ")
+                    indentation = False
+                first = False
+                write(self.primitive_to_string(attr))
+
+        write(")")
+
+    def write(self, stream):
+        r"""Write the sexpr of this serializer into a file-like object
+
+        :param stream: file-like object with a ``write`` method
+        """
+        self.write_sexpr(stream, self.sexpr)
 
     def __str__(self):
         '''
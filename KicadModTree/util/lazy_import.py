@@ -0,0 +1,83 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import sys
+import types
+import importlib
+
+
+class _LazyPackage(types.ModuleType):
+    r"""Package whose attributes are not replaced by submodules of the same name
+
+    Importing ``KicadModTree.nodes.base.Pad`` binds the submodule as attribute ``Pad`` of its package. For an eager
+    package this does not matter, as the class is bound afterwards, but for a lazy package it would hide the class.
+    """
+
+    def __setattr__(self, name, value):
+        attribute = self.__dict__['_lazy_attributes'].get(name)
+        if isinstance(value, types.ModuleType) and attribute is not None and attribute[1] is not None:
+            return
+        types.ModuleType.__setattr__(self, name, value)
+
+
+def lazyImport(package_name, attributes):
+    r"""Import the attributes of a package on first access, instead of when the package is imported
+
+    Uses a module level ``__getattr__`` (PEP 562). ``from package import *`` still binds all attributes, but a
+    script importing single names only loads the modules it uses. On python versions before 3.7, everything is
+    imported immediately.
+
+    :param package_name:
+        ``__name__`` of the package
+    :param attributes:
+        dict of attribute name to ``(module, attribute)``. ``module`` can be relative to the package, ``attribute``
+        is ``None`` if the module itself is the attribute
+
+    :return: ``__all__``, ``__getattr__`` and ``__dir__`` of the package
+
+    :Example:
+
+    >>> from KicadModTree.util.lazy_import import lazyImport
+    >>> __all__, __getattr__, __dir__ = lazyImport(__name__, {'Arc': ('.Arc', 'Arc')})
+    """
+
+    package = sys.modules[package_name]
+
+    def __getattr__(name):
+        try:
+            module_name, attribute = attributes[name]
+        except KeyError:
+            raise AttributeError("module {!r} has no attribute {!r}".format(package_name, name))
+
+        value = importlib.import_module(module_name, package_name)
+        if attribute is not None:
+            value = getattr(value, attribute)
+        package.__dict__[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(package.__dict__) | set(attributes))
+
+    __all__ = sorted(attributes)
+
+    package.__dict__['_lazy_attributes'] = attributes
+    if sys.version_info >= (3, 7):
+        package.__class__ = _LazyPackage
+    else:
+        values = [(name, __getattr__(name)) for name in __all__]
+        # bind everything again, in case a submodule imported later replaced an attribute of the same name
+        package.__dict__.update(values)
+
+    return __all__, __getattr__, __dir__
@@ -0,0 +1,456 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from math import acos, atan2, cos, degrees, hypot, pi, radians, sin, sqrt
+
+from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.base.Pad import Pad
+from KicadModTree.nodes.base.Arc import Arc
+from KicadModTree.nodes.base.Circle import Circle
+from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Polygon import Polygon
+from KicadModTree.KicadFileHandler import DEFAULT_LAYER_WIDTH, DEFAULT_WIDTH, DEFAULT_WIDTH_POLYGON_PAD
+from KicadModTree.util.spatial_index import RTree
+from KicadModTree.util.clip_util import freeIntervals, joinCircleIntervals
+
+
+SILKSCREEN_LAYERS = {'F.SilkS': 'F', 'B.SilkS': 'B'}
+
+# tolerance of the inside tests, points on the outline of a pad are considered to be outside
+_EPSILON = 1e-9
+
+
+class _Disk(object):
+    def __init__(self, x, y, r):
+        self.x, self.y, self.r = x, y, r
+        self.lines = []
+        self.circles = [(x, y, r)]
+
+    def boundingBox(self):
+        return self.x - self.r, self.y - self.r, self.x + self.r, self.y + self.r
+
+    def contains(self, x, y):
+        return hypot(x - self.x, y - self.y) < self.r - _EPSILON
+
+
+class _Capsule(object):
+    r"""All points closer than r to the segment (x0, y0) - (x1, y1)"""
+
+    def __init__(self, x0, y0, x1, y1, r):
+        self.x0, self.y0, self.x1, self.y1, self.r = x0, y0, x1, y1, r
+        self.circles = [(x0, y0, r), (x1, y1, r)]
+        self.lines = []
+
+        length = hypot(x1 - x0, y1 - y0)
+        if length > 0:
+            nx, ny = -(y1 - y0) / length * r, (x1 - x0) / length * r
+            self.lines = [(x0 + nx, y0 + ny, x1 + nx, y1 + ny), (x0 - nx, y0 - ny, x1 - nx, y1 - ny)]
+
+    def boundingBox(self):
+        return (min(self.x0, self.x1) - self.r, min(self.y0, self.y1) - self.r,
+                max(self.x0, self.x1) + self.r, max(self.y0, self.y1) + self.r)
+
+    def contains(self, x, y):
+        dx, dy = self.x1 - self.x0, self.y1 - self.y0
+        length2 = dx * dx + dy * dy
+        t = 0 if length2 == 0 else max(0., min(1., ((x - self.x0) * dx + (y - self.y0) * dy) / length2))
+        return hypot(x - self.x0 - t * dx, y - self.y0 - t * dy) < self.r - _EPSILON
+
+
+class _RoundRect(object):
+    r"""Rectangle with rounded corners, rotated like a pad (rotation in degree, counter clockwise)"""
+
+    def __init__(self, x, y, half_width, half_height, r, rotation):
+        self.x, self.y, self.hw, self.hh = x, y, half_width, half_height
+        self.r = max(0., min(r, half_width, half_height))
+
+        phi = radians(rotation)
+        self.u = (cos(phi), -sin(phi))
+        self.v = (sin(phi), cos(phi))
+
+        self.lines = [self._point(s * self.hw, -self.hh) + self._point(s * self.hw, self.hh) for s in (-1, 1)]
+        self.lines += [self._point(-self.hw, s * self.hh) + self._point(self.hw, s * self.hh) for s in (-1, 1)]
+        self.circles = []
+        if self.r > 0:
+            self.circles = [self._point(sx * (self.hw - self.r), sy * (self.hh - self.r)) + (self.r,)
+                            for sx in (-1, 1) for sy in (-1, 1)]
+
+    def _point(self, lx, ly):
+        return (self.x + self.u[0] * lx + self.v[0] * ly, self.y + self.u[1] * lx + self.v[1] * ly)
+
+    def boundingBox(self):
+        ex = abs(self.u[0]) * self.hw + abs(self.v[0]) * self.hh
+        ey = abs(self.u[1]) * self.hw + abs(self.v[1]) * self.hh
+        return self.x - ex, self.y - ey, self.x + ex, self.y + ey
+
+    def contains(self, x, y):
+        dx, dy = x - self.x, y - self.y
+        lx = abs(dx * self.u[0] + dy * self.u[1])
+        ly = abs(dx * self.v[0] + dy * self.v[1])
+        if lx >= self.hw - _EPSILON or ly >= self.hh - _EPSILON:
+            return False
+
+        cx, cy = self.hw - self.r, self.hh - self.r
+        if lx > cx and ly > cy:
+            return hypot(lx - cx, ly - cy) < self.r - _EPSILON
+        return True
+
+
+class _PolygonArea(object):
+    def __init__(self, points):
+        self.points = points
+        self.lines = [points[i - 1] + points[i] for i in range(len(points))]
+        self.circles = []
+
+    def boundingBox(self):
+        return (min(p[0] for p in self.points), min(p[1] for p in self.points),
+                max(p[0] for p in self.points), max(p[1] for p in self.points))
+
+    def contains(self, x, y):
+        inside = False
+        for x0, y0, x1, y1 in self.lines:
+            if (y0 > y) != (y1 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+        return inside
+
+
+class _ArcBand(object):
+    r"""All points closer than w to the arc around (x, y) with radius r, from angle a0 to a1 > a0 (radians)"""
+
+    def __init__(self, x, y, r, a0, a1, w):
+        self.x, self.y, self.r, self.a0, self.a1, self.w = x, y, r, a0, a1, w
+        self.ends = [(x + r * cos(a), y + r * sin(a)) for a in (a0, a1)]
+        self.lines = []
+        self.circles = [(x, y, r + w)] + [end + (w,) for end in self.ends]
+        if r > w:
+            self.circles.append((x, y, r - w))
+
+    def boundingBox(self):
+        r = self.r + self.w
+        return self.x - r, self.y - r, self.x + r, self.y + r
+
+    def contains(self, x, y):
+        if any(hypot(x - ex, y - ey) < self.w - _EPSILON for ex, ey in self.ends):
+            return True
+        a = self.a0 + (atan2(y - self.y, x - self.x) - self.a0) % (2 * pi)
+        return a < self.a1 and abs(hypot(x - self.x, y - self.y) - self.r) < self.w - _EPSILON
+
+
+def _padSides(pad):
+    r"""Get the sides ('F', 'B') on which the pad has copper or a mask opening"""
+    sides = set()
+    for layer in pad.layers:
+        side, _, name = layer.partition('.')
+        if name in ('Cu', 'Mask'):
+            sides.update(('F', 'B') if side == '*' else (side,))
+    return sides
+
+
+def _padShapes(pad, distance):
+    r"""Get the outline of a pad, grown by distance, as list of shapes in footprint coordinates"""
+    position, rotation = pad.getRealPosition(pad.at, pad.rotation)
+    x, y = position.x, position.y
+    hw, hh = pad.size.x / 2., pad.size.y / 2.
+
+    if pad.shape == Pad.SHAPE_CIRCLE:
+        return [_Disk(x, y, hw + distance)]
+    if pad.shape == Pad.SHAPE_OVAL:
+        return [_RoundRect(x, y, hw + distance, hh + distance, min(hw, hh) + distance, rotation)]
+    if pad.shape == Pad.SHAPE_ROUNDRECT:
+        return [_RoundRect(x, y, hw + distance, hh + distance, pad.getRoundRadius() + distance, rotation)]
+    if pad.shape != Pad.SHAPE_CUSTOM:
+        # trapezoids are handled by their bounding rectangle
+        return [_RoundRect(x, y, hw + distance, hh + distance, distance, rotation)]
+
+    if pad.anchor_shape == Pad.ANCHOR_CIRCLE:
+        shapes = [_Disk(x, y, hw + distance)]
+    else:
+        shapes = [_RoundRect(x, y, hw + distance, hh + distance, distance, rotation)]
+
+    # the primitives are given relative to the pad
+    phi = radians(rotation)
+    a, b, c, d = cos(phi), sin(phi), -sin(phi), cos(phi)
+
+    def toFootprint(px, py):
+        return (x + a * px + b * py, y + c * px + d * py)
+
+    for primitive in (node for p in pad.primitives for node in p.iter_serialize()):
+        w = (DEFAULT_WIDTH_POLYGON_PAD if primitive.width is None else primitive.width) / 2. + distance
+        if isinstance(primitive, Polygon):
+            points = [toFootprint(px, py)
+                      for px, py in primitive.nodes.getTransformedPoints(primitive.getTransformation())]
+            shapes.append(_PolygonArea(points))
+            if w > 0:
+                shapes.extend(_Capsule(*(points[i - 1] + points[i] + (w,))) for i in range(len(points)))
+        elif isinstance(primitive, Line):
+            start = primitive.getRealPosition(primitive.start_pos)
+            end = primitive.getRealPosition(primitive.end_pos)
+            shapes.append(_Capsule(*(toFootprint(start.x, start.y) + toFootprint(end.x, end.y) + (w,))))
+        elif isinstance(primitive, Circle):
+            center = primitive.getRealPosition(primitive.center_pos)
+            shapes.append(_Disk(*(toFootprint(center.x, center.y) + (primitive.radius + w,))))
+        elif isinstance(primitive, Arc):
+            center = primitive.getRealPosition(primitive.center_pos)
+            start = primitive.getRealPosition(primitive.start_pos)
+            cx, cy = toFootprint(center.x, center.y)
+            sx, sy = toFootprint(start.x, start.y)
+            a0 = atan2(sy - cy, sx - cx)
+            a1 = a0 + radians(primitive.angle)
+            shapes.append(_ArcBand(cx, cy, hypot(sx - cx, sy - cy), min(a0, a1), max(a0, a1), w))
+
+    return shapes
+
+
+def _lineCrossings(x0, y0, dx, dy, shape):
+    r"""Get the parameters t where the line (x0 + t*dx, y0 + t*dy) may cross the outline of the shape"""
+    result = []
+    for ax, ay, bx, by in shape.lines:
+        nx, ny = ay - by, bx - ax
+        denominator = nx * dx + ny * dy
+        if denominator != 0:
+            result.append((nx * (ax - x0) + ny * (ay - y0)) / denominator)
+
+    length2 = dx * dx + dy * dy
+    for cx, cy, r in shape.circles:
+        ex, ey = x0 - cx, y0 - cy
+        p = (ex * dx + ey * dy) / length2
+        q = (ex * ex + ey * ey - r * r) / length2
+        discriminant = p * p - q
+        if discriminant >= 0:
+            result += [-p - sqrt(discriminant), -p + sqrt(discriminant)]
+    return result
+
+
+def _circleCrossings(x, y, radius, shape):
+    r"""Get the angles where the circle around (x, y) may cross the outline of the shape"""
+    result = []
+    for ax, ay, bx, by in shape.lines:
+        nx, ny = ay - by, bx - ax
+        length = hypot(nx, ny)
+        if length > 0:
+            k = (nx * (ax - x) + ny * (ay - y)) / (length * radius)
+            if -1 <= k <= 1:
+                phi = atan2(ny, nx)
+                result += [phi - acos(k), phi + acos(k)]
+
+    for cx, cy, r in shape.circles:
+        distance = hypot(cx - x, cy - y)
+        if distance > 0 and abs(radius - r) <= distance <= radius + r:
+            phi = atan2(cy - y, cx - x)
+            k = (radius * radius + distance * distance - r * r) / (2 * radius * distance)
+            result += [phi - acos(max(-1., min(1., k))), phi + acos(max(-1., min(1., k)))]
+    return result
+
+
+class SilkscreenClearance(object):
+    r"""Trim the silkscreen of a footprint, so it keeps a clearance to all pads
+
+    All pads of the footprint are grown by the clearance (plus half of the silkscreen line width), including the
+    radius of rounded pads and the primitives of custom pads, and put into a spatial index. Every silkscreen line,
+    arc and circle is then cut where it enters a grown pad, and the parts inside are removed. Silkscreen on the front
+    only keeps a clearance to pads on the front (copper or mask), silkscreen on the back to pads on the back.
+
+    The cut parts replace the original node in the tree. When the node was created by a specialized node (like the
+    lines of a RectLine), the specialized node is replaced by a plain node holding the nodes it created.
+
+    :param footprint: the footprint to process
+    :param clearance: clearance between the silkscreen lines and the pads
+    :param min_length: parts shorter than this are removed (default: 0.01)
+
+    :Example:
+
+    >>> from KicadModTree.util.silkscreen_clearance import SilkscreenClearance
+    >>> SilkscreenClearance(kicad_mod, clearance=0.2).apply()
+    """
+
+    def __init__(self, footprint, clearance, min_length=0.01):
+        self.footprint = footprint
+        self.clearance = clearance
+        self.min_length = min_length
+        self._indices = {}
+
+    def _index(self, pads, side, distance):
+        key = (side, distance)
+        if key not in self._indices:
+            shapes = [shape for pad in pads if side in _padSides(pad) for shape in _padShapes(pad, distance)]
+            self._indices[key] = RTree(shape.boundingBox() + (shape,) for shape in shapes)
+        return self._indices[key]
+
+    def _clipLine(self, node, index):
+        start = node.getRealPosition(node.start_pos)
+        end = node.getRealPosition(node.end_pos)
+        x0, y0, dx, dy = start.x, start.y, end.x - start.x, end.y - start.y
+        length = hypot(dx, dy)
+        if length == 0:
+            return None
+
+        shapes = index.intersecting(min(start.x, end.x), min(start.y, end.y),
+                                    max(start.x, end.x), max(start.y, end.y))
+        if not shapes:
+            return None
+
+        crossings = [t for shape in shapes for t in _lineCrossings(x0, y0, dx, dy, shape)]
+        parts = freeIntervals(0., 1., crossings,
+                              lambda t: any(shape.contains(x0 + t * dx, y0 + t * dy) for shape in shapes))
+        if parts is None:
+            return None
+
+        return [((x0 + t0 * dx, y0 + t0 * dy), (x0 + t1 * dx, y0 + t1 * dy), None)
+                for t0, t1 in parts if (t1 - t0) * length >= self.min_length]
+
+    def _clipArc(self, x, y, radius, a0, a1, index):
+        r"""Get the parts of the arc from a0 to a1 > a0 outside of the pads, or None if it does not touch a pad"""
+        if radius <= 0:
+            return None
+
+        shapes = index.intersecting(x - radius, y - radius, x + radius, y + radius)
+        if not shapes:
+            return None
+
+        crossings = [a0 + (a - a0) % (2 * pi) for shape in shapes for a in _circleCrossings(x, y, radius, shape)]
+        parts = freeIntervals(a0, a1, crossings,
+                              lambda a: any(shape.contains(x + radius * cos(a), y + radius * sin(a))
+                                            for shape in shapes))
+        if parts is None:
+            return None
+
+        return [(b0, b1) for b0, b1 in parts if (b1 - b0) * radius >= self.min_length]
+
+    def _arcParts(self, x, y, radius, parts, clockwise=False):
+        result = []
+        for a0, a1 in (reversed(parts) if clockwise else parts):
+            start = a1 if clockwise else a0
+            result.append(((x, y), (x + radius * cos(start), y + radius * sin(start)),
+                           degrees(a0 - a1 if clockwise else a1 - a0)))
+        return result
+
+    def _clipCircle(self, node, index):
+        center = node.getRealPosition(node.center_pos)
+        parts = self._clipArc(center.x, center.y, node.radius, -pi, pi, index)
+        if parts is None:
+            return None
+
+        parts = joinCircleIntervals(parts, -pi, pi)
+        return self._arcParts(center.x, center.y, node.radius, parts)
+
+    def _clipArcNode(self, node, index):
+        center = node.getRealPosition(node.center_pos)
+        start = node.getRealPosition(node.start_pos)
+        radius = hypot(start.x - center.x, start.y - center.y)
+        a0 = atan2(start.y - center.y, start.x - center.x)
+        a1 = a0 + radians(node.angle)
+
+        parts = self._clipArc(center.x, center.y, radius, min(a0, a1), max(a0, a1), index)
+        if parts is None:
+            return None
+        return self._arcParts(center.x, center.y, radius, parts, clockwise=node.angle < 0)
+
+    def _walk(self):
+        r"""Get all nodes with the specialized node which created them (or None), and the virtual childs"""
+        nodes = []
+        virtual_childs = {}
+
+        stack = [(self.footprint, None)]
+        while stack:
+            node, owner = stack.pop()
+            nodes.append((node, owner))
+
+            virtual = list(node.getVirtualChilds())
+            if virtual:
+                virtual_childs[id(node)] = virtual
+            stack.extend((child, owner) for child in node.getNormalChilds())
+            stack.extend((child, node if owner is None else owner) for child in virtual)
+
+        return nodes, virtual_childs
+
+    def apply(self):
+        r"""Trim the silkscreen of the footprint
+
+        :return: number of silkscreen nodes which were trimmed
+        """
+        nodes, virtual_childs = self._walk()
+        pads = [node for node, owner in nodes if isinstance(node, Pad)]
+
+        changes = []
+        for node, owner in nodes:
+            side = SILKSCREEN_LAYERS.get(getattr(node, 'layer', None))
+            if side is None or not isinstance(node, (Line, Arc, Circle)):
+                continue
+
+            width = DEFAULT_LAYER_WIDTH.get(node.layer, DEFAULT_WIDTH) if node.width is None else node.width
+            index = self._index(pads, side, self.clearance + width / 2.)
+            if isinstance(node, Line):
+                parts = self._clipLine(node, index)
+            elif isinstance(node, Circle):
+                parts = self._clipCircle(node, index)
+            else:
+                parts = self._clipArcNode(node, index)
+
+            if parts is not None:
+                changes.append((node, owner, parts))
+
+        # nodes created by specialized nodes cannot be replaced, their owner is frozen into a plain node first
+        frozen = set()
+        for node, owner, parts in changes:
+            if owner is not None and id(owner) not in frozen:
+                frozen.add(id(owner))
+                owner.getParent().replace(owner, [_freeze(owner, virtual_childs)])
+
+        for node, owner, parts in changes:
+            parent = node.getParent()
+            parent.replace(node, [_createNode(node, parent.getTransformation(), part) for part in parts])
+
+        return len(changes)
+
+
+class _FrozenNode(Node):
+    r"""Plain node which keeps the transformation of the specialized node it replaces"""
+
+    def __init__(self, transformation):
+        Node.__init__(self)
+        self._local_transformation = transformation
+
+    def _getLocalTransformation(self):
+        return self._local_transformation
+
+
+def _freeze(node, virtual_childs, nested=False):
+    r"""Create a plain node holding the normal and virtual childs of a node, virtual childs are frozen as well"""
+    frozen = _FrozenNode(node._getLocalTransformation())
+
+    normal = list(node.getNormalChilds())
+    for i, child in enumerate(normal + virtual_childs.get(id(node), [])):
+        child._parent = None
+        if id(child) in virtual_childs and (nested or i >= len(normal)):
+            child = _freeze(child, virtual_childs, nested=True)
+        frozen.append(child)
+
+    return frozen
+
+
+def _createNode(node, transformation, part):
+    r"""Create a line (angle is None) or arc from a part given in footprint coordinates, for a parent node"""
+    a, b, c, d, tx, ty, r = transformation
+    determinant = a * d - b * c
+
+    def toLocal(point):
+        x, y = point[0] - tx, point[1] - ty
+        return [(d * x - b * y) / determinant, (a * y - c * x) / determinant]
+
+    p0, p1, angle = part
+    if angle is None:
+        return Line(start=toLocal(p0), end=toLocal(p1), layer=node.layer, width=node.width)
+    return Arc(center=toLocal(p0), start=toLocal(p1), angle=angle if determinant > 0 else -angle,
+               layer=node.layer, width=node.width)
@@ -0,0 +1,157 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import heapq
+from math import ceil, cos, hypot, radians, sin, sqrt
+
+
+def boundingBox(points):
+    r"""Get the bounding box ``(min_x, min_y, max_x, max_y)`` of a list of (x, y) points"""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def rotatedBoundingBox(points, x, y, rotation):
+    r"""Get the bounding box of points given relative to an element at (x, y) with rotation, like a pad
+
+    :param rotation: rotation of the element in degree, as used by KiCad
+    """
+    a, b = cos(radians(rotation)), sin(radians(rotation))
+    return boundingBox([(x + a * px + b * py, y - b * px + a * py) for px, py in points])
+
+
+def _distance(box, x, y):
+    r"""Distance of the point to the box, 0 if the point is inside"""
+    return hypot(max(box[0] - x, 0, x - box[2]), max(box[1] - y, 0, y - box[3]))
+
+
+class RTree(object):
+    r"""Static R-tree over axis aligned bounding boxes
+
+    The tree is bulk loaded with the sort-tile-recursive algorithm, which packs the boxes into full nodes. Building
+    it takes O(n log n), a window or nearest neighbour query O(log n + k). The tree cannot be changed after it is
+    built, a changed set of boxes needs a new tree.
+
+    :param entries:
+        iterable of ``(min_x, min_y, max_x, max_y, item)``
+    :param max_entries:
+        number of childs of every node (default: 8)
+
+    :Example:
+
+    >>> from KicadModTree.util.spatial_index import RTree
+    >>> tree = RTree([(0, 0, 1, 1, 'a'), (5, 5, 6, 6, 'b')])
+    >>> tree.intersecting(0.5, 0.5, 2, 2)
+    ['a']
+    >>> tree.nearest(4, 4)
+    ['b']
+    """
+
+    def __init__(self, entries, max_entries=8):
+        self.max_entries = max(int(max_entries), 2)
+
+        # leafs are (min_x, min_y, max_x, max_y, index), the index keeps the order in which the boxes were given
+        self._items = []
+        self._boxes = []
+        for min_x, min_y, max_x, max_y, item in entries:
+            self._boxes.append((min(min_x, max_x), min(min_y, max_y), max(min_x, max_x), max(min_y, max_y),
+                                len(self._items)))
+            self._items.append(item)
+        level = self._boxes
+
+        # every level above the leafs holds nodes (min_x, min_y, max_x, max_y, childs)
+        self._height = 0
+        while len(level) > self.max_entries:
+            level = self._pack(level)
+            self._height += 1
+        self._root = level
+
+    def __len__(self):
+        return len(self._items)
+
+    def _pack(self, boxes):
+        per_slice = self.max_entries * int(ceil(sqrt(ceil(len(boxes) / float(self.max_entries)))))
+
+        nodes = []
+        boxes = sorted(boxes, key=lambda b: b[0] + b[2])
+        for i in range(0, len(boxes), per_slice):
+            tile = sorted(boxes[i:i + per_slice], key=lambda b: b[1] + b[3])
+            for j in range(0, len(tile), self.max_entries):
+                childs = tile[j:j + self.max_entries]
+                nodes.append((min(b[0] for b in childs), min(b[1] for b in childs),
+                              max(b[2] for b in childs), max(b[3] for b in childs), childs))
+        return nodes
+
+    def _search(self, min_x, min_y, max_x, max_y):
+        r"""Get the indices of all boxes intersecting the window, in no particular order"""
+        result = []
+        stack = [(self._root, self._height)]
+        while stack:
+            childs, height = stack.pop()
+            for b in childs:
+                if b[0] <= max_x and b[2] >= min_x and b[1] <= max_y and b[3] >= min_y:
+                    if height:
+                        stack.append((b[4], height - 1))
+                    else:
+                        result.append(b[4])
+        return result
+
+    def intersecting(self, min_x, min_y, max_x, max_y):
+        r"""Get the items whose box intersects the window (touching counts), in the order they were given"""
+        return [self._items[i] for i in sorted(self._search(min_x, min_y, max_x, max_y))]
+
+    def nearest(self, x, y, count=1, max_distance=None):
+        r"""Get the items whose box is closest to the point, the closest first
+
+        :param count: number of items to get (default: 1)
+        :param max_distance: only items whose box is not further away than this (default: None, no limit)
+
+        :return: list of up to count items, items at the same distance are in the order they were given
+        """
+        result = []
+        # entries are (distance, 0, tie breaker, height, childs) for nodes and (distance, 1, index) for leafs, so
+        # nodes are expanded before the leafs at the same distance are taken, which keeps leafs in the given order
+        heap = [(0., 0, 0, self._height, self._root)]
+        counter = 0
+        while heap and len(result) < count:
+            entry = heapq.heappop(heap)
+            if max_distance is not None and entry[0] > max_distance:
+                break
+
+            if entry[1]:
+                result.append(self._items[entry[2]])
+                continue
+
+            height = entry[3]
+            for b in entry[4]:
+                if height:
+                    counter += 1
+                    heapq.heappush(heap, (_distance(b, x, y), 0, counter, height - 1, b[4]))
+                else:
+                    heapq.heappush(heap, (_distance(b, x, y), 1, b[4]))
+        return result
+
+    def overlappingPairs(self):
+        r"""Get all pairs of items whose boxes intersect (touching counts)
+
+        :return: list of ``(item_a, item_b)``, where item_a was given before item_b, in the order they were given
+        """
+        result = []
+        for box in self._boxes:
+            for other in sorted(self._search(*box[:4])):
+                if other > box[4]:
+                    result.append((self._items[box[4]], self._items[other]))
+        return result
@@ -0,0 +1,161 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import sys
+import os
+import io
+import hashlib
+import marshal
+import pickle
+import tempfile
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# the libyaml based loader is a lot faster, and builds the same documents
+if yaml is not None:
+    SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# cache of parsed documents, one entry per yaml file which is replaced when the file changes
+_use_cache = False
+_DEFAULT_CACHE_DIRECTORY = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+    'kicad-footprint-generator', 'yaml')
+_cache_directory = _DEFAULT_CACHE_DIRECTORY
+
+# marshal is faster, but does not support all types a yaml document can contain (like dates)
+_FORMAT_MARSHAL = b'M'
+_FORMAT_PICKLE = b'P'
+
+
+def useYamlCache(enabled=True, directory=None):
+    r"""Enable or disable the cache of parsed yaml documents used by loadYamlFile
+
+    The cache is disabled by default. It holds one entry per yaml file, which is replaced when the file changes.
+
+    :param enabled: ``True`` to cache parsed documents, ``False`` to always parse the yaml files
+    :param directory: directory of the cache files (default: ``~/.cache/kicad-footprint-generator/yaml``)
+    """
+    global _use_cache, _cache_directory
+    _use_cache = bool(enabled)
+    _cache_directory = directory if directory is not None else _DEFAULT_CACHE_DIRECTORY
+
+
+def isYamlCache():
+    r"""Check if loadYamlFile caches parsed documents
+
+    :return: ``True`` if parsed documents are cached
+    """
+    return _use_cache
+
+
+def loadYaml(stream):
+    r"""Parse a yaml document the same way as ``yaml.safe_load``, but faster
+
+    The libyaml loader is used when available. Use loadYamlFile to parse a file given by its path.
+
+    :param stream:
+        open file or string containing the yaml document
+
+    :return: the parsed document
+
+    :Example:
+
+    >>> from KicadModTree.util.yaml_util import loadYaml
+    >>> with open('size_definitions/soic.yaml', 'r') as stream:
+    ...     cmd_file = loadYaml(stream)
+    """
+
+    if yaml is None:
+        raise ImportError("pyyaml not available!")
+
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def loadYamlFile(filename):
+    r"""Parse the yaml document in a file, like loadYaml
+
+    If enabled by useYamlCache, the parsed document is also stored in a cache, which is used as long as the
+    modification time and size of the file stay the same. The returned document is always a new object, so it can
+    be modified by the caller.
+
+    :param filename:
+        path of the yaml file
+
+    :return: the parsed document
+
+    :Example:
+
+    >>> from KicadModTree.util.yaml_util import loadYamlFile
+    >>> cmd_file = loadYamlFile('size_definitions/soic.yaml')
+    """
+
+    if yaml is None:
+        raise ImportError("pyyaml not available!")
+
+    with io.open(filename, 'rb') as stream:
+        if not _use_cache:
+            return loadYaml(stream)
+
+        cache_file, stamp = _getCacheEntry(filename, stream)
+        try:
+            with io.open(cache_file, 'rb') as f:
+                data = f.read()
+            header, data = data.split(b'\n', 1)
+            if header == stamp:
+                if data[:1] == _FORMAT_MARSHAL:
+                    return marshal.loads(data[1:])
+                elif data[:1] == _FORMAT_PICKLE:
+                    return pickle.loads(data[1:])
+        except Exception:
+            pass  # missing, outdated or unreadable cache entry
+
+        document = loadYaml(stream)
+
+    _storeCacheEntry(cache_file, stamp, document)
+    return document
+
+
+def _getCacheEntry(filename, stream):
+    r"""Get the cache file of a yaml file, and the stamp which has to match for the entry to be valid"""
+    path = os.path.realpath(filename)
+    stat = os.fstat(stream.fileno())
+
+    cache_file = os.path.join(_cache_directory, hashlib.sha1(path.encode('utf-8')).hexdigest())
+    stamp = repr((path, stat.st_mtime, stat.st_size, yaml.__version__, SafeLoader.__name__, sys.version_info[:2]))
+    return cache_file, stamp.encode('utf-8')
+
+
+def _storeCacheEntry(cache_file, stamp, document):
+    try:
+        data = _FORMAT_MARSHAL + marshal.dumps(document)
+    except ValueError:
+        data = _FORMAT_PICKLE + pickle.dumps(document, pickle.HIGHEST_PROTOCOL)
+
+    # the cache is only an optimization, so problems writing it are ignored
+    tmp_filename = None
+    try:
+        if not os.path.isdir(_cache_directory):
+            os.makedirs(_cache_directory)
+        fd, tmp_filename = tempfile.mkstemp(dir=_cache_directory)
+        with io.open(fd, 'wb') as f:
+            f.write(stamp + b'\n' + data)
+        # atomic replacement, so concurrent readers never see a partially written file
+        getattr(os, 'replace', os.rename)(tmp_filename, cache_file)
+    except (IOError, OSError):
+        if tmp_filename is not None and os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Compare the Vector2D operators with the previous, dict based implementation
+
+Timings depend on the machine and its load, so this is not part of the unit tests. Run it from the repository root:
+
+    python benchmarks/vector_benchmark.py
+"""
+
+import os
+import sys
+import timeit
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from KicadModTree.Vector import Vector2D  # NOQA
+
+
+class DictVector2D(object):
+    # reference implementation with the previous, dict based operators
+
+    def __init__(self, coordinates=None, y=None):
+        if coordinates is None:
+            coordinates = {}
+        elif type(coordinates) in [int, float]:
+            coordinates = [coordinates, y]
+        elif isinstance(coordinates, DictVector2D):
+            coordinates = {'x': coordinates.x, 'y': coordinates.y}
+
+        if type(coordinates) is dict:
+            self.x = float(coordinates.get('x', 0.))
+            self.y = float(coordinates.get('y', 0.))
+            return
+
+        self.x = float(coordinates[0])
+        self.y = float(coordinates[1])
+
+    @staticmethod
+    def _parse(value):
+        if isinstance(value, DictVector2D):
+            return value
+        elif type(value) in [int, float]:
+            return DictVector2D([value, value])
+        return DictVector2D(value)
+
+    def __add__(self, value):
+        other = DictVector2D._parse(value)
+        return DictVector2D({'x': self.x + other.x, 'y': self.y + other.y})
+
+    def __mul__(self, value):
+        other = DictVector2D._parse(value)
+        return DictVector2D({'x': self.x * other.x, 'y': self.y * other.y})
+
+
+def workload(cls):
+    offset = cls(0.5, 0.25)
+
+    def run():
+        p = cls(1.27, 2.54)
+        for i in range(100):
+            p = (p + offset) * 1.
+            p = p + [0.1, 0.1]
+        return p
+
+    return run
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the Vector2D operators.')
+    parser.add_argument('-n', '--number', type=int, default=200, help='runs of the workload per measurement')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of measurements, the fastest is shown')
+    args = parser.parse_args()
+
+    result = workload(Vector2D)()
+    reference = workload(DictVector2D)()
+    if abs(result.x - reference.x) > 1e-9 or abs(result.y - reference.y) > 1e-9:
+        print("the results differ: {} != ({}, {})".format(result, reference.x, reference.y))
+        sys.exit(1)
+
+    for name, cls in [('Vector2D', Vector2D), ('dict based', DictVector2D)]:
+        best = min(timeit.repeat(workload(cls), number=args.number, repeat=args.repeat))
+        print("{:<12}{:8.2f} us per workload".format(name, best / args.number * 1e6))
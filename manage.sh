@@ -43,6 +43,12 @@ py_test_coverage() {
     PYTHONPATH=`pwd` python -m nose2 -C --coverage "$KICADMODTREE_DIR" --coverage-report term-missing -s "$KICADMODTREE_DIR/tests"
 }
 
+benchmarks() {
+    echo ''
+    echo '[!] Running benchmarks'
+    python "$BASE_DIR/benchmarks/vector_benchmark.py"
+}
+
 tests() {
     set -e
     unit_tests
@@ -65,6 +71,7 @@ Commands
     unit_tests           - Run unit tests
     py_test_coverage     - Unit test coverage
     tests                - Run all tests
+    benchmarks           - Run the performance benchmarks (not part of the tests)
     update_packages      - Check & update production dependency changes
     update_dev_packages  - Check & update development and production dependency changes
 "
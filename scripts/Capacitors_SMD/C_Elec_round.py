@@ -9,9 +9,12 @@ import math
 sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load parent path of KicadModTree
 from KicadModTree import *  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
+from KicadModTree.util.yaml_util import loadYaml
 
 sys.path.append(os.path.join(sys.path[0], "..", "tools"))  # load parent path of tools
 from ipc_pad_size_calculators import *
+from footprint_configuration import loadConfiguration
+from ipc_definitions import loadIpcDefinitions
 
 def create_footprint(name, configuration, **kwargs):
     kicad_mod = Footprint(name)
@@ -259,32 +262,15 @@ if __name__ == "__main__":
     # TODO: allow writing into sub file
     
     args = parser.parse_args()
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    configuration = loadConfiguration(args.global_config, args.series_config,
+                                      {'ipc_density': args.ipc_density, 'force_rectangle_pads': args.force_rectangle_pads})
     
-    ipc_doc = args.ipc_definition
-    with open(ipc_doc, 'r') as ipc_stream:
-        try:
-            ipc_defintions = yaml.safe_load(ipc_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    configuration['ipc_density'] = args.ipc_density
-    configuration['force_rectangle_pads'] = args.force_rectangle_pads
+    ipc_defintions = loadIpcDefinitions(args.ipc_definition)
     
     for filepath in args.files:
         with open(filepath, 'r') as stream:
             try:
-                yaml_parsed = yaml.safe_load(stream)
+                yaml_parsed = loadYaml(stream)
                 for footprint in yaml_parsed:
                     print("generate {name}.kicad_mod".format(name=footprint))
                     create_footprint(footprint, configuration , **yaml_parsed.get(footprint))
@@ -23,6 +23,7 @@ import yaml
 from KicadModTree import *
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
 
 series = 'M20'
 series_long = 'Female Vertical Surface Mount Double Row 2.54mm (0.1 inch) Pitch PCB Connector'
@@ -189,19 +190,8 @@ if __name__ == "__main__":
     parser.add_argument('--kicad4_compatible', action='store_true', help='Create footprints kicad 4 compatible')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    configuration['kicad4_compatible'] = args.kicad4_compatible
+    configuration = loadConfiguration(args.global_config, args.series_config,
+                                      {'kicad4_compatible': args.kicad4_compatible})
 
     for pincount in pincount_range:
         generate_footprint(pincount, configuration)
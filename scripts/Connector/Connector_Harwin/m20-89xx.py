@@ -7,6 +7,7 @@ sys.path.append(os.path.join(sys.path[0], "..", "..", ".."))  # load parent path
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
 import argparse
 import yaml
 from KicadModTree import *
@@ -197,16 +198,6 @@ if __name__ == "__main__":
 	parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../conn_config_KLCv3.yaml')
 	args = parser.parse_args()
 
-	with open(args.global_config, 'r') as config_stream:
-		try:
-			configuration = yaml.safe_load(config_stream)
-		except yaml.YAMLError as exc:
-			print(exc)
-
-	with open(args.series_config, 'r') as config_stream:
-		try:
-			configuration.update(yaml.safe_load(config_stream))
-		except yaml.YAMLError as exc:
-			print(exc)
+	configuration = loadConfiguration(args.global_config, args.series_config)
 
 	gen_family(configuration)
\ No newline at end of file
@@ -14,6 +14,7 @@ from KicadModTree import *
 
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
 from footprint_keepout_area import addRectangularKeepout
 
 series = 'FH12'
@@ -234,16 +235,6 @@ if __name__ == "__main__":
     parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../conn_config_KLCv3.yaml')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    configuration = loadConfiguration(args.global_config, args.series_config)
     for pins_per_row in pins_per_row_range:
         generate_one_footprint(pins_per_row, configuration)
@@ -14,6 +14,7 @@ from KicadModTree import *
 
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
 
 series = 'DF11'
 series_long = 'DF11 through hole'
@@ -216,19 +217,8 @@ if __name__ == "__main__":
     parser.add_argument('--kicad4_compatible', action='store_true', help='Create footprints kicad 4 compatible')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    configuration['kicad4_compatible'] = args.kicad4_compatible
+    configuration = loadConfiguration(args.global_config, args.series_config,
+                                      {'kicad4_compatible': args.kicad4_compatible})
 
     for pins_per_row in pins_per_row_range:
         generate_one_footprint(pins_per_row, configuration)
@@ -11,10 +11,12 @@ import argparse
 import yaml
 from helpers import *
 from KicadModTree import *
+from KicadModTree.util.yaml_util import loadYamlFile
 from math import sqrt
 
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
 
 def generate_one_footprint(idx, pincount, series_definition, configuration, group_definition):
     if 'mpn_param_1' in series_definition:
@@ -382,7 +384,7 @@ def generate_one_footprint(idx, pincount, series_definition, configuration, grou
     file_handler = KicadFileHandler(kicad_mod)
     file_handler.writeFile(filename)
 
-def generate_series(configuration, series_definition, id, group_definition):
+def generate_series(configuration, series_definition, id, group_definition, build_cache=None):
     idx = 0
     pinrange_def_type, pinrange_def = series_definition['pinrange']
     if pinrange_def_type == 'range':
@@ -394,7 +396,12 @@ def generate_series(configuration, series_definition, id, group_definition):
         return
 
     for pincount in pinrange:
-        generate_one_footprint(idx, pincount, series_definition, configuration, group_definition)
+        if build_cache is None:
+            generate_one_footprint(idx, pincount, series_definition, configuration, group_definition)
+        elif not build_cache.execute([id, pincount],
+                [configuration, series_definition, group_definition, idx, pincount],
+                generate_one_footprint, idx, pincount, series_definition, configuration, group_definition):
+            print("{:s} with {:d} pins is up to date".format(id, pincount))
         idx += 1
 
 if __name__ == "__main__":
@@ -404,29 +411,24 @@ if __name__ == "__main__":
     parser.add_argument('--global_config', type=str, nargs='?', help='the config file defining how the footprint will look like. (KLC)', default='../../tools/global_config_files/config_KLCv3.0.yaml')
     parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../conn_config_KLCv3.yaml')
     parser.add_argument('--kicad4_compatible', action='store_true', help='Create footprints kicad 4 compatible')
+    parser.add_argument('--cache', type=str, nargs='?', const=BuildCache.DEFAULT_FILENAME, help='skip footprints which did not change since the last run')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
+    build_cache = BuildCache(args.cache) if args.cache else None
+
+    configuration = loadConfiguration(args.global_config, args.series_config,
+                                      {'kicad4_compatible': args.kicad4_compatible})
 
-    with open(args.series_config, 'r') as config_stream:
+    for filepath in args.files:
         try:
-            configuration.update(yaml.safe_load(config_stream))
+            yaml_file = loadYamlFile(filepath)
         except yaml.YAMLError as exc:
             print(exc)
-    configuration['kicad4_compatible'] = args.kicad4_compatible
-
-    for filepath in args.files:
-        with open(filepath, 'r') as stream:
-            try:
-                yaml_file = yaml.safe_load(stream)
-            except yaml.YAMLError as exc:
-                print(exc)
         series_definitions = yaml_file['device_definition']
         for series_definition_id in series_definitions:
             generate_series(configuration,
                 series_definitions[series_definition_id], series_definition_id,
-                yaml_file['group_definitions'])
+                yaml_file['group_definitions'], build_cache)
+
+    if build_cache is not None:
+        build_cache.save()
@@ -20,6 +20,7 @@ from KicadModTree import *  # NOQA
 # from drawing_tools import *
 # from footprint_scripts_potentiometers import *
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
 
 lib_name_category = 'PCBEdge'
 
@@ -300,17 +301,7 @@ if __name__ == "__main__":
     parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../conn_config_KLCv3.yaml')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    configuration = loadConfiguration(args.global_config, args.series_config)
 
     for pol in [True, False]:
         for pincount in pinrange:
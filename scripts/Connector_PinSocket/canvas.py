@@ -36,8 +36,8 @@
 # NOTE:
 # The code for the the Keepout class is loosely based on code from drawing_tools.py
 # Currently oval and rectangular keepout zones are respected
-# for horizontal and vertical lines, only basic support (bounding box only) for diagonal lines.
-# Arcs and circles are not yet handled. On TODO: list.
+# for horizontal and vertical lines, arcs and circles, only basic support (bounding box only) for diagonal lines.
+# The keepouts are kept in a grid of buckets, so a line, arc or circle is only checked against the keepouts near it.
 # More testing needs to be done for edge cases, such as for lines inside
 # the bounding box but outside the keepout area proper.
 #
@@ -56,6 +56,7 @@ from KicadModTree import Point
 from KicadModTree.nodes.base import Line, Arc, Circle, Text, Pad
 from KicadModTree.nodes.specialized import RectFill
 from KicadModTree.util.kicad_util import formatFloat
+from KicadModTree.util.clip_util import freeIntervals, joinCircleIntervals
 
 class Layer:
 
@@ -244,9 +245,34 @@ class Layer:
             self.polyline_start = None
         return self
 
+    def _arc(self, center_x, center_y, radius, angle_start, angle, line_width):
+        # angle_start in radians, angle in degrees, as in Arc
+        start = [center_x + radius * math.cos(angle_start), center_y + radius * math.sin(angle_start)]
+        self.footprint.append(Arc(start=start, center=[center_x, center_y], angle=angle, layer=self.layer, width=line_width))
+
+    def _circle(self, radius, line_width):
+        if self.keepout != None:
+            arcs = self.keepout.processCircle(self.x, self.y, radius)
+            if arcs != False:
+                for a0, a1 in arcs:
+                    self._arc(self.x, self.y, radius, a0, math.degrees(a1 - a0), line_width)
+                return
+        self.footprint.append(Circle(center=[self.x, self.y], radius=radius, layer=self.layer, width=line_width))
+
     def arc(self, center_x, center_y, angle):
         arc = Arc(start=[self.x, self.y], center=[self.x + center_x, self.y + center_y], angle=angle, layer=self.layer, width=self.line_width)
-        self.footprint.append(arc)
+        arcs = False
+        if self.keepout != None:
+            angle_start = math.atan2(-center_y, -center_x)
+            angle_end = angle_start + math.radians(angle)
+            arcs = self.keepout.processArc(self.x + center_x, self.y + center_y, math.hypot(center_x, center_y),
+                                           min(angle_start, angle_end), max(angle_start, angle_end))
+        if arcs == False:
+            self.footprint.append(arc)
+        else:
+            for a0, a1 in arcs: # keep the direction of the arc
+                self._arc(self.x + center_x, self.y + center_y, math.hypot(center_x, center_y),
+                          a0 if angle > 0 else a1, math.copysign(math.degrees(a1 - a0), angle), self.line_width)
         end = arc._calulateEndPos()    
         self.x += center_x + end.y
         self.y += center_y + end.x
@@ -257,11 +283,11 @@ class Layer:
             line_width = radius / 3.0 + self.line_width / 2.0
             r = line_width / 2.0
             while r < radius:
-                self.footprint.append(Circle(center=[self.x, self.y], radius=r, layer=self.layer, width=line_width))        
+                self._circle(r, line_width)
                 r += line_width - self.line_width / 2.0
         else:
             line_width = round(min(self.line_width, radius / 2.0), 3)
-            self.footprint.append(Circle(center=[self.x, self.y], radius=radius, layer=self.layer, width=line_width))
+            self._circle(radius, line_width)
         return self
    
     def fillrect(self, w, h): #TODO: add origin handling
@@ -496,6 +522,41 @@ class _Keepout:
         x = round(x, 5); y = round(y, 5)
         return x >= self.x0 and x <= self.x1 and y >= self.y0 and y <= self.y1
 
+    # check if a point lies in the keepout, including its rounded corners
+    def contains(self, x, y):
+        if not self.pointIsInside(x, y):
+            return False
+        r = self.radius
+        if r > 0.0:
+            cx = self.x0 + r if x < self.x0 + r else (self.x1 - r if x > self.x1 - r else x)
+            cy = self.y0 + r if y < self.y0 + r else (self.y1 - r if y > self.y1 - r else y)
+            return (x - cx) ** 2 + (y - cy) ** 2 <= r * r + 1e-9
+        return True
+
+    # angles (radians) of the points where the circle around (x, y) may cross the outline of the keepout
+    def circleCrossings(self, x, y, radius):
+        angles = []
+        for edge in (self.x0, self.x1):
+            c = (edge - x) / radius
+            if -1.0 <= c <= 1.0:
+                a = math.acos(c)
+                angles += [a, -a]
+        for edge in (self.y0, self.y1):
+            s = (edge - y) / radius
+            if -1.0 <= s <= 1.0:
+                a = math.asin(s)
+                angles += [a, math.pi - a]
+        r = self.radius
+        if r > 0.0:
+            for cx in (self.x0 + r, self.x1 - r):
+                for cy in (self.y0 + r, self.y1 - r):
+                    d = math.hypot(cx - x, cy - y)
+                    if d > 0.0 and abs(radius - r) <= d <= radius + r:
+                        a = math.atan2(cy - y, cx - x)
+                        da = math.acos(max(-1.0, min(1.0, (radius * radius + d * d - r * r) / (2.0 * radius * d))))
+                        angles += [a - da, a + da]
+        return angles
+
     def _feq(self, a, b):
         return abs(a-b) < 0.0001
     
@@ -628,15 +689,49 @@ class _Keepout:
                                                              r=formatFloat(self.radius))
 
 
+class _KeepoutGrid:
+
+    # uniform grid of buckets holding the indices of the keepouts overlapping each cell
+    def __init__(self, keepouts):
+        self.count = len(keepouts)
+        sizes = sorted(max(k.x1 - k.x0, k.y1 - k.y0) for k in keepouts)
+        self.cell = max(sizes[len(sizes) // 2], 0.1) if sizes else 1.0
+        self.buckets = {}
+        for i, k in enumerate(keepouts):
+            for cell in self._cells(k.x0, k.y0, k.x1, k.y1):
+                self.buckets.setdefault(cell, []).append(i)
+
+    def _range(self, v0, v1):
+        return range(int(math.floor(v0 / self.cell)), int(math.floor(v1 / self.cell)) + 1)
+
+    def _cells(self, x0, y0, x1, y1):
+        return [(ix, iy) for ix in self._range(x0, x1) for iy in self._range(y0, y1)]
+
+    # indices of the keepouts which may overlap the rectangle, in the order they were added
+    def query(self, x0, y0, x1, y1):
+        xs = self._range(x0, x1)
+        ys = self._range(y0, y1)
+        if len(xs) * len(ys) > max(len(self.buckets), 1):
+            return range(self.count)
+        found = set()
+        for ix in xs:
+            for iy in ys:
+                found.update(self.buckets.get((ix, iy), ()))
+        return sorted(found)
+
+
 class Keepout():
 
     DEBUG = 0
+    # margin around the queried area, covers the rounding of the keepout coordinates
+    _QUERY_MARGIN = 0.0001
     _NUM_RECTS = 5
 
     def __init__(self, layer):
         self.layer = layer
         self.keepouts = []
         self.min_length = 0.01
+        self._grid = None
         layer.keepout = self
 
     # float-variant of range()
@@ -658,6 +753,13 @@ class Keepout():
     def _add(self, x0, y0, x1, y1, radius=0.0):
         self.keepouts.append(_Keepout(self._align(x0), self._align(y0), self._align(x1), self._align(y1), radius))
 
+    # keepouts which may overlap the rectangle, in the order they were added
+    def _near(self, x0, y0, x1, y1):
+        if self._grid is None or self._grid.count != len(self.keepouts):
+            self._grid = _KeepoutGrid(self.keepouts)
+        m = self._QUERY_MARGIN
+        return [self.keepouts[i] for i in self._grid.query(x0 - m, y0 - m, x1 + m, y1 + m)]
+
     # add keepout area for rectangle
     def addRect(self, x, y, w, h, offset=None):
         if offset == None:
@@ -713,10 +815,11 @@ class Keepout():
         if self.DEBUG & 2:
             print("S", line)
 
-        changes = len(self.keepouts) > 0
+        keepouts = self._near(line.x0, line.y0, line.x1, line.y1)
+        changes = len(keepouts) > 0
         while changes != False:
             changes = False
-            for keepout in self.keepouts:
+            for keepout in keepouts:
                 if keepout.VlineIntersects(line.x0) if vertical else keepout.HlineIntersects(line.y0):
                     for i in reversed(range(0, len(segments))):
                         segment = segments[i]
@@ -748,7 +851,7 @@ class Keepout():
         # TODO: update to handle keepout area proper, now only respects the bounding box.
         
         segments=[[line.x0, line.y0, line.x1, line.y1]]
-        for keepout in self.keepouts:
+        for keepout in self._near(line.x0, line.y0, line.x1, line.y1):
             for i in reversed(range(0, len(segments))):
                 segment = segments[i]
                 changes = keepout.lineIntersects(_Line(segment[0], segment[1], segment[2], segment[3]))
@@ -759,6 +862,32 @@ class Keepout():
                         segments.append([changes[1][0], changes[1][1], segment[2], segment[3]])
         return segments       
 
+    # get the parts of an arc around (x, y) outside of the keepouts as list of angle intervals (radians),
+    # angle_start < angle_end. returns False if the arc does not touch any keepout
+    def processArc(self, x, y, radius, angle_start, angle_end):
+        keepouts = self._near(x - radius, y - radius, x + radius, y + radius)
+        if radius <= 0.0 or len(keepouts) == 0:
+            return False
+
+        crossings = [angle_start + (a - angle_start) % (2.0 * math.pi)
+                     for keepout in keepouts for a in keepout.circleCrossings(x, y, radius)]
+
+        # between two crossings the arc is either completely inside or outside of the keepouts
+        arcs = freeIntervals(angle_start, angle_end, crossings,
+                             lambda a: any(keepout.contains(x + radius * math.cos(a), y + radius * math.sin(a))
+                                           for keepout in keepouts))
+        if arcs is None:
+            return False
+        return [arc for arc in arcs if (arc[1] - arc[0]) * radius >= self.min_length]
+
+    # get the parts of a circle around (x, y) outside of the keepouts, see processArc
+    def processCircle(self, x, y, radius):
+        arcs = self.processArc(x, y, radius, -math.pi, math.pi)
+        if arcs != False:
+            # join the arcs crossing the start angle
+            arcs = joinCircleIntervals(arcs, -math.pi, math.pi)
+        return arcs
+
     # draws the keepouts
     def debug_draw(self):
         if self.DEBUG & 1:
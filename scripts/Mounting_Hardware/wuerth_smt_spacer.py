@@ -12,6 +12,7 @@ from KicadModTree import *
 
 sys.path.append(os.path.join(sys.path[0], "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
 
 def roundToBase(value, base):
     return round(value/base) * base
@@ -124,11 +125,7 @@ if __name__ == "__main__":
     parser.add_argument('--params', type=str, nargs='?', help='the part definition file', default='./wuerth_smt_spacer.yaml')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
+    configuration = loadConfiguration(args.global_config)
 
     with open(args.params, 'r') as params_stream:
         try:
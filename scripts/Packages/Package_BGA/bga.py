@@ -12,6 +12,7 @@ sys.path.append(os.path.join(sys.path[0], "..", "..", ".."))
 from KicadModTree import *  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
+from footprint_configuration import loadConfiguration
 
 from KicadModTree import *
 import itertools
@@ -206,21 +207,10 @@ if __name__ == '__main__':
 
     args = parser.parse_args()
     
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    # with open(args.series_config, 'r') as config_stream:
-        # try:
-            # configuration.update(yaml.safe_load(config_stream))
-        # except yaml.YAMLError as exc:
-            # print(exc)
-    
     # generate dict of A, B .. Y, Z, AA, AB .. CY less easily-confused letters
     rowNamesList = [x for x in ascii_uppercase if x not in ["I", "O", "Q", "S", "X", "Z"]]
-    configuration.update({'row_names': list(itertools.islice(rowNameGenerator(rowNamesList), 80))})
+    configuration = loadConfiguration(args.global_config,
+                                      overrides={'row_names': list(itertools.islice(rowNameGenerator(rowNamesList), 80))})
 
     for filepath in args.files:
         with open(filepath, 'r') as command_stream:
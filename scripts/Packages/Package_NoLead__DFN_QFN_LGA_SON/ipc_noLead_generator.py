@@ -12,8 +12,11 @@ sys.path.append(os.path.join(sys.path[0], "..", "..", ".."))  # load parent path
 
 from KicadModTree import *  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
+from KicadModTree.util.yaml_util import loadYamlFile
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
+from ipc_definitions import loadIpcDefinitions
 from ipc_pad_size_calculators import *
 from quad_dual_pad_border import add_dual_or_quad_pad_border
 
@@ -39,21 +42,16 @@ def roundToBase(value, base):
 class NoLead():
     def __init__(self, configuration):
         self.configuration = configuration
-        with open(ipc_doc_file, 'r') as ipc_stream:
-            try:
-                self.ipc_defintions = yaml.safe_load(ipc_stream)
+        self.ipc_defintions = loadIpcDefinitions(ipc_doc_file)
 
-                self.configuration['min_ep_to_pad_clearance'] = 0.2
+        self.configuration['min_ep_to_pad_clearance'] = 0.2
 
-                #ToDo: find a settings file that can contain these.
-                self.configuration['paste_radius_ratio'] = 0.25
-                self.configuration['paste_maximum_radius'] = 0.25
+        #ToDo: find a settings file that can contain these.
+        self.configuration['paste_radius_ratio'] = 0.25
+        self.configuration['paste_maximum_radius'] = 0.25
 
-                if 'ipc_generic_rules' in self.ipc_defintions:
-                    self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
-
-            except yaml.YAMLError as exc:
-                print(exc)
+        if 'ipc_generic_rules' in self.ipc_defintions:
+            self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
 
     def calcPadDetails(self, device_dimensions, EP_size, ipc_data, ipc_round_base):
         # Zmax = Lmin + 2JT + √(CL^2 + F^2 + P^2)
@@ -535,8 +533,11 @@ if __name__ == "__main__":
     parser.add_argument('--force_rectangle_pads', action='store_true', help='Force the generation of rectangle pads instead of rounded rectangle')
     parser.add_argument('--kicad4_compatible', action='store_true', help='Create footprints kicad 4 compatible')
     parser.add_argument('-v', '--verbose', action='count', help='set debug level')
+    parser.add_argument('--cache', type=str, nargs='?', const=BuildCache.DEFAULT_FILENAME, help='skip footprints which did not change since the last run')
     args = parser.parse_args()
 
+    build_cache = BuildCache(args.cache) if args.cache else None
+
     if args.density == 'L':
         ipc_density = 'least'
     elif args.density == 'M':
@@ -547,31 +548,27 @@ if __name__ == "__main__":
 
     ipc_doc_file = args.ipc_doc
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
-
+    overrides = {'kicad4_compatible': args.kicad4_compatible}
     if args.force_rectangle_pads or args.kicad4_compatible:
-        configuration['round_rect_max_radius'] = None
-        configuration['round_rect_radius_ratio'] = 0
+        overrides['round_rect_max_radius'] = None
+        overrides['round_rect_radius_ratio'] = 0
 
-    configuration['kicad4_compatible'] = args.kicad4_compatible
+    configuration = loadConfiguration(args.global_config, args.series_config, overrides)
+    no_lead = NoLead(configuration)
 
     for filepath in args.files:
-        no_lead = NoLead(configuration)
 
-        with open(filepath, 'r') as command_stream:
-            try:
-                cmd_file = yaml.safe_load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+        try:
+            cmd_file = loadYamlFile(filepath)
+        except yaml.YAMLError as exc:
+            print(exc)
         for pkg in cmd_file:
-            no_lead.generateFootprint(cmd_file[pkg], pkg)
+            if build_cache is None:
+                no_lead.generateFootprint(cmd_file[pkg], pkg)
+            elif not build_cache.execute([os.path.abspath(filepath), pkg],
+                    [configuration, no_lead.ipc_defintions, ipc_density, cmd_file[pkg]],
+                    no_lead.generateFootprint, cmd_file[pkg], pkg):
+                print("{} is up to date".format(pkg))
+
+    if build_cache is not None:
+        build_cache.save()
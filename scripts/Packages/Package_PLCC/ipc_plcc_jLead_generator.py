@@ -12,6 +12,8 @@ from KicadModTree import *  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
+from ipc_definitions import loadIpcDefinitions
 
 ipc_density = 'nominal'
 ipc_doc_file = '../ipc_definitions.yaml'
@@ -28,11 +30,7 @@ def params_inch_to_metric(device_params):
 class QFP():
     def __init__(self, configuration):
         self.configuration = configuration
-        with open(ipc_doc_file, 'r') as ipc_stream:
-            try:
-                self.ipc_defintions = yaml.safe_load(ipc_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+        self.ipc_defintions = loadIpcDefinitions(ipc_doc_file)
 
 
 
@@ -465,24 +463,15 @@ if __name__ == "__main__":
 
     ipc_doc_file = args.ipc_doc
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
-
+    overrides = {}
     if args.force_rectangle_pads:
-        configuration['round_rect_max_radius'] = None
-        configuration['round_rect_radius_ratio'] = 0
+        overrides['round_rect_max_radius'] = None
+        overrides['round_rect_radius_ratio'] = 0
+
+    configuration = loadConfiguration(args.global_config, args.series_config, overrides)
+    qfp = QFP(configuration)
 
     for filepath in args.files:
-        qfp = QFP(configuration)
 
         with open(filepath, 'r') as command_stream:
             try:
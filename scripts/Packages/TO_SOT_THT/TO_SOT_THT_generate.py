@@ -13,6 +13,7 @@ sys.path.append(os.path.join(sys.path[0],"..","..","..")) # load kicad_mod path
 
 from KicadModTree import *  # NOQA
 from tools import *
+from keepouts import KeepoutIndex
 from TO_THT_packages import *
 
 
@@ -167,6 +168,8 @@ def makeVERT(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1,1,1], lptext="_
     #    kicad_modt.append(
     #        RectLine(start=[ko[0],ko[2]], end=[ko[1],ko[3]], layer='B.Fab', width=lw_fab))
 
+    # index the keepouts once, instead of for every line
+    keepouts = KeepoutIndex(keepouts)
     addHLineWithKeepout(kicad_modt, l_slkp, l_slkp + w_slkp, t_slkp, 'F.SilkS', lw_slk, keepouts)
     addHLineWithKeepout(kicad_modt, l_slkp, l_slkp + w_slkp, t_slkp + h_slkp, 'F.SilkS', lw_slk, keepouts)
     addVLineWithKeepout(kicad_modt, l_slkp, t_slkp, t_slkp + h_slkp, 'F.SilkS', lw_slk, keepouts)
@@ -391,6 +394,8 @@ def makeHOR(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1,1,1], lptext="_L
                          addpady - pck.additional_pin_pad_size[1] / 2 - slk_dist,
                          addpady + pck.additional_pin_pad_size[1] / 2 + slk_dist])
 
+    # index the keepouts once, instead of for every line
+    keepouts = KeepoutIndex(keepouts)
     addHLineWithKeepout(kicad_modt, l_slkp, l_slkp + w_slkp, t_slkp, 'F.SilkS', lw_slk, keepouts)
     if h_fabm > 0:
         addHLineWithKeepout(kicad_modt, l_slkp, l_slkp + w_slkp, t_slkp - h_slkm, 'F.SilkS', lw_slk, keepouts)
@@ -562,6 +567,8 @@ def makeVERTLS(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1,1,1], lptext=
     #                 end=[ko[1], ko[3]],
     #                 layer='F.CrtYd', width=0.01))
 
+    # index the keepouts once, instead of for every line
+    keepouts = KeepoutIndex(keepouts)
     addHDLineWithKeepout(kicad_modt, l_slkp, 3 * lw_slk, l_slkp + w_slkp, t_slkp, 'F.SilkS', lw_slk, keepouts)
     addHDLineWithKeepout(kicad_modt, l_slkp, 3 * lw_slk, l_slkp + w_slkp, t_slkp + h_slkp, 'F.SilkS', lw_slk, keepouts)
     addVDLineWithKeepout(kicad_modt, l_slkp, t_slkp, 3 * lw_slk, t_slkp + h_slkp, 'F.SilkS', lw_slk, keepouts)
@@ -762,6 +769,8 @@ def makeHORLS(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1,1,1], lptext="
                          addpady - pck.additional_pin_pad_size[1] / 2 - slk_dist,
                          addpady + pck.additional_pin_pad_size[1] / 2 + slk_dist])
 
+    # index the keepouts once, instead of for every line
+    keepouts = KeepoutIndex(keepouts)
     addHDLineWithKeepout(kicad_modt, l_slkp, 3 * lw_slk, l_slkp + w_slkp, t_slkp, 'F.SilkS', lw_slk, keepouts)
     if h_fabm > 0:
         addHDLineWithKeepout(kicad_modt, l_slkp, 3 * lw_slk, l_slkp + w_slkp, t_slkp - h_slkm, 'F.SilkS', lw_slk, keepouts)
@@ -934,6 +943,8 @@ def makeHORREV(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1 ,1,1], lptext
             keepouts=keepouts+addKeepoutRound(x,0,pck.pad[0]+2*slk_dist,pck.pad[1]+2*slk_dist)
         x = x + pck.rm
 
+    # index the keepouts once, instead of for every line
+    keepouts = KeepoutIndex(keepouts)
     addHLineWithKeepout(kicad_mod, l_slkp, l_slkp + w_slkp, t_slkp, 'F.SilkS', lw_slk, keepouts)
     addHLineWithKeepout(kicad_mod, l_slkp, l_slkp + w_slkp, t_slkp + h_slkp, 'F.SilkS', lw_slk, keepouts)
     addVLineWithKeepout(kicad_mod, l_slkp, t_slkp, t_slkp + h_slkp, 'F.SilkS', lw_slk, keepouts)
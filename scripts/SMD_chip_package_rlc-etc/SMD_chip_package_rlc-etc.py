@@ -12,6 +12,8 @@ from KicadModTree import *  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 sys.path.append(os.path.join(sys.path[0], "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
+from footprint_configuration import loadConfiguration
+from ipc_definitions import loadIpcDefinitions
 from ipc_pad_size_calculators import *
 from drawing_tools import nearestSilkPointOnOrthogonalLineSmallClerance
 
@@ -30,19 +32,9 @@ def merge_dicts(*dict_args):
     return result
 
 class TwoTerminalSMDchip():
-    def __init__(self, command_file, configuration):
+    def __init__(self, configuration):
         self.configuration = configuration
-        with open(command_file, 'r') as command_stream:
-            try:
-                self.footprint_group_definitions = yaml.safe_load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
-        ipc_doc = configuration['ipc_definition']
-        with open(ipc_doc, 'r') as ipc_stream:
-            try:
-                self.ipc_defintions = yaml.safe_load(ipc_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+        self.ipc_defintions = loadIpcDefinitions(configuration['ipc_definition'])
 
     def calcPadDetails(self, device_dimensions, ipc_data, ipc_round_base, footprint_group_data):
         # Zmax = Lmin + 2JT + √(CL^2 + F^2 + P^2)
@@ -102,10 +94,16 @@ class TwoTerminalSMDchip():
 
         return dimensions
 
-    def generateFootprints(self):
-        for group_name in self.footprint_group_definitions:
+    def generateFootprints(self, command_file):
+        with open(command_file, 'r') as command_stream:
+            try:
+                footprint_group_definitions = yaml.safe_load(command_stream)
+            except yaml.YAMLError as exc:
+                print(exc)
+
+        for group_name in footprint_group_definitions:
             #print(device_group)
-            footprint_group_data = self.footprint_group_definitions[group_name]
+            footprint_group_data = footprint_group_definitions[group_name]
 
             device_size_docs = footprint_group_data['size_definitions']
             package_size_defintions={}
@@ -338,23 +336,14 @@ if __name__ == "__main__":
     parser.add_argument('--force_rectangle_pads', action='store_true', help='Force the generation of rectangle pads instead of rounded rectangle (KiCad 4.x compatibility.)')
     args = parser.parse_args()
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
-    args = parser.parse_args()
-    configuration['ipc_definition'] = args.ipc_definition
+    overrides = {'ipc_definition': args.ipc_definition}
     if args.force_rectangle_pads:
-        configuration['round_rect_max_radius'] = None
-        configuration['round_rect_radius_ratio'] = 0
+        overrides['round_rect_max_radius'] = None
+        overrides['round_rect_radius_ratio'] = 0
+
+    configuration = loadConfiguration(args.global_config, args.series_config, overrides)
+
+    two_terminal_smd = TwoTerminalSMDchip(configuration)
 
     for filepath in args.files:
-        two_terminal_smd =TwoTerminalSMDchip(filepath, configuration)
-        two_terminal_smd.generateFootprints()
+        two_terminal_smd.generateFootprints(filepath)
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Build the whole footprint library, or a part of it, by running the generator scripts in parallel
+
+The generators are described in build_manifest.yaml. Every generator is run in its own python process, with the
+directory of the script as working directory, so the default (relative) config paths of the scripts are valid.
+Generators only start when all generators they depend on succeeded. A generator depends on the generators listed in
+its ``depends`` entry, as well as on all generators whose ``outputs`` contain one of its ``inputs``.
+
+With ``--in_process``, the python generators are run by long-lived worker processes instead. Every worker imports
+KicadModTree and the helpers of scripts/tools once, and then runs every script in a fork of itself, with its own
+arguments and working directory. The forks start with the modules already imported, and nothing a script changes
+is seen by the next one. This avoids the start-up time of the interpreter, which is most of the time needed by the
+many small connector scripts.
+
+usage::
+
+    ./build_library.py                      # build everything using all cores
+    ./build_library.py -j 4 'conn_molex_*'  # build the molex connectors using 4 processes
+    ./build_library.py --in_process         # build everything, reusing the worker processes
+    ./build_library.py --list               # show all generators of the manifest
+"""
+
+import sys
+import os
+import io
+import glob
+import time
+import fnmatch
+import runpy
+import pickle
+import argparse
+import traceback
+import subprocess
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import yaml
+
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+REPOSITORY_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_MANIFEST = os.path.join(SCRIPT_DIR, 'build_manifest.yaml')
+TOOLS_DIR = os.path.join(SCRIPT_DIR, 'tools')
+
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'  # a dependency failed
+
+
+class ManifestException(Exception):
+    pass
+
+
+class Generator(object):
+    r"""A single job of the build: one generator script, called with a fixed set of arguments
+
+    :param name: unique name of the job
+    :param script: path of the generator script
+    :param definition: manifest entry of the generator (``args``, ``cwd``, ``inputs``, ``outputs``, ``depends``,
+                       ``interpreter``, ``in_process``, ``disabled``)
+    """
+
+    def __init__(self, name, script, definition):
+        self.name = name
+        self.script = script
+        self.args = [str(arg) for arg in definition.get('args', [])]
+        self.cwd = os.path.join(os.path.dirname(script), definition.get('cwd', '.'))
+        self.inputs = [self._path(path) for path in definition.get('inputs', [])]
+        self.outputs = [self._path(path) for path in definition.get('outputs', [])]
+        self.depends = set(definition.get('depends', []))
+        self.interpreter = definition.get('interpreter', sys.executable)
+        # only python scripts run by this interpreter can be executed by the worker processes
+        self.in_process = definition.get('in_process', 'interpreter' not in definition)
+        self.disabled = definition.get('disabled')
+
+        self.status = None
+        self.duration = 0.0
+        self.log = ''
+
+    def _path(self, path):
+        return os.path.normpath(os.path.join(self.cwd, path))
+
+    def getCommand(self):
+        return [self.interpreter, os.path.relpath(self.script, self.cwd)] + self.args
+
+    def _createOutputs(self):
+        # scripts create their .pretty directories without guarding against other processes doing the same
+        for output in self.outputs:
+            if not os.path.isdir(output):
+                try:
+                    os.makedirs(output)
+                except OSError:
+                    pass
+
+    def run(self):
+        r"""Execute the generator and store its status, duration and combined stdout/stderr"""
+
+        self._createOutputs()
+
+        # some scripts expect KicadModTree to be installed
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPOSITORY_ROOT, env.get('PYTHONPATH')]))
+
+        start = time.time()
+        try:
+            process = subprocess.Popen(self.getCommand(), cwd=self.cwd, env=env, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT)
+            output, _ = process.communicate()
+            self.log = output.decode('utf-8', 'replace')
+            self.status = STATUS_OK if process.returncode == 0 else STATUS_FAILED
+        except OSError as e:
+            self.log = "could not start generator: {}\n".format(e)
+            self.status = STATUS_FAILED
+        self.duration = time.time() - start
+        return self
+
+    def runInWorker(self):
+        r"""Execute the generator inside of a worker process, prepared by initWorker
+
+        The worker forks, and the script is run as ``__main__`` of the fork, with its own ``sys.argv``, working
+        directory and ``sys.path``. The fork starts with the modules imported by initWorker, everything the script
+        changes (module and class attributes, imported modules, counters like the write statistics) ends with the
+        fork. No state is shared between the scripts run by the same worker.
+
+        :return: status, duration and output of the generator
+        """
+
+        self._createOutputs()
+
+        start = time.time()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            try:
+                with os.fdopen(write_fd, 'wb') as f:
+                    pickle.dump(self._runScript(), f)
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, 'rb') as f:
+            data = f.read()
+        _, exit_status = os.waitpid(pid, 0)
+
+        try:
+            status, output = pickle.loads(data)
+        except Exception:
+            status, output = STATUS_FAILED, "generator process died (exit status {})\n".format(exit_status)
+        return status, time.time() - start, output
+
+    def _runScript(self):
+        # executed in the fork of a worker, which is left with os._exit afterwards
+        output = io.StringIO()
+        try:
+            sys.argv = [os.path.relpath(self.script, self.cwd)] + self.args
+            sys.path[:0] = [os.path.dirname(self.script)]
+            os.chdir(self.cwd)
+            sys.stdout = sys.stderr = output
+            runpy.run_path(sys.argv[0], run_name='__main__')
+            status = STATUS_OK
+        except SystemExit as e:
+            if e.code is None or e.code == 0:
+                status = STATUS_OK
+            else:
+                if not isinstance(e.code, int):
+                    output.write("{}\n".format(e.code))
+                status = STATUS_FAILED
+        except BaseException:
+            output.write(traceback.format_exc())
+            status = STATUS_FAILED
+        return status, output.getvalue()
+
+
+def initWorker():
+    r"""Import KicadModTree and the helpers of scripts/tools, which are then reused by all scripts of the worker"""
+    sys.path[:0] = [REPOSITORY_ROOT, TOOLS_DIR]
+    import yaml  # NOQA
+    import KicadModTree  # NOQA
+    import KicadModTree.util.yaml_util  # NOQA
+    for filename in sorted(glob.glob(os.path.join(TOOLS_DIR, '*.py'))):
+        try:
+            __import__(os.path.splitext(os.path.basename(filename))[0])
+        except Exception:
+            pass  # broken helpers are only a problem for the scripts using them, which will import them again
+
+
+def _runInWorker(generator):
+    return generator.runInWorker()
+
+
+def loadManifest(filename):
+    r"""Read the manifest and create all generators described by it
+
+    A manifest entry can use a glob pattern as ``script``, which creates one generator per matching script. The
+    name of a generator defaults to the path of its script, relative to the manifest and without extension.
+
+    :return: list of generators, in the order of the manifest
+    """
+
+    with io.open(filename, 'r', encoding='utf-8') as f:
+        manifest = yaml.safe_load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(filename))
+    generators = []
+    names = set()
+
+    for definition in manifest.get('generators', []):
+        if 'script' not in definition:
+            raise ManifestException("generator without script: {}".format(definition))
+
+        scripts = sorted(glob.glob(os.path.join(base_dir, definition['script'])))
+        if not scripts:
+            raise ManifestException("no script matches {}".format(definition['script']))
+        if 'name' in definition and len(scripts) > 1:
+            raise ManifestException("{} matches multiple scripts, but has a fixed name".format(definition['script']))
+
+        for script in scripts:
+            name = definition.get('name', os.path.splitext(os.path.relpath(script, base_dir))[0].replace(os.sep, '/'))
+            if name in names:
+                raise ManifestException("generator {} is defined multiple times".format(name))
+            names.add(name)
+            generators.append(Generator(name, script, definition))
+
+    return generators
+
+
+def resolveDependencies(generators):
+    r"""Add the implicit dependencies, given by inputs which are the output of another generator
+
+    :raises ManifestException: for unknown or cyclic dependencies
+    """
+
+    by_name = dict((generator.name, generator) for generator in generators)
+
+    for generator in generators:
+        for name in generator.depends:
+            if name not in by_name:
+                raise ManifestException("{} depends on unknown generator {}".format(generator.name, name))
+
+        for other in generators:
+            if other is generator:
+                continue
+            for path in generator.inputs:
+                if any(path == output or path.startswith(output + os.sep) for output in other.outputs):
+                    generator.depends.add(other.name)
+
+    # check for cycles by repeatedly removing generators without remaining dependencies
+    remaining = dict((generator.name, set(generator.depends)) for generator in generators)
+    while remaining:
+        ready = [name for name, depends in remaining.items() if not depends]
+        if not ready:
+            raise ManifestException("cyclic dependencies between: {}".format(", ".join(sorted(remaining))))
+        for name in ready:
+            del remaining[name]
+        for depends in remaining.values():
+            depends.difference_update(ready)
+
+
+def selectGenerators(generators, patterns):
+    r"""Get the generators whose name matches one of the patterns, including everything they depend on
+
+    Without patterns, all generators except the disabled ones are selected. Disabled generators are only selected
+    when their name is given explicitly.
+    """
+
+    def isSelected(generator):
+        if not patterns:
+            return not generator.disabled
+        if generator.disabled:
+            return generator.name in patterns
+        return any(fnmatch.fnmatch(generator.name, pattern) for pattern in patterns)
+
+    by_name = dict((generator.name, generator) for generator in generators)
+    selected = set()
+    pending = [generator.name for generator in generators if isSelected(generator)]
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(by_name[name].depends)
+
+    return [generator for generator in generators if generator.name in selected]
+
+
+def runGenerators(generators, jobs, log_dir=None, verbose=False, in_process=False):
+    r"""Run the generators on a pool of worker threads, each of them driving one python process
+
+    Generators are started in manifest order as soon as all of their dependencies finished successfully. The logs are
+    written in manifest order too, so they do not depend on the scheduling.
+
+    :param in_process: run the python generators on a pool of worker processes (see Generator.runInWorker), instead
+                       of starting a new interpreter for each of them
+    """
+
+    by_name = dict((generator.name, generator) for generator in generators)
+    waiting = list(generators)
+    running = {}
+
+    worker_pool = None
+    if in_process:
+        # every worker imports the shared modules once in initWorker, and forks itself for each script
+        worker_pool = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('fork'),
+                                          initializer=initWorker)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while waiting or running:
+            for generator in list(waiting):
+                if len(running) >= jobs:
+                    break
+                states = [by_name[name].status for name in generator.depends if name in by_name]
+                if any(state in (STATUS_FAILED, STATUS_SKIPPED) for state in states):
+                    generator.status = STATUS_SKIPPED
+                    waiting.remove(generator)
+                    print("skip {} (dependency failed)".format(generator.name))
+                elif all(state == STATUS_OK for state in states):
+                    waiting.remove(generator)
+                    if worker_pool is not None and generator.in_process:
+                        try:
+                            running[worker_pool.submit(_runInWorker, generator)] = generator
+                        except BrokenProcessPool as e:
+                            generator.status, generator.log = STATUS_FAILED, "worker failed: {!r}\n".format(e)
+                            print("{status:7s} {name}".format(status=generator.status, name=generator.name))
+                    else:
+                        running[executor.submit(generator.run)] = generator
+                    if verbose:
+                        print("start {}".format(generator.name))
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                generator = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # a worker process died
+                    generator.status, generator.log = STATUS_FAILED, "worker failed: {!r}\n".format(e)
+                else:
+                    if result is not generator:
+                        generator.status, generator.duration, generator.log = result
+                print("{status:7s} {name} ({duration:.1f}s)".format(
+                    status=generator.status, name=generator.name, duration=generator.duration))
+                if generator.status == STATUS_FAILED:
+                    sys.stdout.write(_indent(generator.log))
+
+    if worker_pool is not None:
+        worker_pool.shutdown()
+
+    if log_dir is not None:
+        writeLogs(generators, log_dir)
+
+
+def _indent(text):
+    return "".join("    " + line for line in text.splitlines(True))
+
+
+def writeLogs(generators, log_dir):
+    r"""Write one log per generator and the combined log build.log"""
+
+    if not os.path.isdir(log_dir):
+        os.makedirs(log_dir)
+
+    with io.open(os.path.join(log_dir, 'build.log'), 'w', encoding='utf-8') as build_log:
+        for generator in generators:
+            header = "=== {name} [{status}] ({duration:.1f}s)\n$ (cd {cwd} && {command})\n".format(
+                name=generator.name, status=generator.status, duration=generator.duration,
+                cwd=os.path.relpath(generator.cwd), command=" ".join(generator.getCommand()))
+            build_log.write(header + generator.log + "\n")
+
+            if generator.status != STATUS_SKIPPED:
+                filename = os.path.join(log_dir, generator.name.replace('/', '__') + '.log')
+                with io.open(filename, 'w', encoding='utf-8') as f:
+                    f.write(header + generator.log)
+
+
+def printSummary(generators, duration):
+    failed = [g for g in generators if g.status == STATUS_FAILED]
+    skipped = [g for g in generators if g.status == STATUS_SKIPPED]
+
+    print("")
+    print("slowest generators:")
+    for generator in sorted(generators, key=lambda g: g.duration, reverse=True)[:5]:
+        print("  {duration:7.1f}s {name}".format(duration=generator.duration, name=generator.name))
+
+    print("")
+    print("{total} generators in {duration:.1f}s: {ok} ok, {failed} failed, {skipped} skipped".format(
+        total=len(generators), duration=duration, ok=len(generators) - len(failed) - len(skipped),
+        failed=len(failed), skipped=len(skipped)))
+    for generator in failed:
+        print("  failed: {}".format(generator.name))
+    for generator in skipped:
+        print("  skipped: {}".format(generator.name))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the footprint generators listed in the build manifest.')
+    parser.add_argument('generators', metavar='generator', type=str, nargs='*',
+                        help='names (or glob patterns) of the generators to run, default: all')
+    parser.add_argument('-m', '--manifest', type=str, default=DEFAULT_MANIFEST, help='the build manifest')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='number of generators running at the same time (default: number of cores)')
+    parser.add_argument('--log_dir', type=str, help='write the output of every generator into this directory')
+    parser.add_argument('--in_process', action='store_true',
+                        help='run the python generators inside of long-lived worker processes')
+    parser.add_argument('--list', action='store_true', help='list the selected generators and their dependencies')
+    parser.add_argument('-v', '--verbose', action='store_true', help='show when generators are started')
+    args = parser.parse_args()
+
+    try:
+        generators = loadManifest(args.manifest)
+        resolveDependencies(generators)
+    except ManifestException as e:
+        print("invalid manifest: {}".format(e))
+        sys.exit(2)
+
+    generators = selectGenerators(generators, args.generators)
+
+    if args.list:
+        for generator in generators:
+            depends = " (depends on: {})".format(", ".join(sorted(generator.depends))) if generator.depends else ""
+            disabled = " (disabled: {})".format(generator.disabled) if generator.disabled else ""
+            print("{name}: {command}{depends}{disabled}".format(
+                name=generator.name, command=" ".join(generator.getCommand()[1:]), depends=depends, disabled=disabled))
+        sys.exit(0)
+
+    start = time.time()
+    runGenerators(generators, args.jobs if args.jobs > 0 else multiprocessing.cpu_count(), args.log_dir, args.verbose,
+                  args.in_process)
+    printSummary(generators, time.time() - start)
+
+    if any(generator.status != STATUS_OK for generator in generators):
+        sys.exit(1)
@@ -13,6 +13,7 @@ sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load kicad_mod path
 
 from KicadModTree import *  # NOQA
 from footprint_global_properties import *
+from keepouts import getKeepoutIndex, applyKeepouts, containedInAnyKeepout, clipArc, clipCircle
 
 # tool function for generating 3D-scripts
 def script3d_writevariable(file, line, varname, value):
@@ -75,63 +76,6 @@ def addKeepoutRound(x, y, w, h):
             yysum = yysum + yy
         return res
 
-# internal method for keepout-processing
-def applyKeepouts(lines_in, y, xi, yi, keepouts):
-    # print("  applyKeepouts(\n  lines_in=", lines_in, "  \n  y=", y, "   \n  xi=", xi, "   yi=", yi, "   \n  keepouts=", keepouts, ")")
-    lines = lines_in
-    changes = True
-    while (changes):
-        changes = False
-        for ko in keepouts:
-            ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-            if (ko[yi + 0] <= y) and (y <= ko[yi + 1]):
-                # print("    INY: koy=", [ko[yi + 0], ko[yi + 1]], "  y=", y, "):             kox=", [ko[xi + 0], ko[xi + 1]])
-                for li in reversed(range(0, len(lines))):
-                    l = lines[li]
-                    if (l[0] >= ko[xi + 0]) and (l[0] <= ko[xi + 1]) and (l[1] >= ko[xi + 0]) and (
-                                l[1] <= ko[xi + 1]):  # Line completely inside -> remove
-                        lines.pop(li)
-                        # print("      H1: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, ")")
-                        changes = True
-                    elif (l[0] >= ko[xi + 0]) and (l[0] <= ko[xi + 1]) and (
-                                l[1] > ko[
-                                    xi + 1]):  # Line starts inside, but ends outside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([ko[xi + 1], l[1]])
-                        # print("      H2: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [ko[xi+1], l[1]])
-                        changes = True
-                    elif (l[0] < ko[xi + 0]) and (l[1] <= ko[xi + 1]) and (
-                                l[1] >= ko[
-                                    xi + 0]):  # Line starts outside, but ends inside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi + 0]])
-                        # print("      H3: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]])
-                        changes = True
-                    elif (l[0] < ko[xi + 0]) and (
-                                l[1] > ko[
-                                    xi + 1]):  # Line starts outside, and ends outside -> remove and add 2 shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi + 0]])
-                        lines.append([ko[xi + 1], l[1]])
-                        # print("      H4: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]], [ko[xi+1], l[1]])
-                        changes = True
-                        # else:
-                        # print("      USE: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ")
-        if changes:
-            break
-
-    return lines
-
-# gives True if the given point (x,y) is contained in any keepout
-def containedInAnyKeepout(x,y, keepouts):
-    for ko in keepouts:
-        ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-        if x>=ko[0] and x<=ko[1] and y>=ko[2] and y<=ko[3]:
-            #print("HIT!")
-            return True
-    #print("NO HIT ",x,y)
-    return False
-
 # draws the keepouts
 def debug_draw_keepouts(kicad_modg, keepouts):
     for ko in keepouts:
@@ -152,32 +96,16 @@ def addHLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0.
 
 # draw a circle minding the keepouts
 def addCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts=[], roun=0.001):
-    dalpha = 2 * 3.1415 / (360)
-    a = 0
-    start=0
-    startx=x + radius * math.sin(0)
-    starty=y + radius * math.cos(0)
-    hasToDraw=False
-    noneUsed=True
-    while a < 2 * 3.1415:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-
-        if containedInAnyKeepout(x1,y1, keepouts):
-            if hasToDraw and math.fabs(a-start)>0:
-                kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
-            hasToDraw = False
-            startx=x1; starty=y1; start=a
-            noneUsed = False
-        else:
-            hasToDraw = True
-
-        a = a + dalpha
-    if noneUsed:
+    arcs = clipCircle(x, y, radius, keepouts)
+    if arcs == [(0, 2 * math.pi)]:
         kicad_mod.append(
             Circle(center=[roundG(x, roun), roundG(y, roun)], radius=radius, layer=layer, width=width))
-    elif hasToDraw and math.fabs(a - start) > 0:
-        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
+        return
+
+    for a0, a1 in arcs:
+        startx = x + radius * math.sin(a0)
+        starty = y + radius * math.cos(a0)
+        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-math.degrees(a1 - a0), layer=layer, width=width))
 
 # draw an arc
 def addArcByAngles(kicad_mod, x, y, radius, angle_start, angle_end, layer, width, roun=0.001):
@@ -193,39 +121,22 @@ def addArcByAnglesWithKeepout(kicad_mod, x, y, radius, angle_start, angle_end, l
 
 # draw an arc minding the keepouts
 def addArcWithKeepout(kicad_mod, x, y, startx, starty, angle, layer, width, keepouts=[], roun=0.001):
-    dalpha = angle/180*3.1415 / (360)
-    radius=math.sqrt(sqr(x-startx)+sqr(y-starty));
-    a = math.asin((startx-x)/radius)
-    if starty<0:
-        a=a+3.1415/2
-    astart=a;
-    aend=astart+angle/180*3.1415
-    start=astart
-    #print(radius, astart/3.1415*180, aend/3.1415*180)
-    istartx=x + radius * math.sin(a)
-    istarty=y + radius * math.cos(a)
-    hasToDraw=False
-    noneUsed=True
-    while a < aend:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-
-        if containedInAnyKeepout(x1,y1, keepouts):
-            if hasToDraw and math.fabs(a-start)>0:
-                #print('DRAW ',x1,y1)
-                kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(istartx, roun), roundG(istarty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
-            hasToDraw = False
-            istartx=x1; istarty=y1; start=a
-            noneUsed = False
-        else:
-            hasToDraw = True
-        #print(a, dalpha, hasToDraw, noneUsed)
-        a = a + dalpha
-    if noneUsed:
+    radius = math.sqrt(sqr(x-startx)+sqr(y-starty))
+    # a negative angle runs along increasing a (the point at a is x + radius*sin(a), y + radius*cos(a))
+    astart = math.atan2(startx-x, starty-y)
+    aend = astart - math.radians(angle)
+    arcs = clipArc(x, y, radius, min(astart, aend), max(astart, aend), keepouts)
+    if arcs == [(min(astart, aend), max(astart, aend))]:
         kicad_mod.append(
             Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=angle, layer=layer, width=width))
-    elif hasToDraw and math.fabs(a - start) > 0:
-        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(istartx, roun), roundG(istarty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
+        return
+
+    for a0, a1 in arcs:
+        # keep the direction of the arc
+        a = a0 if angle < 0 else a1
+        istartx = x + radius * math.sin(a)
+        istarty = y + radius * math.cos(a)
+        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(istartx, roun), roundG(istarty, roun)], angle=math.copysign(math.degrees(a1 - a0), angle), layer=layer, width=width))
 
 # draw an ellipse with one axis along x-axis and one axis along y-axis and given width/height
 def addEllipse(kicad_mod, x, y, w, h, layer, width, roun=0.001):
@@ -245,27 +156,21 @@ def addEllipseWithKeepout(kicad_mod, x, y, w, h, layer, width, keepouts=[], roun
 
 # split a circle so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addDCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts=[], roun=0.001):
+    keepouts = getKeepoutIndex(keepouts)
     dalpha = 2 * 3.1415 / (2 * 3.1415 * radius / (6 * width))
     a = 0
     while a < 2 * 3.1415:
         x1 = x + radius * math.sin(a)
         y1 = y + radius * math.cos(a)
-        x2 = x + radius * math.sin(a + dalpha / 2)
-        y2 = y + radius * math.cos(a + dalpha / 2)
-        ok=True
-        aa=a
-        while aa<a+dalpha and ok:
-            xx = x + radius * math.sin(aa)
-            yy = y + radius * math.cos(aa)
-            if containedInAnyKeepout(xx, yy, keepouts):
-                ok=False
-            aa=aa+dalpha/20
-        if ok: kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(x1, roun), roundG(y1, roun)],
+        # only draw the dashes which do not touch a keepout
+        if clipArc(x, y, radius, a, a + dalpha, keepouts) == [(a, a + dalpha)]:
+            kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(x1, roun), roundG(y1, roun)],
                              angle=-1*dalpha / 2 / 3.1415 * 180, layer=layer, width=width))
         a = a + dalpha
 
 # split an arbitrary line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addLineWithKeepout(kicad_mod, x1, y1, x2,y2, layer, width, keepouts=[], roun=0.001):
+    keepouts=getKeepoutIndex(keepouts)
     dx=(x2-x1)/200
     dy=(y2-y1)/200
     x=x1; y=y1
@@ -405,6 +310,7 @@ def addVLineWithKeepout(kicad_mod, x, y0, y1, layer, width, keepouts=[], roun=0.
 def addHDLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0.001):
     dx=3*width
     x=min(x0,x1)
+    keepouts=getKeepoutIndex(keepouts)
     while x<max(x0,x1):
         addHLineWithKeepout(kicad_mod, x,min(x+dx,x1), y, layer, width, keepouts, roun)
         x=x+dx*2
@@ -413,6 +319,7 @@ def addHDLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0
 def addVDLineWithKeepout(kicad_mod, x, y0, y1, layer, width, keepouts=[], roun=0.001):
     dy = 3 * width
     y = min(y0, y1)
+    keepouts = getKeepoutIndex(keepouts)
     while y < max(y0, y1):
         addVLineWithKeepout(kicad_mod, x, y, min(y1,y+dy), layer, width, keepouts, roun)
         y = y + dy * 2
@@ -0,0 +1,79 @@
+r"""Load the global (KLC) configuration merged with a series configuration
+
+All scripts load one of the files in global_config_files and update it with the configuration of their series. This
+module does it once per process: the merged configuration is frozen into a snapshot, which is shared by all scripts
+run in the same process (see build_library.py --in_process). Every call gets its own copy of the snapshot, so
+changes made by one script never leak into another one.
+
+usage::
+
+    configuration = loadConfiguration(args.global_config, args.series_config,
+                                      {'kicad4_compatible': args.kicad4_compatible})
+"""
+
+import sys, os
+import json
+import marshal
+import pickle
+sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load kicad_mod path
+from KicadModTree.util.yaml_util import loadYamlFile
+
+
+# frozen configurations, keyed by the files (and their modification time) and the overrides
+_configurations = {}
+
+
+def _fileKey(filename):
+    if filename is None:
+        return None
+    stat = os.stat(filename)
+    return os.path.realpath(filename), stat.st_mtime, stat.st_size
+
+
+def freezeConfiguration(configuration):
+    r"""Get an immutable snapshot of a configuration, which can be turned into a copy by thawConfiguration"""
+    # marshal is a lot faster than copy.deepcopy, but only supports the plain types of yaml documents
+    try:
+        return marshal.loads, marshal.dumps(configuration)
+    except ValueError:
+        return pickle.loads, pickle.dumps(configuration, pickle.HIGHEST_PROTOCOL)
+
+
+def thawConfiguration(frozen):
+    r"""Get a new copy of a configuration frozen by freezeConfiguration"""
+    loads, data = frozen
+    return loads(data)
+
+
+def loadConfiguration(global_config, series_config=None, overrides=None):
+    r"""Get the global configuration, updated with the series configuration and the overrides
+
+    The files are only read and merged on the first call with the same arguments, later calls get a copy of the
+    merged configuration. Values which depend on the command line, like kicad4_compatible, are given as overrides.
+
+    :param global_config: path of the global configuration, like global_config_files/config_KLCv3.0.yaml
+    :param series_config: path of the series configuration (optional)
+    :param overrides: dict of top level values replaced after merging (optional)
+
+    :return: the merged configuration, as a new dict which can be modified by the caller
+    """
+    key = (_fileKey(global_config), _fileKey(series_config),
+           json.dumps(overrides, sort_keys=True, default=repr) if overrides else None)
+
+    frozen = _configurations.get(key)
+    if frozen is None:
+        configuration = loadYamlFile(global_config)
+        if series_config is not None:
+            configuration.update(loadYamlFile(series_config))
+        if overrides:
+            configuration.update(overrides)
+
+        frozen = freezeConfiguration(configuration)
+        _configurations[key] = frozen
+
+    return thawConfiguration(frozen)
+
+
+def clearConfigurationCache():
+    r"""Forget all configurations loaded by loadConfiguration"""
+    _configurations.clear()
@@ -0,0 +1,47 @@
+r"""Registry of the parsed IPC definition files
+
+The IPC based generators (gullwing, no lead, plcc, two terminal chips, electrolytic capacitors) look up the IPC
+tolerances and rounding bases of their footprints in a yaml document like Packages/ipc_definitions.yaml. This module
+parses every document once per process and hands out the same object to every generator, also to all scripts run in
+the same process (see build_library.py --in_process).
+
+The definitions are shared, so they must not be modified by the generators.
+
+usage::
+
+    ipc_defintions = loadIpcDefinitions('../ipc_definitions.yaml')
+    ipc_data_set = ipc_defintions['ipc_spec_gw_large_pitch']['nominal']
+"""
+
+import sys, os
+sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load kicad_mod path
+from KicadModTree.util.yaml_util import loadYamlFile
+
+
+# parsed documents, keyed by the real path of the file
+_definitions = {}
+
+
+def loadIpcDefinitions(filename):
+    r"""Get the parsed IPC definitions of a yaml file
+
+    The file is only parsed again if its modification time or size changed since the last call.
+
+    :param filename: path of the IPC definition file, like Packages/ipc_definitions.yaml
+
+    :return: the parsed document, shared by all callers
+    """
+    path = os.path.realpath(filename)
+    stat = os.stat(path)
+
+    entry = _definitions.get(path)
+    if entry is None or entry[0] != (stat.st_mtime, stat.st_size):
+        entry = (stat.st_mtime, stat.st_size), loadYamlFile(path)
+        _definitions[path] = entry
+
+    return entry[1]
+
+
+def clearIpcDefinitionCache():
+    r"""Forget all definitions loaded by loadIpcDefinitions"""
+    _definitions.clear()
@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 from __future__ import division
 import math
 import re
@@ -6,6 +7,7 @@ def roundToBase(value, base):
     return round(value/base) * base
 
 class TolerancedSize():
+    @staticmethod
     def to_metric(value, unit):
         if unit == "inch":
             factor = 25.4
@@ -174,8 +176,9 @@ class TolerancedSize():
         else:
             try:
                 nominal = float(s)
-            except Exception as e:
-                raise ValueError("Dimension specifier not recogniced: {}\n\t Valid options are nom, nom+/-tol, nom+tolp-toln, min...max or min...nom...max".format(input)) from e
+            except Exception:
+                # python 3 still chains the original exception
+                raise ValueError("Dimension specifier not recogniced: {}\n\t Valid options are nom, nom+/-tol, nom+tolp-toln, min...max or min...nom...max".format(input))
 
         return TolerancedSize(
             minimum=minimum,
@@ -312,3 +315,258 @@ def ipc_pad_center_plus_size(ipc_data, ipc_round_base, manf_tol,
     Xmax = roundToBase(Xmax, ipc_round_base['side'])
 
     return Gmin, Zmax, Xmax
+
+# Batch calculation over many devices at once, used for whole size definition files.
+# numpy is only imported when the batch functions are used.
+
+IPC_DENSITIES = ['least', 'nominal', 'most']
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy is required for the batch ipc calculations!")
+    return numpy
+
+class TolerancedSizeArray():
+    r"""The TolerancedSize of many devices, stored as numpy columns
+
+    Supports the same arithmetic as TolerancedSize, element wise over all devices.
+    """
+
+    def __init__(self, minimum, maximum, nominal=None):
+        np = _numpy()
+
+        self.minimum = np.asarray(minimum, dtype=float)
+        self.maximum = np.asarray(maximum, dtype=float)
+        if nominal is not None:
+            self.nominal = np.asarray(nominal, dtype=float)
+        else:
+            self.nominal = (self.minimum + self.maximum)/2
+
+        if np.any(self.maximum < self.minimum):
+            raise ValueError("Maximum is smaller than minimum. Tolerance ranges given wrong or parameters confused.")
+
+        self.ipc_tol = self.maximum - self.minimum
+        self.ipc_tol_RMS = self.ipc_tol
+        self.maximum_RMS = self.maximum
+        self.minimum_RMS = self.minimum
+
+    @staticmethod
+    def fromSizes(sizes):
+        r"""Stack a list of TolerancedSize into columns"""
+        np = _numpy()
+
+        result = TolerancedSizeArray(
+            minimum=[s.minimum for s in sizes],
+            maximum=[s.maximum for s in sizes],
+            nominal=[s.nominal for s in sizes]
+            )
+        result.ipc_tol = np.array([s.ipc_tol for s in sizes], dtype=float)
+        result.ipc_tol_RMS = np.array([s.ipc_tol_RMS for s in sizes], dtype=float)
+        result.maximum_RMS = np.array([s.maximum_RMS for s in sizes], dtype=float)
+        result.minimum_RMS = np.array([s.minimum_RMS for s in sizes], dtype=float)
+        return result
+
+    @staticmethod
+    def fromYaml(devices, base_name, unit=None):
+        r"""Get the column of one dimension of a list of device size definitions
+
+        :param devices: list of device dicts, like the values of a size definition file
+        :param base_name: name of the dimension, like 'lead_width' (see TolerancedSize.fromYaml)
+        """
+        return TolerancedSizeArray.fromSizes(
+            [TolerancedSize.fromYaml(device, base_name=base_name, unit=unit) for device in devices])
+
+    def __len__(self):
+        return len(self.nominal)
+
+    def __getitem__(self, index):
+        r"""Get the TolerancedSize of a single device"""
+        result = TolerancedSize(
+            minimum=float(self.minimum[index]),
+            nominal=float(self.nominal[index]),
+            maximum=float(self.maximum[index])
+            )
+        result.ipc_tol = float(self.ipc_tol[index])
+        result.ipc_tol_RMS = float(self.ipc_tol_RMS[index])
+        result.maximum_RMS = float(self.maximum_RMS[index])
+        result.minimum_RMS = float(self.minimum_RMS[index])
+        return result
+
+    def updateRMS(self, tolerances):
+        np = _numpy()
+
+        ipc_tol_RMS = 0
+        for t in tolerances:
+            ipc_tol_RMS = ipc_tol_RMS + t**2
+        ipc_tol_RMS = np.sqrt(ipc_tol_RMS)
+
+        too_large = ipc_tol_RMS > self.ipc_tol
+        if np.any(too_large):
+            errors = too_large & (np.round(ipc_tol_RMS/1e-6)*1e-6 > np.round(self.ipc_tol/1e-6)*1e-6)
+            if np.any(errors):
+                i = np.flatnonzero(errors)[0]
+                raise ValueError(
+                    "RMS tolerance larger than normal tolerance. Did you give the wrong tolerances?\ntol(RMS): {} tol: {}"\
+                    .format(ipc_tol_RMS[i], self.ipc_tol[i]))
+            # the discrepancy most likely comes from floating point errors. Ignore it.
+            ipc_tol_RMS = np.where(too_large, self.ipc_tol, ipc_tol_RMS)
+
+        self.ipc_tol_RMS = ipc_tol_RMS
+        self.maximum_RMS = self.maximum - (self.ipc_tol - self.ipc_tol_RMS)/2
+        self.minimum_RMS = self.minimum + (self.ipc_tol - self.ipc_tol_RMS)/2
+
+    def __add__(self, other):
+        if type(other) in [int, float]:
+            return TolerancedSizeArray(
+                minimum = self.minimum + other,
+                maximum = self.maximum + other
+                )
+
+        result = TolerancedSizeArray(
+            minimum = self.minimum + other.minimum,
+            maximum = self.maximum + other.maximum
+            )
+        result.updateRMS([self.ipc_tol_RMS, other.ipc_tol_RMS])
+        return result
+
+    def __sub__(self, other):
+        if type(other) in [int, float]:
+            return TolerancedSizeArray(
+                minimum = self.minimum - other,
+                maximum = self.maximum - other
+                )
+
+        result = TolerancedSizeArray(
+            minimum = self.minimum - other.maximum,
+            maximum = self.maximum - other.minimum
+            )
+        result.updateRMS([self.ipc_tol_RMS, other.ipc_tol_RMS])
+        return result
+
+    def __mul__(self, other):
+        if type(other) not in [int, float]:
+            raise NotImplementedError("Only multiplication with int and float is implemented right now.")
+        result = TolerancedSizeArray(
+            minimum = self.minimum*other,
+            maximum = self.maximum*other
+            )
+        result.updateRMS([self.ipc_tol_RMS*math.sqrt(other)])
+        return result
+
+    def __div__(self, other):
+        return self.__truediv__(other)
+
+    def __truediv__(self, other):
+        if type(other) not in [int, float]:
+            raise NotImplementedError("Only multiplication with int and float is implemented right now.")
+        result = TolerancedSizeArray(
+            minimum = self.minimum/other,
+            maximum = self.maximum/other
+            )
+        result.updateRMS([self.ipc_tol_RMS/math.sqrt(other)])
+        return result
+
+def _ipcColumns(ipc_definition, densities, name):
+    # ipc_definition is the definition of one ipc reference (with the densities and round_base as keys),
+    # or a list with the definition of every device.
+    # returns the value for every density as rows and (if given per device) every device as columns
+    np = _numpy()
+
+    if type(ipc_definition) is dict:
+        values = [[ipc_definition[density][name]] for density in densities]
+        round_base = ipc_definition['round_base'][name]
+    else:
+        values = [[d[density][name] for d in ipc_definition] for density in densities]
+        round_base = np.array([d['round_base'][name] for d in ipc_definition], dtype=float)
+    return np.array(values, dtype=float), round_base
+
+def _roundToBase(value, base):
+    np = _numpy()
+    return np.round(value/base) * base
+
+def _ipc_batch(ipc_definition, manf_tol, S, lead_outside, lead_width, heel_reduction, densities):
+    np = _numpy()
+
+    F = manf_tol.get('manufacturing_tolerance', 0.1)
+    P = manf_tol.get('placement_tolerance', 0.05)
+
+    toe, toe_round_base = _ipcColumns(ipc_definition, densities, 'toe')
+    heel, heel_round_base = _ipcColumns(ipc_definition, densities, 'heel')
+    side, side_round_base = _ipcColumns(ipc_definition, densities, 'side')
+
+    Gmin = S.maximum_RMS - 2*heel + 2*np.asarray(heel_reduction, dtype=float) - np.sqrt(S.ipc_tol_RMS**2 + F**2 + P**2)
+    Zmax = lead_outside.minimum_RMS + 2*toe + np.sqrt(lead_outside.ipc_tol_RMS**2 + F**2 + P**2)
+    Xmax = lead_width.minimum_RMS + 2*side + np.sqrt(lead_width.ipc_tol_RMS**2 + F**2 + P**2)
+
+    Zmax = _roundToBase(Zmax, toe_round_base)
+    Gmin = _roundToBase(Gmin, heel_round_base)
+    Xmax = _roundToBase(Xmax, side_round_base)
+
+    return Gmin, Zmax, Xmax
+
+def ipc_gull_wing_batch(ipc_definition, manf_tol, lead_width, lead_outside,
+        lead_len=None, lead_inside=None, heel_reduction=0, densities=IPC_DENSITIES):
+    r"""ipc_gull_wing for many devices and densities at once
+
+    The sizes are TolerancedSizeArray with one entry per device, heel_reduction is a number or an array.
+    ipc_definition is the entry of an ipc reference in the ipc definition file (like
+    ipc_defintions['ipc_spec_gw_large_pitch']), or a list of them with one entry per device.
+
+    :return: Gmin, Zmax, Xmax as arrays with one row per density and one column per device
+    """
+    if lead_inside is not None:
+        S = lead_inside
+    elif lead_len is not None:
+        S = lead_outside - lead_len*2
+    else:
+        raise KeyError("either lead inside distance or lead lenght must be given")
+
+    return _ipc_batch(ipc_definition, manf_tol, S, lead_outside, lead_width, heel_reduction, densities)
+
+def ipc_body_edge_inside_batch(ipc_definition, manf_tol, body_size, lead_width,
+        lead_len=None, lead_inside=None, heel_reduction=0, densities=IPC_DENSITIES):
+    r"""ipc_body_edge_inside for many devices and densities at once (see ipc_gull_wing_batch)"""
+    return ipc_body_edge_inside_pull_back_batch(
+                ipc_definition, manf_tol, body_size, lead_width,
+                lead_len=lead_len, lead_inside=lead_inside, pull_back=0,
+                heel_reduction=heel_reduction, densities=densities
+                )
+
+def ipc_body_edge_inside_pull_back_batch(ipc_definition, manf_tol, body_size, lead_width,
+        lead_len=None, lead_inside=None, body_to_inside_lead_edge=None, pull_back=None, lead_outside=None,
+        heel_reduction=0, densities=IPC_DENSITIES):
+    r"""ipc_body_edge_inside_pull_back for many devices and densities at once (see ipc_gull_wing_batch)"""
+    if lead_outside is None:
+        if pull_back is None:
+            raise KeyError("Either lead outside or pull back distance must be given")
+        if type(pull_back) in [int, float]:
+            pull_back = TolerancedSizeArray.fromSizes([TolerancedSize(nominal=pull_back)]*len(body_size))
+        lead_outside = body_size - pull_back*2
+
+    if lead_inside is not None:
+        S = lead_inside
+    elif lead_len is not None:
+        S = lead_outside - lead_len*2
+    elif body_to_inside_lead_edge is not None:
+        S = body_size - body_to_inside_lead_edge*2
+    else:
+        raise KeyError("either lead inside distance, lead to body edge or lead lenght must be given")
+
+    return _ipc_batch(ipc_definition, manf_tol, S, lead_outside, lead_width, heel_reduction, densities)
+
+def ipc_pad_center_plus_size_batch(ipc_definition, manf_tol,
+        center_position, lead_length, lead_width, densities=IPC_DENSITIES):
+    r"""ipc_pad_center_plus_size for many devices and densities at once (see ipc_gull_wing_batch)"""
+    S = center_position*2 - lead_length
+    lead_outside = center_position*2 + lead_length
+
+    return _ipc_batch(ipc_definition, manf_tol, S, lead_outside, lead_width, 0, densities)
+
+def ipc_pad_positions_batch(Gmin, Zmax, Xmax):
+    r"""Get the pad center (distance from the footprint center) and size of the results of the batch calculators
+
+    :return: center, size_x (along the lead), size_y (across the lead), shaped like the inputs
+    """
+    return (Zmax + Gmin)/4, (Zmax - Gmin)/2, Xmax
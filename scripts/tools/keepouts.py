@@ -0,0 +1,235 @@
+r"""Clip horizontal and vertical lines, circles and arcs against keepout rectangles
+
+Keepouts are given as a list of rectangles [[x0, x1, y0, y1], ...]. KeepoutIndex normalizes them once and indexes
+them in an interval tree for every scan direction, so clipping a line only looks at the keepouts it touches, instead
+of all keepouts of the footprint. Circles and arcs are clipped analytically: the angles where they cross the edges
+of the keepouts are calculated, so the remaining arcs end exactly at the keepouts.
+
+applyKeepouts accepts a KeepoutIndex or a plain list. A plain list is indexed again on every call, so scripts drawing
+many lines should build the KeepoutIndex once and pass it to all drawing functions. The KeepoutIndex holds a copy of
+the rectangles, so keepouts added to or changed in the list later on require a new KeepoutIndex.
+
+usage::
+
+    keepouts = KeepoutIndex(addKeepoutRect(0, 0, 2, 2) + addKeepoutRect(5, 0, 2, 2))
+    lines = applyKeepouts([[-5, 10]], 0, 0, 2, keepouts)  # [[-5, -1], [1, 4], [6, 10]]
+    arcs = clipCircle(0, 0, 0.5, keepouts)  # [], the circle lies completely in the first keepout
+"""
+
+from __future__ import division
+import math
+
+from KicadModTree.util.clip_util import freeIntervals, joinCircleIntervals
+
+
+class _IntervalTree():
+    r"""Static centered interval tree over closed intervals (low, high, index)"""
+
+    def __init__(self, intervals):
+        endpoints = sorted(p for interval in intervals for p in interval[:2])
+        self.center = endpoints[len(endpoints) // 2]
+
+        here = [i for i in intervals if i[0] <= self.center <= i[1]]
+        left = [i for i in intervals if i[1] < self.center]
+        right = [i for i in intervals if i[0] > self.center]
+
+        self.by_low = sorted(here, key=lambda i: i[0])
+        self.by_high = sorted(here, key=lambda i: i[1], reverse=True)
+        self.left = _IntervalTree(left) if left else None
+        self.right = _IntervalTree(right) if right else None
+
+    def stab(self, y, result):
+        r"""Append the indices of all intervals containing y to result"""
+        node = self
+        while node is not None:
+            if y < node.center:
+                for low, high, index in node.by_low:
+                    if low > y:
+                        break
+                    result.append(index)
+                node = node.left
+            elif y > node.center:
+                for low, high, index in node.by_high:
+                    if high < y:
+                        break
+                    result.append(index)
+                node = node.right
+            else:
+                result.extend(index for low, high, index in node.by_low)
+                break
+        return result
+
+    def overlap(self, y0, y1, result):
+        r"""Append the indices of all intervals overlapping [y0, y1] to result"""
+        if y1 < self.center:
+            for low, high, index in self.by_low:
+                if low > y1:
+                    break
+                result.append(index)
+        elif y0 > self.center:
+            for low, high, index in self.by_high:
+                if high < y0:
+                    break
+                result.append(index)
+        else:
+            result.extend(index for low, high, index in self.by_low)
+
+        if self.left is not None and y0 < self.center:
+            self.left.overlap(y0, y1, result)
+        if self.right is not None and y1 > self.center:
+            self.right.overlap(y0, y1, result)
+        return result
+
+
+class KeepoutIndex():
+    r"""Keepout rectangles [[x0, x1, y0, y1], ...], indexed for clipping lines and arcs
+
+    Iterating over the index gives the normalized rectangles [xmin, xmax, ymin, ymax].
+    """
+
+    def __init__(self, keepouts):
+        self.keepouts = [[min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
+                         for ko in keepouts]
+        # interval trees over the scan axis, built on first use: 0 for vertical lines, 2 for horizontal lines
+        self._trees = {}
+
+    def __iter__(self):
+        return iter(self.keepouts)
+
+    def __len__(self):
+        return len(self.keepouts)
+
+    def _tree(self, yi):
+        tree = self._trees.get(yi)
+        if tree is None and self.keepouts:
+            tree = _IntervalTree([(ko[yi], ko[yi + 1], i) for i, ko in enumerate(self.keepouts)])
+            self._trees[yi] = tree
+        return tree
+
+    def candidates(self, y, xi, yi, x_min, x_max):
+        r"""Get the keepouts crossing the scan line y and touching [x_min, x_max], in their original order"""
+        tree = self._tree(yi)
+        if tree is None:
+            return []
+        keepouts = self.keepouts
+        return [keepouts[i] for i in sorted(tree.stab(y, []))
+                if keepouts[i][xi] <= x_max and keepouts[i][xi + 1] >= x_min]
+
+    def overlapping(self, x0, x1, y0, y1):
+        r"""Get the keepouts overlapping the rectangle [x0, x1] x [y0, y1], in their original order"""
+        tree = self._tree(2)
+        if tree is None:
+            return []
+        keepouts = self.keepouts
+        return [keepouts[i] for i in sorted(tree.overlap(y0, y1, []))
+                if keepouts[i][0] <= x1 and keepouts[i][1] >= x0]
+
+    def contains(self, x, y):
+        r"""Check if the point (x, y) lies in any keepout"""
+        tree = self._tree(2)
+        if tree is None:
+            return False
+        return any(self.keepouts[i][0] <= x <= self.keepouts[i][1] for i in tree.stab(y, []))
+
+    def clip(self, lines, y, xi, yi):
+        r"""Remove the parts of the lines [[start, end], ...] on the scan line y which lie in a keepout
+
+        The keepouts are applied one after the other in their original order, so the resulting segments are in the
+        same order as they always were.
+
+        :param lines: list of segments along the line, modified in place
+        :param y: position of the scan line
+        :param xi: index of the line direction in the keepouts (0: x, 2: y)
+        :param yi: index of the scan direction in the keepouts (2: y, 0: x)
+        """
+        if not lines:
+            return lines
+
+        x_min = min(l[0] for l in lines)
+        x_max = max(l[1] for l in lines)
+        for ko in self.candidates(y, xi, yi, x_min, x_max):
+            k0 = ko[xi]
+            k1 = ko[xi + 1]
+            for li in reversed(range(0, len(lines))):
+                l = lines[li]
+                if l[0] >= k0 and l[0] <= k1 and l[1] >= k0 and l[1] <= k1:  # Line completely inside -> remove
+                    lines.pop(li)
+                elif l[0] >= k0 and l[0] <= k1 and l[1] > k1:  # Line starts inside, but ends outside -> shorten
+                    lines.pop(li)
+                    lines.append([k1, l[1]])
+                elif l[0] < k0 and l[1] <= k1 and l[1] >= k0:  # Line starts outside, but ends inside -> shorten
+                    lines.pop(li)
+                    lines.append([l[0], k0])
+                elif l[0] < k0 and l[1] > k1:  # Line starts outside, and ends outside -> split
+                    lines.pop(li)
+                    lines.append([l[0], k0])
+                    lines.append([k1, l[1]])
+        return lines
+
+
+def getKeepoutIndex(keepouts):
+    r"""Get the KeepoutIndex of a list of keepouts, a KeepoutIndex is returned as it is"""
+    if isinstance(keepouts, KeepoutIndex):
+        return keepouts
+    return KeepoutIndex(keepouts)
+
+
+def applyKeepouts(lines_in, y, xi, yi, keepouts):
+    r"""Split the lines [[start, end], ...] on the scan line y so they do not interfere with the keepouts
+
+    xi, yi = 0, 2 for horizontal lines and 2, 0 for vertical lines. keepouts is a list [[x0, x1, y0, y1], ...]
+    or a KeepoutIndex.
+    """
+    return getKeepoutIndex(keepouts).clip(lines_in, y, xi, yi)
+
+
+def containedInAnyKeepout(x, y, keepouts):
+    r"""Check if the point (x, y) is contained in any keepout"""
+    return getKeepoutIndex(keepouts).contains(x, y)
+
+
+def clipArc(x, y, radius, angle_start, angle_end, keepouts):
+    r"""Get the parts of an arc which lie outside of the keepouts
+
+    The angles are given in radians, the point at angle a is (x + radius*sin(a), y + radius*cos(a)), like in
+    drawing_tools. The arc runs from angle_start to angle_end > angle_start.
+
+    :return: list of angle intervals (a0, a1), with angle_start <= a0 < a1 <= angle_end
+    """
+    candidates = getKeepoutIndex(keepouts).overlapping(x - radius, x + radius, y - radius, y + radius)
+    if not candidates or radius <= 0:
+        return [(angle_start, angle_end)]
+
+    # the angles where the circle crosses the edges of the keepouts
+    crossings = []
+    for ko in candidates:
+        for edge in ko[0:2]:
+            s = (edge - x) / radius
+            if -1 <= s <= 1:
+                a = math.asin(s)
+                crossings += [a, math.pi - a]
+        for edge in ko[2:4]:
+            c = (edge - y) / radius
+            if -1 <= c <= 1:
+                a = math.acos(c)
+                crossings += [a, -a]
+
+    def inside(a):
+        xa = x + radius * math.sin(a)
+        ya = y + radius * math.cos(a)
+        return any(ko[0] <= xa <= ko[1] and ko[2] <= ya <= ko[3] for ko in candidates)
+
+    crossings = [angle_start + (a - angle_start) % (2 * math.pi) for a in crossings]
+    arcs = freeIntervals(angle_start, angle_end, crossings, inside)
+    if arcs is None:
+        return [(angle_start, angle_end)]
+    return arcs
+
+
+def clipCircle(x, y, radius, keepouts):
+    r"""Get the parts of a circle which lie outside of the keepouts (see clipArc)
+
+    :return: list of angle intervals (a0, a1). [(0, 2*pi)] if no keepout touches the circle
+    """
+    # join the arcs crossing the start angle
+    return joinCircleIntervals(clipArc(x, y, radius, 0, 2 * math.pi, keepouts), 0, 2 * math.pi)